@@ -1,11 +1,70 @@
-from fastapi import APIRouter, BackgroundTasks
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+
+from app.core.db import get_db
+from app.core.profiling import get_profile_store
+from app.core.security import require_admin
+from app.services.ingestion.jobs import get_job_manager
+from app.services.ingestion.lock import get_ingestion_lock
+from app.services.ingestion.scheduler import source_intervals, source_status
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
 
-@router.post("/refresh")
-def refresh_data(background_tasks: BackgroundTasks):
-    from app.services.ingestion.pipeline import run_ingestion
+@router.post("/refresh", dependencies=[Depends(require_admin)])
+def refresh_data(sources: Optional[List[str]] = Query(default=None)):
+    """Start an ingestion job, or join the one already queued or running."""
+    from app.services.ingestion.pipeline import SOURCES
+
+    unknown = sorted(set(sources or []) - set(SOURCES))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown sources: {', '.join(unknown)}")
+    job, created = get_job_manager().submit(sources or list(SOURCES))
+    return {"status": "refresh_started" if created else "refresh_in_progress", "job": job.to_dict()}
+
+
+@router.get("/jobs", dependencies=[Depends(require_admin)])
+def list_jobs():
+    """Recent ingestion jobs, newest first."""
+    return {"jobs": [job.to_dict() for job in get_job_manager().list()]}
+
+
+@router.get("/jobs/{job_id}", dependencies=[Depends(require_admin)])
+def get_job(job_id: str):
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@router.post("/jobs/{job_id}/cancel", dependencies=[Depends(require_admin)])
+def cancel_job(job_id: str):
+    """Request cancellation; the job stops before its next article."""
+    job = get_job_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@router.get("/ingestion", dependencies=[Depends(require_admin)])
+def ingestion_status(db: Session = Depends(get_db)):
+    """Per-source schedule and outcome of the latest run, plus whether a run is in progress."""
+    return {"running": get_ingestion_lock().locked(), "sources": source_status(db, source_intervals())}
+
+
+@router.get("/profiles", dependencies=[Depends(require_admin)])
+def list_profiles():
+    """Latest stored request profiles, newest first."""
+    return {"profiles": get_profile_store().list()}
+
 
-    background_tasks.add_task(run_ingestion)
-    return {"status": "refresh_started"}
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+def get_profile(profile_id: str):
+    """A stored profile as collapsed stacks, ready for flamegraph.pl, speedscope or inferno."""
+    folded = get_profile_store().load(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(folded)
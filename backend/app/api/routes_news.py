@@ -2,15 +2,40 @@ from datetime import datetime
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, or_
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 
-from app.core.db import get_db
+from app.core.config import get_settings
+from app.core.db import get_read_db
 from app.models.article import Article
-from app.schemas.article import ArticleListResponse, ArticleRead
+from app.schemas.article import (
+    ArticleListItem,
+    ArticleListResponse,
+    ArticleRead,
+    RelatedArticle,
+    RelatedArticlesResponse,
+    TrendingResponse,
+    TrendingTopic,
+)
+from app.services.article_search import apply_text_search
+from app.services.related_articles import get_related_index
+from app.services.trending import current_score, trending_clusters
 
 router = APIRouter(prefix="/api/news", tags=["news"])
 
+# Columns of a listing; the compressed content is only read with include_content
+LIST_COLUMNS = [
+    Article.id,
+    Article.title,
+    Article.source,
+    Article.url,
+    Article.published_at,
+    Article.category,
+    Article.excerpt,
+    Article.image_url,
+    Article.created_at,
+    Article.canonical_id,
+]
+
 
 @router.get("", response_model=ArticleListResponse)
 def list_news(
@@ -21,18 +46,16 @@ def list_news(
     date_to: Optional[datetime] = Query(None),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    collapse_duplicates: bool = Query(False, description="Hide other outlets' copies of a listed story"),
+    include_content: bool = Query(False, description="Return each article's full content, not just the excerpt"),
+    db: Session = Depends(get_read_db),
 ):
-    query = db.query(Article)
+    query = db.query(*LIST_COLUMNS, *([Article.content] if include_content else []))
+    if collapse_duplicates:
+        query = query.filter(Article.canonical_id.is_(None))
 
     if q:
-        like_pattern = f"%{q.lower()}%"
-        query = query.filter(
-            or_(
-                func.lower(Article.title).like(like_pattern),
-                func.lower(Article.content).like(like_pattern),
-            )
-        )
+        query = apply_text_search(query, q, db.get_bind().dialect.name)
     if category:
         query = query.filter(Article.category == category)
     if source:
@@ -54,9 +77,67 @@ def list_news(
     return ArticleListResponse(total=total, page=page, page_size=page_size, items=items)
 
 
+@router.get("/trending", response_model=TrendingResponse)
+def trending_topics(
+    limit: int = Query(10, ge=1, le=50),
+    category: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
+):
+    """Clusters precomputed at ingestion time, highest trend first; reads the top rows only."""
+    settings = get_settings()
+    now = datetime.utcnow()
+    clusters = trending_clusters(db, limit=limit, category=category, settings=settings, now=now)
+    ids = {article_id for cluster in clusters for article_id in cluster.recent_article_ids}
+    rows = {row.id: row for row in db.query(*LIST_COLUMNS).filter(Article.id.in_(ids))} if ids else {}
+    items = [
+        TrendingTopic(
+            id=cluster.id,
+            category=cluster.category,
+            size=cluster.size,
+            score=round(current_score(cluster, now, settings.trending_half_life_hours), 3),
+            created_at=cluster.created_at,
+            last_article_at=cluster.last_article_at,
+            articles=[
+                ArticleListItem.model_validate(rows[article_id])
+                for article_id in cluster.recent_article_ids
+                if article_id in rows
+            ],
+        )
+        for cluster in clusters
+    ]
+    return TrendingResponse(window_hours=settings.trending_window_hours, items=items)
+
+
 @router.get("/{article_id}", response_model=ArticleRead)
-def get_article(article_id: int, db: Session = Depends(get_db)):
-    article = db.query(Article).filter(Article.id == article_id).first()
+def get_article(article_id: int, db: Session = Depends(get_read_db)):
+    article = db.query(Article).options(undefer(Article.content)).filter(Article.id == article_id).first()
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
     return article
+
+
+@router.get("/{article_id}/related", response_model=RelatedArticlesResponse)
+def related_articles(
+    article_id: int,
+    limit: int = Query(5, ge=1, le=20),
+    category: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    db: Session = Depends(get_read_db),
+):
+    """Nearest articles by stored centroid embeddings; no embedding call is made."""
+    article = db.query(Article.id, Article.canonical_id).filter(Article.id == article_id).first()
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    # Copies of a story have no vector of their own; use the canonical article's and leave it out
+    target = article.canonical_id or article.id
+    matches = get_related_index().related(
+        db, target, limit=limit, category=category, date_from=date_from, date_to=date_to
+    )
+    rows = {row.id: row for row in db.query(*LIST_COLUMNS).filter(Article.id.in_([match[0] for match in matches]))}
+    items = [
+        RelatedArticle.model_validate({**rows[match_id]._asdict(), "score": score})
+        for match_id, score in matches
+        if match_id in rows
+    ]
+    return RelatedArticlesResponse(article_id=article_id, items=items)
@@ -1,27 +1,34 @@
 import json
-from fastapi import APIRouter, Depends, Request
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.core.db import get_db
-from app.schemas.query import QueryRequest, QueryResponse
-from app.services.rag_service import RAGService
+from app.core.config import get_settings
+from app.core.db import get_read_db
+from app.schemas.query import BatchQueryRequest, BatchQueryResult, QueryRequest, QueryResponse
+from app.services.container import get_service_container
+
+if TYPE_CHECKING:
+    from app.services.rag_service import RAGService
 
 router = APIRouter(prefix="/api/query", tags=["query"])
 
 
-def get_rag_service(request: Request) -> RAGService:
-    rag_service = getattr(request.app.state, "rag_service", None)
+def get_rag_service() -> "RAGService":
+    """The RAG service, built on first use if the startup warm-up has not finished yet."""
+    rag_service = get_service_container().rag_service()
     if rag_service is None:
-        raise RuntimeError("RAG service not configured")
+        raise HTTPException(status_code=503, detail="RAG service not configured (set OPENAI_API_KEY)")
     return rag_service
 
 
 @router.post("", response_model=QueryResponse)
 def query_news(
     payload: QueryRequest,
-    db: Session = Depends(get_db),
-    rag_service: RAGService = Depends(get_rag_service),
+    db: Session = Depends(get_read_db),
+    rag_service: "RAGService" = Depends(get_rag_service),
 ):
     filters = payload.filters or {}
     result = rag_service.answer_question(
@@ -30,6 +37,7 @@ def query_news(
         category=getattr(filters, "category", None),
         date_from=getattr(filters, "date_from", None),
         date_to=getattr(filters, "date_to", None),
+        conversation_id=payload.conversation_id,
     )
     return QueryResponse(**result)
 
@@ -37,8 +45,8 @@ def query_news(
 @router.post("/stream")
 def query_news_stream(
     payload: QueryRequest,
-    db: Session = Depends(get_db),
-    rag_service: RAGService = Depends(get_rag_service),
+    db: Session = Depends(get_read_db),
+    rag_service: "RAGService" = Depends(get_rag_service),
 ):
     """Stream chat responses using Server-Sent Events"""
     filters = payload.filters or {}
@@ -52,6 +60,7 @@ def query_news_stream(
                 category=getattr(filters, "category", None),
                 date_from=getattr(filters, "date_from", None),
                 date_to=getattr(filters, "date_to", None),
+                conversation_id=payload.conversation_id,
             ):
                 # Update mapping if provided
                 if mapping:
@@ -82,3 +91,34 @@ def query_news_stream(
             "X-Accel-Buffering": "no",
         },
     )
+
+
+@router.post("/batch")
+def query_news_batch(
+    payload: BatchQueryRequest,
+    db: Session = Depends(get_read_db),
+    rag_service: "RAGService" = Depends(get_rag_service),
+):
+    """Answer several questions with shared retrieval; one NDJSON line per question as each completes"""
+    settings = get_settings()
+    if len(payload.questions) > settings.query_batch_max_questions:
+        raise HTTPException(
+            status_code=422, detail=f"At most {settings.query_batch_max_questions} questions per batch"
+        )
+    filters = payload.filters or {}
+
+    def generate():
+        try:
+            for result in rag_service.answer_batch(
+                payload.questions,
+                db,
+                category=getattr(filters, "category", None),
+                date_from=getattr(filters, "date_from", None),
+                date_to=getattr(filters, "date_to", None),
+                concurrency=settings.query_batch_concurrency,
+            ):
+                yield BatchQueryResult(**result).model_dump_json() + "\n"
+        except Exception as e:
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
@@ -6,21 +6,123 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     app_name: str = "NewsIQ"
     database_url: str = "sqlite:///./news_iq.db"
+    # SQLite tuning applied on every connection. WAL lets API reads run while ingestion writes.
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 65536
+    sqlite_mmap_size_bytes: int = 268435456
+    # Connections kept for read-only API queries (separate from the ingestion/write engine)
+    database_read_pool_size: int = 10
+    # Server databases (e.g. postgresql+psycopg://...): pool sizing, and an optional read replica
+    database_pool_size: int = 10
+    database_max_overflow: int = 20
+    database_pool_recycle_seconds: int = 1800
+    database_read_url: str = ""
     openai_api_key: str = ""
     news_api_key: str = ""
     vector_store_dir: str = "./storage/vector_store"
-    chunk_size: int = 600
-    chunk_overlap: int = 120
+    # Vector index: "chroma" (local directory) or "pgvector" (PostgreSQL, shared by all replicas).
+    # pgvector uses DATABASE_URL unless VECTOR_DATABASE_URL points elsewhere.
+    vector_backend: str = "chroma"
+    vector_database_url: str = ""
+    # Chunking in tokens; chunks never exceed the embedding model's input limit either
+    chunk_max_tokens: int = 256
+    chunk_overlap_tokens: int = 40
+    # Near-duplicate detection: articles whose MinHash similarity to a canonical article published
+    # within the window reaches the threshold are linked to it and not embedded
+    dedup_enabled: bool = True
+    dedup_similarity_threshold: float = 0.7
+    dedup_window_days: int = 7
+    # Index rebuilds (python reindex.py): articles per embedding batch, batches embedded at once,
+    # and the progress file that lets an interrupted rebuild resume
+    reindex_batch_size: int = 64
+    reindex_workers: int = 4
+    reindex_checkpoint_path: str = "./storage/reindex.json"
+    # GET /api/news/{id}/related: results kept in memory until the next ingestion changes article vectors
+    related_articles_cache_size: int = 1024
+    # Trending topics: recent articles join the most similar active cluster at or above the threshold
+    # at ingestion time; an article's weight in its cluster's score halves every half-life
+    trending_window_hours: int = 48
+    trending_half_life_hours: float = 6.0
+    trending_similarity_threshold: float = 0.8
+    # Daily per-category digests written by each ingestion run from the newest articles; generic
+    # questions ("latest tech news") are answered from them without embedding or generation calls
+    digests_enabled: bool = True
+    digest_articles: int = 8
+    # Category routing: question embeddings are classified against centroids of each category's newest
+    # article vectors (refreshed after ingestion); the top category filters retrieval at this probability
+    category_router_articles: int = 2000
+    category_router_temperature: float = 0.05
+    category_router_min_probability: float = 0.6
+    # Chat conversations (conversation_id): the last answer's chunks and embeddings kept per process,
+    # expired after inactivity and evicted least recently used beyond the memory cap. A follow-up at or
+    # above the reuse similarity to the previous question reuses them; above the extend similarity it
+    # adds one search's new chunks; below it is retrieved from scratch
+    conversation_ttl_seconds: int = 1800
+    conversation_cache_mib: int = 64
+    conversation_reuse_similarity: float = 0.75
+    conversation_extend_similarity: float = 0.35
     ingestion_batch_size: int = 20
     hacker_news_limit: int = 30
+    # Scheduled ingestion (python scheduler.py): seconds between runs per source, 0 disables a source.
+    # Intervals are stretched or shrunk by up to the jitter fraction; failures retry with backoff.
+    ingestion_interval_hacker_news_seconds: int = 300
+    ingestion_interval_rss_seconds: int = 3600
+    ingestion_interval_newsapi_seconds: int = 1800
+    ingestion_jitter_fraction: float = 0.1
+    ingestion_retry_base_seconds: int = 60
+    # Lock file serialising ingestion runs across processes sharing the data directory
+    ingestion_lock_path: str = "./storage/ingestion.lock"
+    # Admin refresh jobs run on a thread of the API process ("thread") or in a spawned worker ("process")
+    ingestion_job_mode: str = "thread"
+    ingestion_jobs_keep: int = 20
+    # Embeddings: "openai", "local" (ONNX model on CPU) or "hash" (deterministic, offline)
+    embedding_backend: str = "openai"
+    embedding_model: str = "text-embedding-3-small"
+    local_embedding_model_dir: str = ""
+    local_embedding_batch_size: int = 32
+    local_embedding_workers: int = 2
+    hash_embedding_dimensions: int = 256
+    # OpenAI client: base URL override (e.g. a local OpenAI-compatible server), pooling, retries
+    # and limits. Rate limits are shared by every process using openai_rate_limit_dir (per process
+    # when it is empty); 0 disables a limit.
+    openai_base_url: str = ""
+    openai_timeout_seconds: float = 60.0
+    openai_connect_timeout_seconds: float = 5.0
+    openai_max_connections: int = 20
+    openai_max_keepalive_connections: int = 10
+    openai_max_retries: int = 5
+    openai_backoff_base_seconds: float = 0.5
+    openai_backoff_max_seconds: float = 30.0
+    openai_requests_per_minute: int = 3000
+    openai_tokens_per_minute: int = 1000000
+    # Requests in flight; a stream holds its slot only until it is open
+    openai_max_concurrency: int = 8
+    # Directory holding the shared rate limit state, like the ingestion lock on the shared data directory
+    openai_rate_limit_dir: str = "./storage/openai_limits"
+    # Build the RAG service on a background thread at startup (/ready is 503 until done);
+    # when off it is built by the first query
+    services_warmup_enabled: bool = True
+    # Share one embed/search/generation between identical questions that are in flight together
+    query_coalescing_enabled: bool = True
+    # POST /api/query/batch: questions accepted per request and generations run at once for one request
+    query_batch_max_questions: int = 50
+    query_batch_concurrency: int = 4
+    # Shared secret for admin-only endpoints (sent as X-Admin-Token); empty disables them
+    admin_token: str = ""
+    # Request profiling (off by default; the middleware is not installed unless enabled)
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = 0.0
+    profiling_interval_ms: float = 5.0
+    profiling_dir: str = "./storage/profiles"
+    profiling_keep: int = 20
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
     @property
     def vector_store_path(self) -> Path:
-        path = Path(self.vector_store_dir)
-        path.mkdir(parents=True, exist_ok=True)
-        return path
+        return Path(self.vector_store_dir)
 
 
 @lru_cache
@@ -1,14 +1,68 @@
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
-from .config import get_settings
+from .config import Settings, get_settings
 
 settings = get_settings()
-connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
-engine = create_engine(settings.database_url, connect_args=connect_args)
+
+
+def _apply_sqlite_pragmas(engine: Engine, settings: Settings, read_only: bool) -> None:
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # journal_mode is stored in the database file; WAL lets readers proceed while a writer commits
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        # Negative cache_size is in KiB
+        cursor.execute(f"PRAGMA cache_size={-int(settings.sqlite_cache_size_kib)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size_bytes)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+
+def build_engine(url: str, settings: Settings = settings, read_only: bool = False) -> Engine:
+    """Engine for ``url``; SQLite connections get the tuning PRAGMAs (and ``query_only`` for readers)."""
+    if not url.startswith("sqlite"):
+        kwargs = {
+            "pool_size": settings.database_pool_size,
+            "max_overflow": settings.database_max_overflow,
+            "pool_recycle": settings.database_pool_recycle_seconds,
+            "pool_pre_ping": True,
+        }
+        if read_only and url.startswith("postgresql"):
+            kwargs["connect_args"] = {"options": "-c default_transaction_read_only=on"}
+        return create_engine(url, **kwargs)
+    kwargs = {"connect_args": {"check_same_thread": False}}
+    if read_only:
+        kwargs.update(pool_size=settings.database_read_pool_size, max_overflow=settings.database_read_pool_size)
+    engine = create_engine(url, **kwargs)
+    _apply_sqlite_pragmas(engine, settings, read_only)
+    return engine
+
+
+def _build_read_engine(settings: Settings, write_engine: Engine) -> Engine:
+    if settings.database_read_url:
+        # e.g. a PostgreSQL streaming replica
+        return build_engine(settings.database_read_url, settings, read_only=True)
+    url = settings.database_url
+    # In-memory databases exist per connection, so a second engine would see an empty database.
+    # Other servers already isolate readers from writers; a second pool would only add connections.
+    if not url.startswith("sqlite") or ":memory:" in url or url in ("sqlite://", "sqlite:///"):
+        return write_engine
+    return build_engine(url, settings, read_only=True)
+
+
+engine = build_engine(settings.database_url)
+# API reads go through their own pool so they never queue behind ingestion transactions
+read_engine = _build_read_engine(settings, engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
 
 
@@ -24,3 +78,12 @@ def db_session():
 def get_db():
     with db_session() as session:
         yield session
+
+
+def get_read_db():
+    """FastAPI dependency for read-only endpoints; writes through this session fail."""
+    session = ReadSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,203 @@
+"""
+Opt-in per-request sampling profiler.
+
+When PROFILING_ENABLED is set, ``ProfilingMiddleware`` profiles requests to the query
+and news endpoints that either carry ``X-Profile: 1`` together with a valid admin
+token, or are picked by PROFILING_SAMPLE_RATE. While a request is being served a
+background thread samples the Python stacks of busy threads every few milliseconds;
+the result is stored as collapsed stacks ("frame;frame;frame count" per line), the
+input format of flamegraph.pl, speedscope and inferno. Concurrent requests share the
+process, so a profile can include other busy threads.
+
+With profiling disabled the middleware is never installed and costs nothing.
+"""
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.core.security import ADMIN_TOKEN_HEADER, is_admin_token
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+PROFILED_PATHS = ("/api/query", "/api/query/stream", "/api/news")
+PROFILE_ID_RE = re.compile(r"^[0-9]+-[0-9a-f]{8}$")
+
+# Leaf frames that mean a thread is parked rather than doing work
+IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("base_events.py", "_run_once"),
+}
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES:
+                    continue
+                stack: List[str] = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+
+class ProfileStore:
+    """Keeps the latest ``keep`` profiles on disk as ``<id>.folded`` plus ``<id>.json`` metadata."""
+
+    def __init__(self, directory: str, keep: int = 20) -> None:
+        self.directory = Path(directory)
+        self.keep = keep
+        self._lock = threading.Lock()
+
+    def save(self, samples: Counter, meta: Dict) -> str:
+        profile_id = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+        folded = "\n".join(f"{stack} {count}" for stack, count in samples.most_common())
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / f"{profile_id}.folded").write_text(folded + "\n", encoding="utf-8")
+            (self.directory / f"{profile_id}.json").write_text(
+                json.dumps({"id": profile_id, **meta}), encoding="utf-8"
+            )
+            self._prune()
+        return profile_id
+
+    def _prune(self) -> None:
+        metas = sorted(self.directory.glob("*.json"))
+        for stale in metas[: max(0, len(metas) - self.keep)]:
+            stale.unlink(missing_ok=True)
+            stale.with_suffix(".folded").unlink(missing_ok=True)
+
+    def list(self) -> List[Dict]:
+        if not self.directory.exists():
+            return []
+        profiles = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                profiles.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    def load(self, profile_id: str) -> Optional[str]:
+        if not PROFILE_ID_RE.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}.folded"
+        if not path.exists():
+            return None
+        return path.read_text(encoding="utf-8")
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore,
+        sample_rate: float = 0.0,
+        interval: float = 0.005,
+        paths: Sequence[str] = PROFILED_PATHS,
+    ) -> None:
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.paths = tuple(paths)
+
+    def _should_profile(self, scope: Scope) -> bool:
+        path = scope.get("path", "")
+        if not any(path == prefix or path.startswith(prefix + "/") for prefix in self.paths):
+            return False
+        headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope["headers"]}
+        if headers.get(PROFILE_HEADER.lower()) == "1" and is_admin_token(headers.get(ADMIN_TOKEN_HEADER.lower())):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = SamplingProfiler(self.interval)
+        started = time.perf_counter()
+        state = {"status": None, "finished": False}
+        profiler.start()
+
+        def finish() -> None:
+            samples = profiler.stop()
+            meta = {
+                "method": scope.get("method"),
+                "path": scope.get("path"),
+                "query_string": scope.get("query_string", b"").decode("latin-1"),
+                "status": state["status"],
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                "samples": sum(samples.values()),
+                "interval_ms": self.interval * 1000,
+                "created_at": time.time(),
+            }
+            try:
+                profile_id = self.store.save(samples, meta)
+                logger.info("Saved profile %s for %s %s", profile_id, meta["method"], meta["path"])
+            except OSError:
+                logger.exception("Could not save request profile")
+
+        async def finish_once() -> None:
+            if not state["finished"]:
+                state["finished"] = True
+                await run_in_threadpool(finish)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            await send(message)
+            # Streaming responses keep working after the handler returns; stop at the last body chunk
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                await finish_once()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            await finish_once()
+
+
+def get_profile_store() -> ProfileStore:
+    settings = get_settings()
+    return ProfileStore(settings.profiling_dir, keep=settings.profiling_keep)
@@ -0,0 +1,22 @@
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from app.core.config import get_settings
+
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """True when ``token`` matches the configured ADMIN_TOKEN. Always False if no token is configured."""
+    expected = get_settings().admin_token
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8"))
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """FastAPI dependency guarding admin-only endpoints."""
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
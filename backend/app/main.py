@@ -1,13 +1,18 @@
 import logging
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import text
 
 from app.api.routes_admin import router as admin_router
 from app.api.routes_news import router as news_router
 from app.api.routes_query import router as query_router
 from app.core.config import get_settings
 from app.core.db import Base, engine
+from app.core.metrics import render_metrics
+from app.core.profiling import ProfilingMiddleware, get_profile_store
+from app.services.container import STATUS_COLD, STATUS_DISABLED, STATUS_READY, get_service_container
 
 # Configure logging
 logging.basicConfig(
@@ -32,27 +37,56 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.profiling_enabled:
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=get_profile_store(),
+        sample_rate=settings.profiling_sample_rate,
+        interval=settings.profiling_interval_ms / 1000.0,
+    )
+
 
 @app.on_event("startup")
 def startup_event():
     Base.metadata.create_all(bind=engine)
-    if settings.openai_api_key:
-        from app.services.llm_client import LLMClient
-        from app.services.rag_service import RAGService
-        from app.services.vector_store import VectorStore
-
-        llm_client = LLMClient(api_key=settings.openai_api_key)
-        vector_store = VectorStore()
-        app.state.rag_service = RAGService(llm_client, vector_store)
-    else:
-        app.state.rag_service = None
+    # The RAG service (OpenAI client, vector store) is built lazily; warming it up in the
+    # background lets the process answer /health right away while /ready waits for it.
+    if settings.services_warmup_enabled:
+        get_service_container().warm_up()
 
 
 @app.get("/health")
 def health_check():
+    """Liveness: the process is up and serving requests."""
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def readiness_check(response: Response):
+    """Readiness: the database answers and the RAG service is built (or intentionally lazy/disabled)."""
+    checks = {}
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        checks["database"] = "ok"
+    except Exception as exc:
+        checks["database"] = f"error: {type(exc).__name__}"
+    container = get_service_container()
+    checks["rag_service"] = container.status()
+    if container.error:
+        checks["rag_service_error"] = container.error
+    ready = checks["database"] == "ok" and checks["rag_service"] in (STATUS_READY, STATUS_DISABLED, STATUS_COLD)
+    if not ready:
+        response.status_code = 503
+    return {"status": "ready" if ready else "not_ready", "checks": checks}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint (text exposition format 0.0.4)."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 app.include_router(news_router)
 app.include_router(query_router)
 app.include_router(admin_router)
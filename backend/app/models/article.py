@@ -1,8 +1,13 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy import DDL, Column, DateTime, ForeignKey, Integer, LargeBinary, String, event
+from sqlalchemy.orm import deferred, validates
 
 from app.core.db import Base
+from app.models.types import CompressedText
+
+# Characters of content kept uncompressed in ``excerpt`` for article listings
+EXCERPT_LENGTH = 300
 
 
 class Article(Base):
@@ -14,6 +19,30 @@ class Article(Base):
     url = Column(String(512), unique=True, nullable=False)
     published_at = Column(DateTime, nullable=False)
     category = Column(String(64), nullable=False)
-    content = Column(Text, nullable=False)
+    # Full text, compressed on SQLite. Both are loaded only when accessed: listings select
+    # ``excerpt`` explicitly and never read the content.
+    content = deferred(Column(CompressedText, nullable=False))
+    excerpt = deferred(Column(String(EXCERPT_LENGTH), nullable=True))
     image_url = Column(String(512), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Near-duplicate detection: MinHash signature of the content, and for another outlet's
+    # copy of an already stored story, the id of that first (canonical) article
+    minhash = Column(LargeBinary, nullable=True)
+    canonical_id = Column(Integer, ForeignKey("articles.id"), nullable=True, index=True)
+
+    @validates("content")
+    def _set_excerpt(self, key, content):
+        self.excerpt = content[:EXCERPT_LENGTH] if content is not None else None
+        return content
+
+
+# Full-text document for PostgreSQL. Queries must use this exact expression to hit the GIN index.
+ARTICLE_TSVECTOR_SQL = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, ''))"
+
+event.listen(
+    Article.__table__,
+    "after_create",
+    DDL(f"CREATE INDEX IF NOT EXISTS ix_articles_fts ON articles USING GIN ({ARTICLE_TSVECTOR_SQL})").execute_if(
+        dialect="postgresql"
+    ),
+)
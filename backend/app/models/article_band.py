@@ -0,0 +1,12 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer
+
+from app.core.db import Base
+
+
+class ArticleBand(Base):
+    """LSH band keys of canonical articles' MinHash signatures, for near-duplicate lookup."""
+
+    __tablename__ = "article_bands"
+
+    band_key = Column(BigInteger, primary_key=True)
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True, index=True)
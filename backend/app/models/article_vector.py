@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, String
+
+from app.core.db import Base
+
+
+class ArticleVector(Base):
+    """Mean of an article's chunk embeddings (unit length, float16), for related-article lookups."""
+
+    __tablename__ = "article_vectors"
+
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    model = Column(String(128), nullable=False)
+    vector = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)
+
+
+class StagedArticleVector(Base):
+    """Article vectors written by an index rebuild, moved into ``article_vectors`` when it is activated."""
+
+    __tablename__ = "staged_article_vectors"
+
+    # The collection or table being rebuilt
+    index_name = Column(String(128), primary_key=True)
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    model = Column(String(128), nullable=False)
+    vector = Column(LargeBinary, nullable=False)
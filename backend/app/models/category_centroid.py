@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String
+
+from app.core.db import Base
+
+
+class CategoryCentroid(Base):
+    """Mean vector (float32, unit length) of a category's recent articles, for routing questions."""
+
+    __tablename__ = "category_centroids"
+
+    model = Column(String(128), primary_key=True)
+    category = Column(String(64), primary_key=True)
+    vector = Column(LargeBinary, nullable=False)
+    # Articles the centroid was computed from
+    articles = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, DateTime, Integer, String, Text
+
+from app.core.db import Base
+
+
+class IngestionSourceState(Base):
+    """Outcome of the latest scheduled run per ingestion source."""
+
+    __tablename__ = "ingestion_source_state"
+
+    source = Column(String(64), primary_key=True)
+    last_started_at = Column(DateTime, nullable=True)
+    last_success_at = Column(DateTime, nullable=True)
+    last_error_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    consecutive_failures = Column(Integer, default=0, nullable=False)
+    articles_last_run = Column(Integer, default=0, nullable=False)
+    next_run_at = Column(DateTime, nullable=True)
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, Date, DateTime, Integer, String, Text, UniqueConstraint
+
+from app.core.db import Base
+
+
+class NewsDigest(Base):
+    """Summary of one category's articles published on one UTC day, served for generic questions."""
+
+    __tablename__ = "news_digests"
+    __table_args__ = (UniqueConstraint("category", "day", name="uq_news_digests_category_day"),)
+
+    id = Column(Integer, primary_key=True)
+    category = Column(String(64), nullable=False)
+    day = Column(Date, nullable=False)
+    # Cites articles as (Article N), N being the 1-based position in article_ids
+    summary = Column(Text, nullable=False)
+    article_ids = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, Integer, LargeBinary, String
+
+from app.core.db import Base
+
+
+class TopicCluster(Base):
+    """A story being covered right now: recent articles whose vectors lie close together."""
+
+    __tablename__ = "topic_clusters"
+
+    id = Column(Integer, primary_key=True)
+    model = Column(String(128), nullable=False)
+    # Mean of the member articles' vectors (float32); copies of a story do not move it
+    centroid = Column(LargeBinary, nullable=False)
+    # Category of the article that started the cluster
+    category = Column(String(64), nullable=False)
+    # Articles including other outlets' copies, and embedded (canonical) articles only
+    size = Column(Integer, nullable=False, default=0)
+    stories = Column(Integer, nullable=False, default=0)
+    # Newest members first, at most MAX_RECENT_ARTICLES ids
+    recent_article_ids = Column(JSON, nullable=False, default=list)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_article_at = Column(DateTime, nullable=False, index=True)
+    # log2 of the decayed article count plus last_article_at in half-lives: the ranking does not
+    # change as time passes, so it is stored and indexed (see app.services.trending)
+    trend = Column(Float, nullable=False, index=True)
+
+
+class TopicClusterArticle(Base):
+    """Cluster each article was assigned to, so re-ingesting an article does not count it twice."""
+
+    __tablename__ = "topic_cluster_articles"
+
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    cluster_id = Column(Integer, ForeignKey("topic_clusters.id", ondelete="CASCADE"), nullable=False, index=True)
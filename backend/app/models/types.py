@@ -0,0 +1,38 @@
+import sqlite3
+
+from sqlalchemy import LargeBinary, Text, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.types import TypeDecorator
+
+from app.utils.compression import compress_text, decompress_text
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text stored compressed on SQLite (see ``app.utils.compression``) and as plain ``TEXT``
+    elsewhere; PostgreSQL already compresses large values (TOAST) and its full-text index
+    needs the text. Reads always return ``str``, including rows written before compression.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(LargeBinary())
+        return dialect.type_descriptor(Text())
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and dialect.name == "sqlite":
+            return compress_text(value)
+        return value
+
+    def process_result_value(self, value, dialect):
+        return decompress_text(value)
+
+
+@event.listens_for(Engine, "connect")
+def _register_sqlite_functions(dbapi_connection, connection_record):
+    # SQL can read compressed columns through decompress_text(column), e.g. for LIKE searches
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_function("decompress_text", 1, decompress_text, deterministic=True)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, HttpUrl, field_validator
 
 
 class ArticleBase(BaseModel):
@@ -21,16 +21,70 @@ class ArticleCreate(ArticleBase):
 class ArticleRead(ArticleBase):
     id: int
     created_at: datetime
+    # Set when this is another outlet's copy of the article with that id
+    canonical_id: Optional[int] = None
 
     class Config:
         from_attributes = True
 
 
+class ArticleListItem(BaseModel):
+    id: int
+    title: str
+    source: str
+    url: HttpUrl
+    published_at: datetime
+    category: str
+    # First characters of the content; the full text is only included on request. NULL in rows
+    # not yet migrated or written by bulk updates, which skip the model's hook
+    excerpt: Optional[str] = ""
+    content: Optional[str] = None
+    image_url: Optional[str] = None
+    created_at: datetime
+    canonical_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+    @field_validator("excerpt", mode="before")
+    @classmethod
+    def _missing_excerpt(cls, value: Optional[str]) -> str:
+        return value or ""
+
+
 class ArticleListResponse(BaseModel):
     total: int
     page: int
     page_size: int
-    items: List[ArticleRead]
+    items: List[ArticleListItem]
+
+
+class RelatedArticle(ArticleListItem):
+    # Cosine similarity of the two articles' mean chunk embeddings
+    score: float
+
+
+class RelatedArticlesResponse(BaseModel):
+    article_id: int
+    items: List[RelatedArticle]
+
+
+class TrendingTopic(BaseModel):
+    id: int
+    category: str
+    # Articles in the cluster, including other outlets' copies of a story
+    size: int
+    # Article count with each article's weight halved per half-life since publication
+    score: float
+    created_at: datetime
+    last_article_at: datetime
+    # Newest articles first
+    articles: List[ArticleListItem]
+
+
+class TrendingResponse(BaseModel):
+    window_hours: int
+    items: List[TrendingTopic]
 
 
 class ArticleFilters(BaseModel):
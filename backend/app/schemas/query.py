@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class QueryFilters(BaseModel):
@@ -13,6 +13,8 @@ class QueryFilters(BaseModel):
 class QueryRequest(BaseModel):
     question: str
     filters: QueryFilters | None = None
+    # Follow-ups sent with the same id may be answered from the previous answer's articles
+    conversation_id: Optional[str] = Field(default=None, max_length=128)
 
 
 class QueryArticle(BaseModel):
@@ -27,3 +29,18 @@ class QueryArticle(BaseModel):
 class QueryResponse(BaseModel):
     answer: str
     articles: List[QueryArticle]
+
+
+class BatchQueryRequest(BaseModel):
+    questions: List[str] = Field(min_length=1)
+    filters: QueryFilters | None = None
+
+
+class BatchQueryResult(BaseModel):
+    """One NDJSON line of ``/api/query/batch``: ``index`` is the question's position in the request."""
+
+    index: int
+    question: str
+    answer: Optional[str] = None
+    articles: List[QueryArticle] = []
+    error: Optional[str] = None
@@ -0,0 +1,25 @@
+from sqlalchemy import func, literal_column, or_
+from sqlalchemy.orm import Query
+
+from app.models.article import ARTICLE_TSVECTOR_SQL, Article
+
+
+def apply_text_search(query: Query, q: str, dialect: str) -> Query:
+    """
+    Filter ``query`` to articles matching ``q``.
+
+    PostgreSQL uses the GIN-indexed tsvector with ``websearch_to_tsquery`` (stemmed words,
+    quoted phrases, ``-exclusions``); other databases fall back to a case-insensitive
+    substring match on title and content (decompressed in SQL on SQLite).
+    """
+    if dialect == "postgresql":
+        document = literal_column(ARTICLE_TSVECTOR_SQL)
+        return query.filter(document.op("@@")(func.websearch_to_tsquery("english", q)))
+    like_pattern = f"%{q.lower()}%"
+    content = func.decompress_text(Article.content) if dialect == "sqlite" else Article.content
+    return query.filter(
+        or_(
+            func.lower(Article.title).like(like_pattern),
+            func.lower(content).like(like_pattern),
+        )
+    )
@@ -0,0 +1,123 @@
+"""
+Category routing for questions by embedding.
+
+After each ingestion run the vectors of every category's newest articles are averaged into
+``category_centroids``. A question's embedding, which retrieval computes anyway, is
+compared with the centroids of its embedding model in one matrix-vector product, and a
+softmax over the similarities gives each category's probability. Retrieval filters by the
+top category only when it is likely enough.
+"""
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings, get_settings
+from app.models.article import Article
+from app.models.article_vector import ArticleVector
+from app.models.category_centroid import CategoryCentroid
+
+logger = logging.getLogger(__name__)
+
+
+def refresh_category_centroids(session: Session, settings: Optional[Settings] = None) -> int:
+    """Recompute each category's centroid from its newest article vectors; returns the number written."""
+    settings = settings or get_settings()
+    groups = (
+        session.query(ArticleVector.model, Article.category)
+        .join(Article, Article.id == ArticleVector.article_id)
+        .distinct()
+        .all()
+    )
+    for model, category in groups:
+        vectors = [
+            row.vector
+            for row in session.query(ArticleVector.vector)
+            .join(Article, Article.id == ArticleVector.article_id)
+            .filter(ArticleVector.model == model, Article.category == category)
+            .order_by(Article.published_at.desc())
+            .limit(settings.category_router_articles)
+        ]
+        # Article vectors are unit length, so their mean points at the category's centre
+        mean = np.stack([np.frombuffer(vector, dtype=np.float16) for vector in vectors]).astype(np.float32).mean(axis=0)
+        mean /= max(float(np.linalg.norm(mean)), 1e-12)
+        session.merge(
+            CategoryCentroid(
+                model=model,
+                category=category,
+                vector=mean.tobytes(),
+                articles=len(vectors),
+                updated_at=datetime.utcnow(),
+            )
+        )
+    session.commit()
+    logger.info("Refreshed %s category centroids", len(groups))
+    return len(groups)
+
+
+class CategoryRouter:
+    """
+    Category probabilities for question embeddings of one model. Centroids are cached in
+    memory and reloaded when ``category_centroids`` changes, checked with one aggregate
+    query per call.
+    """
+
+    def __init__(
+        self, model: str, temperature: Optional[float] = None, min_probability: Optional[float] = None
+    ) -> None:
+        settings = get_settings()
+        self.model = model
+        self.temperature = temperature or settings.category_router_temperature
+        self.min_probability = min_probability if min_probability is not None else settings.category_router_min_probability
+        self._lock = threading.Lock()
+        self._version = None
+        self._categories: List[str] = []
+        self._centroids = np.zeros((0, 0), dtype=np.float32)
+
+    def _load(self, session: Session) -> None:
+        version = tuple(
+            session.query(func.count(CategoryCentroid.category), func.max(CategoryCentroid.updated_at))
+            .filter(CategoryCentroid.model == self.model)
+            .one()
+        )
+        with self._lock:
+            if version == self._version:
+                return
+            rows = (
+                session.query(CategoryCentroid.category, CategoryCentroid.vector)
+                .filter(CategoryCentroid.model == self.model)
+                .order_by(CategoryCentroid.category)
+                .all()
+            )
+            self._categories = [row.category for row in rows]
+            self._centroids = (
+                np.stack([np.frombuffer(row.vector, dtype=np.float32) for row in rows])
+                if rows
+                else np.zeros((0, 0), dtype=np.float32)
+            )
+            self._version = version
+
+    def probabilities(self, session: Session, embedding: Sequence[float]) -> Dict[str, float]:
+        """Probability of each category, most likely first; empty before the first refresh."""
+        self._load(session)
+        categories, centroids = self._categories, self._centroids
+        if not categories:
+            return {}
+        query = np.asarray(embedding, dtype=np.float32)
+        logits = centroids @ (query / max(float(np.linalg.norm(query)), 1e-12)) / self.temperature
+        weights = np.exp(logits - logits.max())
+        weights /= weights.sum()
+        order = np.argsort(-weights)
+        return {categories[index]: round(float(weights[index]), 4) for index in order}
+
+    def route(self, session: Session, embedding: Sequence[float]) -> Optional[str]:
+        """The most likely category if its probability reaches the threshold, else None."""
+        probabilities = self.probabilities(session, embedding)
+        if not probabilities:
+            return None
+        category, probability = next(iter(probabilities.items()))
+        return category if probability >= self.min_probability else None
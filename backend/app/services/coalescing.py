@@ -0,0 +1,208 @@
+import re
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Generator, Generic, Hashable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+WHITESPACE_RE = re.compile(r"\s+")
+TRAILING_PUNCTUATION = "?!.,;: "
+
+
+def normalize_question(question: str) -> str:
+    """Case-fold, collapse whitespace and drop trailing punctuation so trivially different phrasings match."""
+    return WHITESPACE_RE.sub(" ", question.lower()).strip().rstrip(TRAILING_PUNCTUATION)
+
+
+def question_key(
+    question: str,
+    category: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    top_k: int = 8,
+) -> Tuple[Any, ...]:
+    return (
+        normalize_question(question),
+        category,
+        date_from.isoformat() if date_from else None,
+        date_to.isoformat() if date_to else None,
+        top_k,
+    )
+
+
+class _Call(Generic[T]):
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(Generic[T]):
+    """
+    Collapse concurrent calls with the same key into one execution.
+
+    The first caller runs ``fn``; callers arriving while it is in flight block and
+    receive the same result (or exception). Nothing is cached once the call returns.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call[T]] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """Return ``(result, shared)`` where ``shared`` is True for callers that attached to another call."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+
+class _StreamFlight(Generic[T]):
+    def __init__(self) -> None:
+        self.items: List[T] = []
+        self.result: Any = None
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.condition = threading.Condition()
+
+
+class _Subscription(Generic[T]):
+    """
+    One subscriber's iterator over a flight. Closing it gives up its place in the flight's
+    subscriber count exactly once, also when iteration never started (a generator that was
+    never started skips its ``finally`` on close). Dropping it unclosed closes it.
+    """
+
+    def __init__(self, flight: _StreamFlight[T], consumer: Generator[T, None, Any]) -> None:
+        self._flight = flight
+        self._consumer = consumer
+        self._started = False
+        self._closed = False
+
+    def __iter__(self) -> "_Subscription[T]":
+        return self
+
+    def __next__(self) -> T:
+        self._started = True
+        return next(self._consumer)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        # A started consumer leaves the count in its own ``finally``
+        self._consumer.close()
+        if not self._started:
+            with self._flight.condition:
+                self._flight.subscribers -= 1
+
+    def __del__(self) -> None:
+        self.close()
+
+
+class StreamFanout(Generic[T]):
+    """
+    Share one upstream generator between every subscriber asking for the same key.
+
+    The first subscriber starts the producer on a background thread, so the upstream
+    keeps going if that subscriber disconnects. Later subscribers replay what has been
+    produced so far and then follow live. The producer stops early once every
+    subscriber has gone away. A value the producer returns is returned by every
+    subscriber's iterator too (``result = yield from stream``).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _StreamFlight[T]] = {}
+
+    def subscribe(
+        self, key: Hashable, factory: Callable[[], Iterator[T]]
+    ) -> Tuple[_Subscription[T], bool]:
+        """
+        Return ``(iterator, shared)`` where ``shared`` is True when attaching to an in-flight
+        stream. Close the iterator, or let it run out, to leave the flight.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _StreamFlight()
+                self._flights[key] = flight
+            with flight.condition:
+                flight.subscribers += 1
+
+        if leader:
+            thread = threading.Thread(
+                target=self._produce, args=(key, flight, factory), name="stream-fanout", daemon=True
+            )
+            thread.start()
+        return _Subscription(flight, self._consume(flight)), not leader
+
+    def _produce(self, key: Hashable, flight: _StreamFlight[T], factory: Callable[[], Iterator[T]]) -> None:
+        iterator = None
+        try:
+            iterator = factory()
+            while True:
+                try:
+                    item = next(iterator)
+                except StopIteration as stop:
+                    flight.result = stop.value
+                    break
+                with flight.condition:
+                    flight.items.append(item)
+                    flight.condition.notify_all()
+                    if flight.subscribers == 0:
+                        break
+        except BaseException as exc:
+            flight.error = exc
+        finally:
+            close = getattr(iterator, "close", None)
+            if close:
+                close()
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            with flight.condition:
+                flight.done = True
+                flight.condition.notify_all()
+
+    def _consume(self, flight: _StreamFlight[T]) -> Generator[T, None, Any]:
+        index = 0
+        try:
+            while True:
+                with flight.condition:
+                    while index >= len(flight.items) and not flight.done:
+                        flight.condition.wait()
+                    pending = flight.items[index:]
+                    index += len(pending)
+                    finished = flight.done
+                    error = flight.error
+                for item in pending:
+                    yield item
+                if finished:
+                    if error is not None:
+                        raise error
+                    return flight.result
+        finally:
+            with flight.condition:
+                flight.subscribers -= 1
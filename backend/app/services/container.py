@@ -0,0 +1,119 @@
+import logging
+import threading
+from typing import TYPE_CHECKING, Callable, Optional
+
+from app.core.config import get_settings
+
+if TYPE_CHECKING:
+    from app.services.rag_service import RAGService
+
+logger = logging.getLogger(__name__)
+
+STATUS_COLD = "cold"
+STATUS_WARMING = "warming"
+STATUS_READY = "ready"
+STATUS_DISABLED = "disabled"
+STATUS_FAILED = "failed"
+
+
+def build_rag_service() -> Optional["RAGService"]:
+    """The configured RAG service, or ``None`` when no OpenAI key is set."""
+    settings = get_settings()
+    if not settings.openai_api_key:
+        return None
+    # Imported here: openai/httpx and chromadb dominate import time and are not needed for /health
+    from app.services.category_router import CategoryRouter
+    from app.services.conversations import ConversationStore
+    from app.services.embeddings import get_embedding_provider
+    from app.services.llm_client import LLMClient
+    from app.services.rag_service import RAGService
+    from app.services.vector_store import get_vector_store
+
+    llm_client = LLMClient(api_key=settings.openai_api_key, embedding_provider=get_embedding_provider(settings))
+    vector_store = get_vector_store(embedding_model=llm_client.embedding_model)
+    return RAGService(
+        llm_client,
+        vector_store,
+        coalesce=settings.query_coalescing_enabled,
+        digests=settings.digests_enabled,
+        category_router=CategoryRouter(llm_client.embedding_model),
+        conversations=ConversationStore(settings.conversation_ttl_seconds, settings.conversation_cache_mib * 1024 * 1024),
+        conversation_reuse_similarity=settings.conversation_reuse_similarity,
+        conversation_extend_similarity=settings.conversation_extend_similarity,
+    )
+
+
+class ServiceContainer:
+    """
+    Builds the RAG service (LLM client and vector store) once, on first use.
+
+    Concurrent first requests wait for a single build. A failed build is not cached, so
+    the next request retries. ``warm_up`` runs the build on a background thread so the
+    process can serve ``/health`` immediately and report ready once the build is done.
+    """
+
+    def __init__(self, factory: Callable[[], Optional["RAGService"]] = build_rag_service) -> None:
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._built = False
+        self._rag_service: Optional["RAGService"] = None
+        self._warming = False
+        self._error: Optional[str] = None
+
+    def rag_service(self) -> Optional["RAGService"]:
+        if self._built:
+            return self._rag_service
+        with self._lock:
+            if not self._built:
+                try:
+                    self._rag_service = self._factory()
+                except Exception as exc:
+                    self._error = f"{type(exc).__name__}: {exc}"
+                    raise
+                self._error = None
+                self._built = True
+        return self._rag_service
+
+    def set_rag_service(self, rag_service: Optional["RAGService"]) -> None:
+        with self._lock:
+            self._rag_service = rag_service
+            self._built = True
+            self._error = None
+
+    def warm_up(self) -> threading.Thread:
+        def run() -> None:
+            try:
+                self.rag_service()
+                logger.info("Services warmed up (%s)", self.status())
+            except Exception:
+                logger.exception("Service warm-up failed; the first query will retry")
+            finally:
+                self._warming = False
+
+        self._warming = True
+        thread = threading.Thread(target=run, name="service-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def status(self) -> str:
+        if self._built:
+            return STATUS_READY if self._rag_service is not None else STATUS_DISABLED
+        if self._warming:
+            return STATUS_WARMING
+        return STATUS_FAILED if self._error else STATUS_COLD
+
+    @property
+    def error(self) -> Optional[str]:
+        return self._error
+
+
+_container: Optional[ServiceContainer] = None
+_container_lock = threading.Lock()
+
+
+def get_service_container() -> ServiceContainer:
+    global _container
+    with _container_lock:
+        if _container is None:
+            _container = ServiceContainer()
+        return _container
@@ -0,0 +1,222 @@
+"""
+Server-side context of chat conversations.
+
+A question sent with a ``conversation_id`` keeps the chunks it was answered from, with
+their embeddings, in a per-process ``ConversationStore``. The next question of the
+conversation can then be answered from them: references to an earlier article ("the second
+one") reuse them without embedding or search, a question close to the previous one ranks
+them by its embedding, and one on a related angle adds a single search's new chunks. The
+store expires conversations after a period of inactivity and evicts the least recently used
+ones to stay within a memory cap.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+Filters = Tuple[Optional[str], Optional[datetime], Optional[datetime]]
+
+_ORDINALS = {
+    "first": 1,
+    "second": 2,
+    "third": 3,
+    "fourth": 4,
+    "fifth": 5,
+    "sixth": 6,
+    "seventh": 7,
+    "eighth": 8,
+    "ninth": 9,
+    "tenth": 10,
+    "last": -1,
+}
+# "the second one", "the 3rd story", "article 2", "source #4"
+_REFERENCE = re.compile(
+    r"\b(?:(?P<ordinal>first|second|third|fourth|fifth|sixth|seventh|eighth|ninth|tenth|last|\d+(?:st|nd|rd|th))"
+    r"\s+(?:one|article|story|result|source|link)s?"
+    r"|(?:article|story|source)\s+#?(?P<number>\d+))\b"
+)
+# Rough per-record overhead of the dict and its keys, on top of the text it holds
+_RECORD_OVERHEAD_BYTES = 512
+
+
+def unit(embedding: Sequence[float]) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+
+def referenced_articles(question: str, records: List[Dict]) -> List[int]:
+    """Ids of the articles a follow-up refers to by their number in the previous answer's context."""
+    article_ids: List[int] = []
+    for match in _REFERENCE.finditer(question.lower()):
+        if match.group("number"):
+            number = int(match.group("number"))
+        else:
+            ordinal = match.group("ordinal")
+            number = _ORDINALS[ordinal] if ordinal in _ORDINALS else int(ordinal[:-2])
+        if number == -1:
+            number = len(records)
+        if 1 <= number <= len(records) and records[number - 1]["article_id"] not in article_ids:
+            article_ids.append(records[number - 1]["article_id"])
+    return article_ids
+
+
+class ConversationArticle(NamedTuple):
+    """The article fields of an answer's payload, without the content."""
+
+    id: int
+    title: str
+    source: str
+    url: str
+    published_at: Optional[datetime]
+    category: str
+
+
+@dataclass
+class Conversation:
+    """
+    The context of a conversation's last answer: its records (chunk text and article fields,
+    in citation order), their unit embeddings, the query embedding they were retrieved for
+    and the filters of the question.
+    """
+
+    filters: Filters
+    query: np.ndarray
+    records: List[Dict]
+    embeddings: np.ndarray
+    articles: Dict[int, ConversationArticle]
+    nbytes: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        # Only the articles of the kept records, in order of first appearance
+        self.articles = {record["article_id"]: self.articles[record["article_id"]] for record in self.records}
+        text_bytes = sum(
+            len(value) for record in self.records for value in record.values() if isinstance(value, str)
+        )
+        self.nbytes = (
+            self.query.nbytes
+            + self.embeddings.nbytes
+            + text_bytes
+            + _RECORD_OVERHEAD_BYTES * (len(self.records) + len(self.articles))
+        )
+
+    @classmethod
+    def from_records(
+        cls,
+        filters: Filters,
+        query_embedding: Sequence[float],
+        records: List[Dict],
+        articles: Dict[int, Any],
+    ) -> "Conversation":
+        """From retrieved records carrying their ``embedding``, and the article rows they were attached to."""
+        embeddings = [unit(record.pop("embedding")) for record in records]
+        return cls(
+            filters=filters,
+            query=unit(query_embedding),
+            records=records,
+            embeddings=np.stack(embeddings) if embeddings else np.zeros((0, 0), dtype=np.float32),
+            articles={
+                article_id: ConversationArticle(
+                    article.id, article.title, article.source, article.url, article.published_at, article.category
+                )
+                for article_id, article in articles.items()
+            },
+        )
+
+    def keys(self) -> Set[Tuple[int, Optional[int]]]:
+        return {(record["article_id"], record.get("chunk_index")) for record in self.records}
+
+    def _select(self, order: Sequence[int], query: np.ndarray) -> "Conversation":
+        return Conversation(
+            filters=self.filters,
+            query=query,
+            records=[self.records[index] for index in order],
+            embeddings=self.embeddings[list(order)],
+            articles=self.articles,
+        )
+
+    def focused(self, article_ids: List[int]) -> "Conversation":
+        """The same records, those of the referenced articles first."""
+        rank = {article_id: position for position, article_id in enumerate(article_ids)}
+        order = sorted(
+            range(len(self.records)), key=lambda index: rank.get(self.records[index]["article_id"], len(rank))
+        )
+        return self._select(order, self.query)
+
+    def ranked(self, query: np.ndarray, top_k: int) -> "Conversation":
+        """The ``top_k`` records closest to ``query``, closest first."""
+        order = np.argsort(-(self.embeddings @ query), kind="stable")[:top_k]
+        return self._select([int(index) for index in order], query)
+
+    def extended(
+        self, records: List[Dict], articles: Dict[int, Any], query: np.ndarray, top_k: int
+    ) -> "Conversation":
+        """These records and the new ``records`` ranked together by ``query``, keeping ``top_k``."""
+        added = Conversation.from_records(self.filters, query, records, articles)
+        combined = Conversation(
+            filters=self.filters,
+            query=query,
+            records=self.records + added.records,
+            embeddings=np.vstack([self.embeddings, added.embeddings]) if added.records else self.embeddings,
+            articles={**self.articles, **added.articles},
+        )
+        return combined.ranked(query, top_k)
+
+
+class ConversationStore:
+    """
+    Conversations by id, expired ``ttl_seconds`` after their last use and evicted least
+    recently used first once their total size exceeds ``max_bytes``. Thread-safe; per process,
+    so a conversation continues only on the replica that holds it (elsewhere the follow-up
+    is answered by full retrieval).
+    """
+
+    def __init__(self, ttl_seconds: float, max_bytes: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._lock = threading.Lock()
+        # Least recently used first, which is also the order of expiry
+        self._conversations: "OrderedDict[str, Tuple[float, Conversation]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._conversations)
+
+    def _remove(self, conversation_id: str) -> None:
+        _, conversation = self._conversations.pop(conversation_id)
+        self.nbytes -= conversation.nbytes
+
+    def _expire(self, now: float) -> None:
+        while self._conversations:
+            conversation_id, (expires_at, _) = next(iter(self._conversations.items()))
+            if expires_at > now:
+                return
+            self._remove(conversation_id)
+
+    def get(self, conversation_id: str) -> Optional[Conversation]:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._conversations.get(conversation_id)
+            if entry is None:
+                return None
+            self._conversations[conversation_id] = (now + self.ttl_seconds, entry[1])
+            self._conversations.move_to_end(conversation_id)
+            return entry[1]
+
+    def put(self, conversation_id: str, conversation: Conversation) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            if conversation_id in self._conversations:
+                self._remove(conversation_id)
+            if conversation.nbytes > self.max_bytes:
+                return
+            self._conversations[conversation_id] = (now + self.ttl_seconds, conversation)
+            self.nbytes += conversation.nbytes
+            while self.nbytes > self.max_bytes:
+                self._remove(next(iter(self._conversations)))
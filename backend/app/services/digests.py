@@ -0,0 +1,171 @@
+"""
+Per-category daily news digests.
+
+Generic questions such as "what's the latest tech news" or "sports headlines today" make
+up much of the query traffic and have the same answer for everyone until new articles
+arrive. Each ingestion run summarises the newest canonical articles of every category
+for today and yesterday (UTC) once, skipping digests whose articles have not changed,
+and ``RAGService`` answers matching questions from the stored digest without embedding
+or generation calls.
+"""
+import logging
+import re
+from datetime import date, datetime, time, timedelta
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings, get_settings
+from app.models.article import Article
+from app.models.news_digest import NewsDigest
+
+if TYPE_CHECKING:
+    from app.services.llm_client import LLMClient
+
+logger = logging.getLogger(__name__)
+
+DIGEST_SYSTEM_PROMPT = (
+    "You are a news editor writing a short digest of the day's news in one category.\n\n"
+    "Instructions:\n"
+    "1. Summarise the most important stories from the provided articles in 3 to 6 bullet points.\n"
+    "2. Cite every bullet's sources using this format: (Article N), where N is the article number shown.\n"
+    "3. Group articles about the same story into one bullet.\n"
+    "4. Only use information from the articles.\n"
+)
+# Characters of each article's content given to the model
+DIGEST_EXCERPT_CHARS = 1200
+
+# Words naming each ingested category in a question
+CATEGORY_WORDS = {
+    "technology": ("tech", "technology"),
+    "sports": ("sport", "sports"),
+    "business": ("business", "economy", "economic", "finance", "financial", "market", "markets"),
+    "general": ("general", "world", "national"),
+}
+_CATEGORY_BY_WORD = {word: category for category, words in CATEGORY_WORDS.items() for word in words}
+
+# A category word, optionally a recency word, and nothing else that would need retrieval
+_GENERIC_QUESTION = re.compile(
+    r"^(?:(?:what(?:'s| is| are)|whats|show me|give me|tell me|get me|any)\s+)?(?:the\s+)?"
+    r"(?:(?P<prefix>latest|recent|top|current|breaking|today's|todays|yesterday's|yesterdays)\s+)?"
+    r"(?P<topic>[a-z]+)\s+(?:news|headlines|stories|updates)"
+    r"(?:\s+(?:for\s+|from\s+)?(?P<suffix>today|yesterday|now|right now|this morning))?$"
+)
+
+
+def match_generic_question(question: str) -> Optional[Tuple[str, Optional[int]]]:
+    """
+    ``(category, days_ago)`` if ``question`` only asks for a category's news, else None.
+    ``days_ago`` is 0 for today, 1 for yesterday and None for "latest" (today's digest,
+    or yesterday's if there is none yet).
+    """
+    normalized = re.sub(r"\s+", " ", re.sub(r"[?!.]+$", "", question.strip().lower().replace("’", "'")))
+    match = _GENERIC_QUESTION.match(normalized)
+    if not match or match.group("topic") not in _CATEGORY_BY_WORD:
+        return None
+    when = " ".join(filter(None, [match.group("prefix"), match.group("suffix")]))
+    if "yesterday" in when:
+        days_ago: Optional[int] = 1
+    elif "today" in when or "morning" in when:
+        days_ago = 0
+    else:
+        days_ago = None
+    return _CATEGORY_BY_WORD[match.group("topic")], days_ago
+
+
+def find_digest(
+    session: Session, question: str, category: Optional[str] = None, now: Optional[datetime] = None
+) -> Optional[NewsDigest]:
+    """
+    The stored digest answering a generic question, or None if it is not one or none is stored.
+    "Latest" only takes today's or yesterday's digest: an older one means digests stopped being
+    refreshed, and the question goes through retrieval instead.
+    """
+    matched = match_generic_question(question)
+    if matched is None or (category and category != matched[0]):
+        return None
+    matched_category, days_ago = matched
+    today = (now or datetime.utcnow()).date()
+    query = session.query(NewsDigest).filter(NewsDigest.category == matched_category)
+    if days_ago is None:
+        query = query.filter(NewsDigest.day >= today - timedelta(days=1), NewsDigest.day <= today)
+    else:
+        query = query.filter(NewsDigest.day == today - timedelta(days=days_ago))
+    return query.order_by(NewsDigest.day.desc()).first()
+
+
+def headline_digest(category: str, articles: List) -> str:
+    """Digest without a language model: the headlines, cited like a generated one."""
+    lines = [f"Latest {category} headlines:"]
+    lines.extend(f"- {article.title} ({article.source}) (Article {number})" for number, article in enumerate(articles, 1))
+    return "\n".join(lines)
+
+
+def summarize(llm_client: Optional["LLMClient"], category: str, day: date, articles: List) -> str:
+    if llm_client is None:
+        return headline_digest(category, articles)
+    context = "\n".join(
+        f"  Article {number}:\n"
+        f"  Title: {article.title}\n"
+        f"  Source: {article.source}\n"
+        f"  Published at: {article.published_at.isoformat()}\n"
+        f"  Content:\n"
+        f"  {article.content[:DIGEST_EXCERPT_CHARS]}\n"
+        for number, article in enumerate(articles, 1)
+    )
+    user_prompt = (
+        f"You are given the following {category} news articles published on {day.isoformat()}:\n\n"
+        f"{context}\n\nWrite the digest of the {category} news for that day."
+    )
+    try:
+        return llm_client.generate_response(DIGEST_SYSTEM_PROMPT, user_prompt)
+    except Exception:
+        logger.exception("Digest generation failed for %s on %s, storing headlines instead", category, day)
+        return headline_digest(category, articles)
+
+
+def refresh_digests(
+    session: Session,
+    llm_client: Optional["LLMClient"] = None,
+    settings: Optional[Settings] = None,
+    now: Optional[datetime] = None,
+) -> int:
+    """
+    Write the digest of every category with articles published today or yesterday (UTC),
+    from its ``DIGEST_ARTICLES`` newest canonical articles. Digests whose articles are
+    unchanged since the last run are kept, so quiet categories cost nothing. Returns the
+    number of digests written.
+    """
+    settings = settings or get_settings()
+    today = (now or datetime.utcnow()).date()
+    written = 0
+    for day in (today - timedelta(days=1), today):
+        start = datetime.combine(day, time.min)
+        in_day = (
+            Article.canonical_id.is_(None),
+            Article.published_at >= start,
+            Article.published_at < start + timedelta(days=1),
+        )
+        categories = [row.category for row in session.query(Article.category).filter(*in_day).distinct()]
+        for category in sorted(categories):
+            articles = (
+                session.query(Article.id, Article.title, Article.source, Article.published_at, Article.content)
+                .filter(*in_day, Article.category == category)
+                .order_by(Article.published_at.desc(), Article.id.desc())
+                .limit(settings.digest_articles)
+                .all()
+            )
+            article_ids = [article.id for article in articles]
+            digest = session.query(NewsDigest).filter_by(category=category, day=day).first()
+            if digest is not None and digest.article_ids == article_ids:
+                continue
+            summary = summarize(llm_client, category, day, articles)
+            if digest is None:
+                digest = NewsDigest(category=category, day=day)
+                session.add(digest)
+            digest.summary = summary
+            digest.article_ids = article_ids
+            session.commit()
+            written += 1
+    logger.info("Wrote %s news digests", written)
+    return written
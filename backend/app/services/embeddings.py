@@ -0,0 +1,183 @@
+import hashlib
+import logging
+import math
+import re
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+from app.core.config import Settings, get_settings
+from app.utils.chunking import count_tokens
+
+if TYPE_CHECKING:
+    from app.services.openai_gateway import OpenAIGateway
+
+logger = logging.getLogger(__name__)
+
+# Model that every collection created before embeddings were tagged was built with.
+LEGACY_EMBEDDING_MODEL = "text-embedding-3-small"
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+class EmbeddingProvider(ABC):
+    """Turns text into vectors. Implementations must be safe to call from several threads."""
+
+    model_name: str
+    # Longest input the model embeds without truncation, in its own tokens; None if unbounded
+    max_input_tokens: Optional[int] = None
+
+    @abstractmethod
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        raise NotImplementedError
+
+    def count_tokens(self, text: str) -> int:
+        """Tokens of ``text`` as counted against ``max_input_tokens``; chunks are sized with it."""
+        return count_tokens(text)
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    max_input_tokens = 8191
+
+    def __init__(self, gateway: "OpenAIGateway", model_name: str = LEGACY_EMBEDDING_MODEL) -> None:
+        self.gateway = gateway
+        self.model_name = model_name
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        response = self.gateway.create_embeddings(self.model_name, texts)
+        return [item.embedding for item in response.data]
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """
+    CPU embeddings from a sentence-transformer exported to ONNX.
+
+    The model directory must contain ``model.onnx`` and the matching ``tokenizer.json``.
+    Inputs are split into batches that run on a small thread pool; onnxruntime releases
+    the GIL while a batch executes, so batches overlap on multi-core machines.
+    """
+
+    def __init__(self, model_dir: str, batch_size: int = 32, workers: int = 2, max_length: int = 256) -> None:
+        try:
+            import onnxruntime
+            from tokenizers import Tokenizer
+        except ImportError as exc:  # pragma: no cover - depends on optional packages
+            raise RuntimeError(
+                "The local embedding backend requires the 'onnxruntime' and 'tokenizers' packages "
+                "(pip install -r requirements-local-embeddings.txt)"
+            ) from exc
+
+        path = Path(model_dir)
+        self.model_name = f"local:{path.name}"
+        self.batch_size = batch_size
+        # Leave room for the [CLS]/[SEP] special tokens
+        self.max_input_tokens = max_length - 2
+        self.tokenizer = Tokenizer.from_file(str(path / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+        # Counts chunk sizes, so it must neither truncate nor pad
+        self.counting_tokenizer = Tokenizer.from_file(str(path / "tokenizer.json"))
+        self.counting_tokenizer.no_truncation()
+        self.counting_tokenizer.no_padding()
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(
+            str(path / "model.onnx"), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {item.name for item in self.session.get_inputs()}
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="embed")
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        import numpy as np
+
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([item.ids for item in encodings], dtype=np.int64)
+        attention_mask = np.array([item.attention_mask for item in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real tokens, then L2 normalisation (sentence-transformers default)
+        mask = attention_mask[..., None].astype(token_embeddings.dtype)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.tolist()
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.counting_tokenizer.encode(text, add_special_tokens=False).ids)
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        batches = [texts[i : i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if len(batches) == 1:
+            return self._embed_batch(batches[0])
+        results: List[List[float]] = []
+        for vectors in self.executor.map(self._embed_batch, batches):
+            results.extend(vectors)
+        return results
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic bag-of-words embeddings via feature hashing.
+
+    Needs no model files or network access, which makes it suitable for tests and
+    air-gapped environments. Texts sharing words end up close in cosine space, but
+    there is no semantic understanding beyond that.
+    """
+
+    def __init__(self, dimensions: int = 256) -> None:
+        self.dimensions = dimensions
+        self.model_name = f"hash-{dimensions}"
+
+    def _embed_one(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for token in TOKEN_RE.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dimensions] += sign
+        norm = math.sqrt(sum(component * component for component in vector))
+        if norm:
+            vector = [component / norm for component in vector]
+        return vector
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed_one(text) for text in texts]
+
+
+def get_embedding_provider(
+    settings: Optional[Settings] = None, gateway: Optional["OpenAIGateway"] = None
+) -> Optional[EmbeddingProvider]:
+    """
+    Build the embedding provider selected by ``Settings.embedding_backend``.
+
+    Returns None when the OpenAI backend is selected but no API key is configured,
+    mirroring how the rest of the app treats a missing key.
+    """
+    settings = settings or get_settings()
+    backend = settings.embedding_backend.lower()
+    if backend == "local":
+        if not settings.local_embedding_model_dir:
+            raise RuntimeError("LOCAL_EMBEDDING_MODEL_DIR must be set when EMBEDDING_BACKEND=local")
+        return LocalEmbeddingProvider(
+            settings.local_embedding_model_dir,
+            batch_size=settings.local_embedding_batch_size,
+            workers=settings.local_embedding_workers,
+        )
+    if backend == "hash":
+        return HashingEmbeddingProvider(settings.hash_embedding_dimensions)
+    if backend != "openai":
+        raise ValueError(f"Unknown embedding backend: {settings.embedding_backend}")
+    if gateway is None:
+        if not settings.openai_api_key:
+            return None
+        from app.services.openai_gateway import get_openai_gateway
+
+        gateway = get_openai_gateway(settings=settings)
+    return OpenAIEmbeddingProvider(gateway, settings.embedding_model)
@@ -0,0 +1,66 @@
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.article import Article
+from app.models.article_band import ArticleBand
+from app.utils.minhash import band_keys, signature, similarity
+
+logger = logging.getLogger(__name__)
+
+
+def link_near_duplicate(session: Session, article: Article) -> Optional[Article]:
+    """
+    Fingerprint ``article`` and link it to the canonical article it nearly duplicates.
+
+    Candidates are canonical articles published within ``DEDUP_WINDOW_DAYS`` that share an
+    LSH band; the most similar one at or above ``DEDUP_SIMILARITY_THRESHOLD`` becomes
+    ``canonical_id``. Only canonical articles keep band rows, so the lookup index holds one
+    entry per story. Returns the canonical article, or ``None`` if ``article`` is canonical.
+    Changes are flushed, not committed.
+    """
+    settings = get_settings()
+    article.minhash = signature(article.content)
+    if article.id is None:
+        session.flush()
+    session.query(ArticleBand).filter(ArticleBand.article_id == article.id).delete(synchronize_session=False)
+    canonical = None
+    if article.minhash is not None:
+        keys = band_keys(article.minhash)
+        window = timedelta(days=settings.dedup_window_days)
+        candidates = (
+            session.query(Article)
+            .join(ArticleBand, ArticleBand.article_id == Article.id)
+            .filter(
+                ArticleBand.band_key.in_(keys),
+                Article.id != article.id,
+                Article.canonical_id.is_(None),
+                Article.published_at.between(article.published_at - window, article.published_at + window),
+            )
+            .distinct()
+            .all()
+        )
+        best_score = settings.dedup_similarity_threshold
+        for candidate in candidates:
+            score = similarity(article.minhash, candidate.minhash)
+            if score >= best_score:
+                canonical, best_score = candidate, score
+    if canonical is not None:
+        logger.info(
+            "Article %s (%s) duplicates article %s (%s), similarity %.2f",
+            article.id, article.source, canonical.id, canonical.source, best_score,
+        )
+        article.canonical_id = canonical.id
+        # Copies that pointed here now point at the story's canonical article
+        session.query(Article).filter(Article.canonical_id == article.id).update(
+            {Article.canonical_id: canonical.id}, synchronize_session=False
+        )
+    else:
+        article.canonical_id = None
+        if article.minhash is not None:
+            session.add_all(ArticleBand(band_key=key, article_id=article.id) for key in set(keys))
+    session.flush()
+    return canonical
@@ -5,7 +5,7 @@ import requests
 
 from app.core.config import get_settings
 from app.schemas.article import ArticleCreate
-from app.utils.text_cleaning import clean_html
+from app.utils.content_extraction import extract_content
 
 from .base_ingestor import BaseIngestor
 
@@ -33,7 +33,7 @@ class HackerNewsIngestor(BaseIngestor):
                 continue
 
             content = story.get("text") or story.get("title")
-            cleaned_content = clean_html(content)
+            cleaned_content = extract_content(content).text
             published_at = datetime.fromtimestamp(story.get("time", datetime.now().timestamp()), tz=timezone.utc)
             
             # Try to extract image from URL metadata or content
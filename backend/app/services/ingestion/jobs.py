@@ -0,0 +1,209 @@
+import logging
+import multiprocessing
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.services.ingestion.lock import IngestionLock, get_ingestion_lock
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINISHED = {SUCCEEDED, FAILED, CANCELLED}
+
+
+class IngestionCancelled(Exception):
+    pass
+
+
+class JobProgress:
+    """Progress sink and cancellation flag handed to the ingestion pipeline for one job."""
+
+    def __init__(self, on_update: Callable[[str, str, int], None], is_cancelled: Callable[[], bool]) -> None:
+        self.on_update = on_update
+        self.is_cancelled = is_cancelled
+
+    def record(self, source: str, counter: str, amount: int = 1) -> None:
+        self.on_update(source, counter, amount)
+
+    def check_cancelled(self) -> None:
+        if self.is_cancelled():
+            raise IngestionCancelled()
+
+
+class IngestionJob:
+    def __init__(self, sources: List[str]) -> None:
+        self.id = uuid.uuid4().hex[:12]
+        self.sources = sources
+        self.status = QUEUED
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        # source -> counter -> value; counters are fetched/persisted/embedded/unchanged/embed_failed/failed
+        self.progress: Dict[str, Dict[str, int]] = {}
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def record(self, source: str, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            counters = self.progress.setdefault(source, {})
+            counters[counter] = counters.get(counter, 0) + amount
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            progress = {source: dict(counters) for source, counters in self.progress.items()}
+        return {
+            "id": self.id,
+            "status": self.status,
+            "sources": self.sources,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "cancel_requested": self.cancel_event.is_set() and self.status not in FINISHED,
+            "error": self.error,
+            "progress": progress,
+        }
+
+
+def _run_in_thread(job: IngestionJob) -> None:
+    from app.services.ingestion.pipeline import run_sources
+
+    run_sources(job.sources, JobProgress(job.record, job.cancel_event.is_set))
+
+
+def _process_main(sources: List[str], events: "multiprocessing.Queue", cancel: "multiprocessing.Event") -> None:
+    """Entry point of the worker process; progress travels back over ``events``."""
+    from app.services.ingestion.pipeline import run_sources
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        run_sources(sources, JobProgress(lambda *update: events.put(update), cancel.is_set))
+    except IngestionCancelled:
+        events.put(("__job__", CANCELLED, 0))
+    except Exception as exc:
+        events.put(("__job__", f"{exc.__class__.__name__}: {exc}", 0))
+        raise
+
+
+def _run_in_process(job: IngestionJob) -> None:
+    context = multiprocessing.get_context("spawn")
+    events = context.Queue()
+    cancel = context.Event()
+    process = context.Process(target=_process_main, args=(job.sources, events, cancel), name=f"ingest-{job.id}")
+    process.start()
+    outcome: Optional[str] = None
+    while True:
+        if job.cancel_event.is_set():
+            cancel.set()
+        try:
+            source, counter, amount = events.get(timeout=0.2)
+        except queue.Empty:
+            if not process.is_alive():
+                break
+            continue
+        if source == "__job__":
+            outcome = counter
+        else:
+            job.record(source, counter, amount)
+    process.join()
+    if outcome == CANCELLED:
+        raise IngestionCancelled()
+    if outcome or process.exitcode:
+        raise RuntimeError(outcome or f"ingestion worker exited with code {process.exitcode}")
+
+
+class JobManager:
+    """
+    Runs admin-triggered ingestion as tracked jobs, one at a time.
+
+    Submitting while a job is queued or running returns that job instead of starting
+    another. Jobs take the shared ingestion lock, so they also wait for a scheduler run in
+    another process to finish. With ``use_process`` the work happens in a spawned worker
+    process, keeping parsing and chunking CPU off the API process.
+    """
+
+    def __init__(
+        self,
+        lock: Optional[IngestionLock] = None,
+        use_process: bool = False,
+        keep: int = 20,
+        runner: Optional[Callable[[IngestionJob], None]] = None,
+    ) -> None:
+        self.lock = lock or get_ingestion_lock()
+        self.runner = runner or (_run_in_process if use_process else _run_in_thread)
+        self.keep = keep
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._guard = threading.Lock()
+
+    def submit(self, sources: List[str]) -> Tuple[IngestionJob, bool]:
+        """Start a job, or return the active one. The flag is True when a new job was created."""
+        with self._guard:
+            active = next((job for job in self._jobs.values() if job.status not in FINISHED), None)
+            if active is not None:
+                return active, False
+            job = IngestionJob(sources)
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.keep:
+                self._jobs.popitem(last=False)
+        threading.Thread(target=self._execute, args=(job,), name=f"ingest-job-{job.id}", daemon=True).start()
+        return job, True
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[IngestionJob]:
+        return list(reversed(self._jobs.values()))
+
+    def cancel(self, job_id: str) -> Optional[IngestionJob]:
+        job = self._jobs.get(job_id)
+        if job is not None and job.status not in FINISHED:
+            job.cancel_event.set()
+        return job
+
+    def _execute(self, job: IngestionJob) -> None:
+        # Poll so a job waiting behind a scheduler run can still be cancelled
+        while not self.lock.acquire(blocking=False):
+            if job.cancel_event.wait(1.0):
+                self._finish(job, CANCELLED)
+                return
+        try:
+            job.status = RUNNING
+            job.started_at = datetime.utcnow()
+            self.runner(job)
+        except IngestionCancelled:
+            self._finish(job, CANCELLED)
+        except Exception as exc:
+            logger.exception("Ingestion job %s failed", job.id)
+            self._finish(job, FAILED, f"{exc.__class__.__name__}: {exc}")
+        else:
+            self._finish(job, SUCCEEDED)
+        finally:
+            self.lock.release()
+
+    @staticmethod
+    def _finish(job: IngestionJob, status: str, error: Optional[str] = None) -> None:
+        job.error = error
+        job.finished_at = datetime.utcnow()
+        job.status = status
+        logger.info("Ingestion job %s %s", job.id, status)
+
+
+_manager: Optional[JobManager] = None
+_manager_guard = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    global _manager
+    with _manager_guard:
+        if _manager is None:
+            from app.core.config import get_settings
+
+            settings = get_settings()
+            _manager = JobManager(
+                use_process=settings.ingestion_job_mode == "process", keep=settings.ingestion_jobs_keep
+            )
+        return _manager
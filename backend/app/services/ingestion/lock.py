@@ -0,0 +1,172 @@
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_lock key shared by every process ingesting into the same Postgres database
+ADVISORY_LOCK_KEY = 0x4E657773  # "News"
+
+
+class IngestionLock:
+    """
+    Mutual exclusion for ingestion runs, within and across processes.
+
+    A thread lock serialises runs inside one process; an ``flock`` on ``path`` extends that to
+    the scheduler daemon, ``ingest.py`` and the API process sharing one data directory. Where
+    ``fcntl`` is unavailable only the in-process guarantee holds. With a Postgres ``engine``
+    a session-level advisory lock is taken as well, covering replicas on other hosts.
+    """
+
+    def __init__(self, path: Optional[str], engine: Optional[Engine] = None) -> None:
+        self.path = Path(path) if path else None
+        self.engine = engine if engine is not None and engine.dialect.name == "postgresql" else None
+        self._thread_lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._connection: Optional[Connection] = None
+
+    def acquire(self, blocking: bool = False) -> bool:
+        if not self._thread_lock.acquire(blocking=blocking):
+            return False
+        if not self._acquire_file(blocking):
+            return False
+        acquired = False
+        try:
+            acquired = self._acquire_advisory(blocking)
+            return acquired
+        finally:
+            if not acquired:
+                self._release_file()
+                self._thread_lock.release()
+
+    def _acquire_advisory(self, blocking: bool) -> bool:
+        if self.engine is None:
+            return True
+        connection = self.engine.connect()
+        try:
+            if blocking:
+                connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+                acquired = True
+            else:
+                acquired = connection.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY}
+                ).scalar()
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return False
+        self._connection = connection
+        return True
+
+    def _acquire_file(self, blocking: bool) -> bool:
+        if self.path is None or fcntl is None:
+            return True
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                self._thread_lock.release()
+                return False
+            os.ftruncate(fd, 0)
+            os.write(fd, str(os.getpid()).encode("ascii"))
+            self._fd = fd
+            return True
+        except Exception:
+            self._thread_lock.release()
+            raise
+
+    def _release_file(self) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+    def release(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+                self._connection.commit()
+            finally:
+                self._connection.close()
+                self._connection = None
+        self._release_file()
+        self._thread_lock.release()
+
+    def locked(self) -> bool:
+        """Whether a run holds the lock in this or another process, without taking it."""
+        return self._thread_lock.locked() or self._file_locked() or self._advisory_locked()
+
+    def _file_locked(self) -> bool:
+        """
+        Probe with a non-blocking shared ``flock`` on a read-only descriptor: the lockfile is
+        neither created nor rewritten, and the probe holds nothing once it returns. A
+        non-blocking ``acquire`` racing the probe can still see the file as busy for that instant.
+        """
+        if self.path is None or fcntl is None:
+            return False
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except FileNotFoundError:
+            return False
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        finally:
+            os.close(fd)  # closing the descriptor drops the probe's shared lock
+        return False
+
+    def _advisory_locked(self) -> bool:
+        """Whether any session of this database holds the advisory lock, read from ``pg_locks``."""
+        if self.engine is None:
+            return False
+        # A single bigint key is split into classid (high 32 bits) and objid (low 32 bits), objsubid 1
+        with self.engine.connect() as connection:
+            return bool(
+                connection.execute(
+                    text(
+                        "SELECT EXISTS (SELECT 1 FROM pg_locks WHERE locktype = 'advisory' AND granted "
+                        "AND database = (SELECT oid FROM pg_database WHERE datname = current_database()) "
+                        "AND classid = :high AND objid = :low AND objsubid = 1)"
+                    ),
+                    {"high": ADVISORY_LOCK_KEY >> 32, "low": ADVISORY_LOCK_KEY & 0xFFFFFFFF},
+                ).scalar()
+            )
+
+    def __enter__(self) -> "IngestionLock":
+        self.acquire(blocking=True)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+_lock: Optional[IngestionLock] = None
+_lock_guard = threading.Lock()
+
+
+def get_ingestion_lock() -> IngestionLock:
+    global _lock
+    with _lock_guard:
+        if _lock is None:
+            from app.core.config import get_settings
+            from app.core.db import engine
+
+            _lock = IngestionLock(get_settings().ingestion_lock_path, engine=engine)
+        return _lock
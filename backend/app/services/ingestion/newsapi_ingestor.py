@@ -5,7 +5,7 @@ import requests
 
 from app.core.config import get_settings
 from app.schemas.article import ArticleCreate
-from app.utils.text_cleaning import clean_html
+from app.utils.content_extraction import extract_content
 
 from .base_ingestor import BaseIngestor
 
@@ -63,7 +63,7 @@ class NewsAPIIngestor(BaseIngestor):
                     
                     # Get content
                     content = article_data.get("content") or article_data.get("description") or article_data.get("title", "")
-                    cleaned_content = clean_html(content)
+                    cleaned_content = extract_content(content).text
                     
                     # Get image URL if available
                     image_url = article_data.get("urlToImage") or article_data.get("image")
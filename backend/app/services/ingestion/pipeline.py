@@ -1,46 +1,59 @@
 import logging
-from typing import Iterable, List
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
+from app.core.metrics import INGESTION_ARTICLES, INGESTION_STAGE_SECONDS
 from app.core.db import Base, SessionLocal, engine
 from app.models.article import Article
+from app.models.ingestion_state import IngestionSourceState
 from app.schemas.article import ArticleCreate
+from app.services.category_router import refresh_category_centroids
+from app.services.digests import refresh_digests
+from app.services.embeddings import EmbeddingProvider, get_embedding_provider
+from app.services.ingestion.base_ingestor import BaseIngestor
+from app.services.ingestion.dedup import link_near_duplicate
 from app.services.ingestion.hn_ingestor import HackerNewsIngestor
+from app.services.ingestion.jobs import IngestionCancelled, JobProgress
+from app.services.ingestion.lock import get_ingestion_lock
 from app.services.ingestion.newsapi_ingestor import NewsAPIIngestor
 from app.services.ingestion.rss_ingestor import RSSIngestor
-from app.services.llm_client import LLMClient
-from app.services.vector_store import VectorStore
+from app.services.related_articles import delete_article_vector, store_article_vector
+from app.services.trending import TopicClusterer
+from app.services.vector_store import VectorStore, get_vector_store
+from app.utils.chunking import chunk_spans
 
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# Ingestion sources by the name used in metrics, scheduler state and the admin API
+SOURCES: Dict[str, Callable[[], BaseIngestor]] = {
+    "hacker_news": HackerNewsIngestor,
+    "rss": RSSIngestor,
+    "newsapi": NewsAPIIngestor,
+}
 
-def chunk_text(text: str, chunk_size: int, overlap: int) -> List[str]:
-    if not text:
-        return []
-    chunks: List[str] = []
-    start = 0
-    length = len(text)
-    while start < length:
-        end = min(start + chunk_size, length)
-        chunk = text[start:end].strip()
-        if chunk:
-            chunks.append(chunk)
-        if end == length:
-            break
-        start = max(0, end - overlap)
-        if start >= length:
-            break
-    return chunks
-
-
-def upsert_article(session: Session, article_data: ArticleCreate) -> Article:
+
+def chunk_limit(embedder: EmbeddingProvider) -> int:
+    """Configured chunk size, lowered to what the embedding model accepts without truncation."""
+    if embedder.max_input_tokens:
+        return min(settings.chunk_max_tokens, embedder.max_input_tokens)
+    return settings.chunk_max_tokens
+
+
+def upsert_article(session: Session, article_data: ArticleCreate) -> Tuple[Article, bool]:
+    """
+    Insert or update by URL. The flag is False when title and content were already stored as-is.
+    New or changed articles are linked to the canonical copy of their story (``canonical_id``).
+    """
     url_str = str(article_data.url)
     article = session.query(Article).filter(Article.url == url_str).first()
+    changed = True
     if article:
+        changed = (article.title, article.content) != (article_data.title, article_data.content)
         article.title = article_data.title
         article.source = article_data.source
         article.published_at = article_data.published_at
@@ -52,55 +65,163 @@ def upsert_article(session: Session, article_data: ArticleCreate) -> Article:
         payload["url"] = url_str
         article = Article(**payload)
         session.add(article)
+    if changed and settings.dedup_enabled:
+        link_near_duplicate(session, article)
     session.commit()
     session.refresh(article)
-    return article
+    return article, changed
 
 
 def ingest_articles(
     session: Session,
     articles: Iterable[ArticleCreate],
     vector_store: VectorStore,
-    llm_client: LLMClient | None,
+    embedder: EmbeddingProvider | None,
+    source: str = "unknown",
+    progress: Optional[JobProgress] = None,
 ):
+    def count(outcome: str) -> None:
+        INGESTION_ARTICLES.inc(source=source, outcome=outcome)
+        if progress:
+            progress.record(source, outcome)
+
+    max_tokens = chunk_limit(embedder) if embedder else settings.chunk_max_tokens
+    # Trending topics are clustered from article vectors, which need an embedder
+    clusterer = TopicClusterer(session) if embedder else None
     for article_data in articles:
-        article = upsert_article(session, article_data)
-        if not llm_client:
+        if progress:
+            progress.check_cancelled()
+        with INGESTION_STAGE_SECONDS.time(source=source, stage="persist"):
+            article, changed = upsert_article(session, article_data)
+        count("persisted")
+        if article.canonical_id is not None:
+            # Another outlet's copy of a stored story: retrieval already finds the canonical one
+            count("duplicate")
+            if changed:
+                delete_article_vector(session, article.id)
+                session.commit()
+                if embedder:
+                    vector_store.delete_article(article.id)
+            if clusterer and clusterer.add_copy(article.id, article.canonical_id, article.published_at):
+                session.commit()
             continue
-        chunks = chunk_text(article.content, settings.chunk_size, settings.chunk_overlap)
+        if not embedder:
+            continue
+        if not changed and vector_store.has_article(article.id):
+            count("unchanged")
+            continue
+        with INGESTION_STAGE_SECONDS.time(source=source, stage="chunk"):
+            spans = chunk_spans(article.content, max_tokens, settings.chunk_overlap_tokens, embedder.count_tokens)
+            chunks = [article.content[start:end] for start, end in spans]
         if not chunks:
             continue
-        embeddings = llm_client.embed_texts(chunks)
-        vector_store.add_chunks(
-            article.id,
-            chunks,
-            embeddings,
-            metadata={
-                "category": article.category,
-                "published_at": article.published_at.isoformat(),
-                "title": article.title,
-                "source": article.source,
-                "url": article.url,
-            },
-        )
-
-
-def run_ingestion():
-    logging.basicConfig(level=logging.INFO)
-    logger.info("Starting ingestion pipeline")
+        try:
+            with INGESTION_STAGE_SECONDS.time(source=source, stage="embed"):
+                embeddings = embedder.embed_texts(chunks)
+        except Exception:
+            # Retries are exhausted at this point; keep the article and move on so one
+            # failure does not abort the rest of the run.
+            logger.exception("Embedding failed for article %s, skipping its chunks", article.id)
+            count("embed_failed")
+            if changed:
+                # Old chunks point at offsets in the previous content; the next run re-embeds
+                vector_store.delete_article(article.id)
+                delete_article_vector(session, article.id)
+                session.commit()
+            continue
+        with INGESTION_STAGE_SECONDS.time(source=source, stage="index"):
+            vector_store.add_chunks(
+                article.id,
+                spans,
+                embeddings,
+                metadata={"category": article.category, "published_at": article.published_at},
+            )
+            # The centroid serves related-article lookups without embedding calls at request time
+            vector = store_article_vector(session, article.id, embedder.model_name, embeddings)
+            clusterer.add_article(article.id, article.category, article.published_at, embedder.model_name, vector)
+            session.commit()
+        count("embedded")
+
+
+def ingest_source(
+    session: Session,
+    name: str,
+    vector_store: VectorStore,
+    embedder: EmbeddingProvider | None,
+    progress: Optional[JobProgress] = None,
+) -> IngestionSourceState:
+    """Fetch and ingest one source, recording the outcome in ``ingestion_source_state``."""
+    state = session.get(IngestionSourceState, name) or IngestionSourceState(source=name, consecutive_failures=0)
+    state.last_started_at = datetime.utcnow()
+    session.add(state)
+    session.commit()
+    try:
+        with INGESTION_STAGE_SECONDS.time(source=name, stage="fetch"):
+            articles = SOURCES[name]().fetch_articles()
+        logger.info("Fetched %s articles from %s", len(articles), name)
+        if progress:
+            progress.record(name, "fetched", len(articles))
+        ingest_articles(session, articles, vector_store, embedder, source=name, progress=progress)
+    except IngestionCancelled:
+        session.rollback()
+        raise
+    except Exception as exc:
+        session.rollback()
+        logger.exception("Ingestion failed for %s", name)
+        state = session.get(IngestionSourceState, name)
+        state.last_error_at = datetime.utcnow()
+        state.last_error = f"{exc.__class__.__name__}: {exc}"[:2000]
+        state.consecutive_failures += 1
+        if progress:
+            progress.record(name, "failed")
+    else:
+        state.last_success_at = datetime.utcnow()
+        state.consecutive_failures = 0
+        state.articles_last_run = len(articles)
+    session.commit()
+    return state
+
+
+def digest_llm_client(embedder: EmbeddingProvider | None):
+    """LLM client for writing digests; without an OpenAI key digests list headlines."""
+    if not settings.openai_api_key:
+        return None
+    from app.services.llm_client import LLMClient
+
+    return LLMClient(api_key=settings.openai_api_key, embedding_provider=embedder)
+
+
+def after_ingestion(session: Session, embedder: EmbeddingProvider | None) -> None:
+    """
+    Rebuild what is derived from the ingested articles: the category centroids the question
+    router compares against, then the digests. Every ingestion entry point (``run_sources``
+    and the scheduler) calls this once after its sources, while holding the ingestion lock.
+    """
+    if embedder:
+        refresh_category_centroids(session)
+    if settings.digests_enabled:
+        refresh_digests(session, digest_llm_client(embedder))
+
+
+def run_sources(sources: List[str], progress: Optional[JobProgress] = None) -> None:
+    """Ingest ``sources`` in order. Callers hold the ingestion lock."""
     Base.metadata.create_all(bind=engine)
-    llm_client = None
-    if settings.openai_api_key:
-        llm_client = LLMClient(api_key=settings.openai_api_key)
-    vector_store = VectorStore()
+    embedder = get_embedding_provider(settings)
+    vector_store = get_vector_store(embedding_model=embedder.model_name if embedder else None)
     session = SessionLocal()
     try:
-        ingestors = [HackerNewsIngestor(), RSSIngestor(), NewsAPIIngestor()]
-        for ingestor in ingestors:
-            articles = ingestor.fetch_articles()
-            logger.info("Fetched %s articles from %s", len(articles), ingestor.__class__.__name__)
-            ingest_articles(session, articles, vector_store, llm_client)
+        for name in sources:
+            if progress:
+                progress.check_cancelled()
+            ingest_source(session, name, vector_store, embedder, progress)
+        after_ingestion(session, embedder)
     finally:
         session.close()
-    logger.info("Ingestion complete")
 
+
+def run_ingestion(sources: Optional[List[str]] = None):
+    logging.basicConfig(level=logging.INFO)
+    logger.info("Starting ingestion pipeline")
+    with get_ingestion_lock():
+        run_sources(sources or list(SOURCES))
+    logger.info("Ingestion complete")
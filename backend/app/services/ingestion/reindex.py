@@ -0,0 +1,207 @@
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings, get_settings
+from app.core.db import SessionLocal
+from app.models.article import Article
+from app.models.article_vector import StagedArticleVector
+from app.services.category_router import refresh_category_centroids
+from app.services.embeddings import EmbeddingProvider, get_embedding_provider
+from app.services.ingestion.lock import get_ingestion_lock
+from app.services.ingestion.pipeline import chunk_limit
+from app.services.related_articles import promote_staged_vectors, stage_article_vector
+from app.services.vector_store import COLLECTION_NAME, ArticleChunks, get_vector_store
+from app.utils.chunking import chunk_spans
+
+logger = logging.getLogger(__name__)
+
+
+def new_index_name(backend: str) -> str:
+    if backend == "pgvector":
+        from app.services.pgvector_store import CHUNKS_TABLE
+
+        base = CHUNKS_TABLE
+    else:
+        base = COLLECTION_NAME
+    return f"{base}_{datetime.utcnow():%Y%m%d%H%M%S%f}"
+
+
+def load_checkpoint(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        logger.warning("Ignoring unreadable reindex checkpoint %s", path)
+        return None
+
+
+def save_checkpoint(path: Path, state: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(f"{path.name}.tmp")
+    staging.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    os.replace(staging, path)
+
+
+def article_batches(session: Session, after_id: int, batch_size: int) -> Iterator[List[Any]]:
+    """
+    Canonical articles with ``id > after_id`` in id order, ``batch_size`` rows at a time.
+    Each batch is a keyset query, so memory stays flat and a resumed run starts where the
+    last one stopped.
+    """
+    while True:
+        rows = (
+            session.query(Article.id, Article.content, Article.category, Article.published_at)
+            .filter(Article.id > after_id, Article.canonical_id.is_(None))
+            .order_by(Article.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            return
+        yield rows
+        after_id = rows[-1].id
+
+
+def embed_batch(
+    embedder: EmbeddingProvider, rows: List[Any], max_tokens: int, overlap_tokens: int
+) -> Tuple[int, List[ArticleChunks]]:
+    """Chunk and embed a batch of articles with one embedding call; returns the last id and the chunks."""
+    pending = []
+    texts: List[str] = []
+    for row in rows:
+        spans = chunk_spans(row.content, max_tokens, overlap_tokens, embedder.count_tokens)
+        if spans:
+            pending.append((row, spans))
+            texts.extend(row.content[start:end] for start, end in spans)
+    embeddings = embedder.embed_texts(texts) if texts else []
+    articles: List[ArticleChunks] = []
+    offset = 0
+    for row, spans in pending:
+        metadata = {"category": row.category, "published_at": row.published_at}
+        articles.append((row.id, spans, embeddings[offset : offset + len(spans)], metadata))
+        offset += len(spans)
+    return rows[-1].id, articles
+
+
+def reindex(
+    embedder: Optional[EmbeddingProvider] = None,
+    session_factory: Callable[[], Session] = SessionLocal,
+    batch_size: Optional[int] = None,
+    workers: Optional[int] = None,
+    restart: bool = False,
+    settings: Optional[Settings] = None,
+) -> Dict[str, Any]:
+    """
+    Rebuild the vector index from the ``articles`` table into a new collection (or table).
+
+    Batches of articles are read in id order and chunked and embedded on ``workers``
+    threads; results are written in order and the last written article id is saved to
+    ``REINDEX_CHECKPOINT_PATH`` after every batch. A later run with the same backend,
+    embedding model and chunk settings resumes from there. Article vectors are staged for
+    the new index too. When every article is indexed they replace ``article_vectors``, the
+    category centroids are recomputed from them in the same transaction, and the new index
+    is activated; until then readers keep using the old index, vectors and centroids.
+    Returns the final checkpoint state. Callers hold the ingestion lock, so no article
+    changes while the index is rebuilt.
+    """
+    settings = settings or get_settings()
+    embedder = embedder or get_embedding_provider(settings)
+    if embedder is None:
+        raise RuntimeError("No embedding provider is configured; set OPENAI_API_KEY or EMBEDDING_BACKEND")
+    batch_size = batch_size or settings.reindex_batch_size
+    workers = max(1, workers or settings.reindex_workers)
+    path = Path(settings.reindex_checkpoint_path)
+    # A checkpoint is resumed only if these match; otherwise the rebuild starts over
+    config = {
+        "backend": settings.vector_backend.lower(),
+        "embedding_model": embedder.model_name,
+        "chunk_max_tokens": chunk_limit(embedder),
+        "chunk_overlap_tokens": settings.chunk_overlap_tokens,
+    }
+
+    state = None if restart else load_checkpoint(path)
+    if state and all(state.get(key) == value for key, value in config.items()):
+        logger.info("Resuming rebuild of '%s' after article %s", state["index"], state["last_article_id"])
+        store = get_vector_store(embedding_model=embedder.model_name, index_name=state["index"])
+    else:
+        state = {**config, "index": new_index_name(config["backend"]), "last_article_id": 0, "articles": 0, "chunks": 0}
+        logger.info("Rebuilding the vector index into '%s'", state["index"])
+        store = get_vector_store(embedding_model=embedder.model_name, index_name=state["index"])
+        # Earlier indexes and abandoned rebuilds; the active index stays until the swap
+        store.drop_inactive()
+        save_checkpoint(path, state)
+
+    started = time.perf_counter()
+    session = session_factory()
+    StagedArticleVector.__table__.create(session.connection(), checkfirst=True)
+    session.commit()
+    pending: Deque[Future] = deque()
+
+    def write_next() -> None:
+        last_id, articles = pending.popleft().result()
+        store.add_articles(articles)
+        for article_id, _, embeddings, _ in articles:
+            stage_article_vector(session, state["index"], article_id, embedder.model_name, embeddings)
+        session.commit()
+        state["last_article_id"] = last_id
+        state["articles"] += len(articles)
+        state["chunks"] += sum(len(item[1]) for item in articles)
+        save_checkpoint(path, state)
+        logger.info(
+            "Indexed %s articles (%s chunks) up to id %s, %.1f articles/s",
+            state["articles"], state["chunks"], last_id, state["articles"] / max(time.perf_counter() - started, 1e-9),
+        )
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reindex") as executor:
+            try:
+                for rows in article_batches(session, state["last_article_id"], batch_size):
+                    pending.append(
+                        executor.submit(
+                            embed_batch, embedder, rows, config["chunk_max_tokens"], config["chunk_overlap_tokens"]
+                        )
+                    )
+                    # At most one batch per worker in flight keeps memory bounded
+                    if len(pending) >= workers:
+                        write_next()
+                while pending:
+                    write_next()
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+        def promote() -> None:
+            promote_staged_vectors(session, state["index"])
+            # Article vectors may now come from another model; route questions with matching centroids
+            refresh_category_centroids(session, settings)
+
+        store.activate(promote)
+        # Including those of abandoned rebuilds
+        session.query(StagedArticleVector).delete(synchronize_session=False)
+        session.commit()
+    finally:
+        session.close()
+
+    path.unlink(missing_ok=True)
+    logger.info(
+        "Activated '%s': %s articles, %s chunks in %.1fs",
+        state["index"], state["articles"], state["chunks"], time.perf_counter() - started,
+    )
+    return state
+
+
+def run_reindex(**kwargs: Any) -> Dict[str, Any]:
+    logging.basicConfig(level=logging.INFO)
+    with get_ingestion_lock():
+        return reindex(**kwargs)
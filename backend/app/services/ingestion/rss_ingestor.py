@@ -5,7 +5,7 @@ import feedparser
 import requests
 
 from app.schemas.article import ArticleCreate
-from app.utils.text_cleaning import clean_html
+from app.utils.content_extraction import extract_content, extract_content_stream
 
 from .base_ingestor import BaseIngestor
 
@@ -50,8 +50,8 @@ class RSSIngestor(BaseIngestor):
         for feed in RSS_FEEDS:
             parsed = feedparser.parse(feed["url"])
             for entry in parsed.entries:
-                summary = entry.get("summary", entry.get("description", ""))
-                content_text = clean_html(summary)
+                summary = extract_content(entry.get("summary", entry.get("description", "")))
+                content_text = summary.text
                 if not content_text:
                     continue
                 link = entry.get("link")
@@ -76,20 +76,10 @@ class RSSIngestor(BaseIngestor):
                         if link_obj.get("type", "").startswith("image/"):
                             image_url = link_obj.get("href")
                             break
-                
-                # Try to extract image from summary/description HTML
+
+                # Fall back to og:image / first <img> of the summary HTML
                 if not image_url:
-                    import re
-                    summary_html = entry.get("summary", entry.get("description", ""))
-                    if summary_html:
-                        # Look for img tags
-                        img_match = re.search(r'<img[^>]+src=["\']([^"\']+)["\']', summary_html, re.IGNORECASE)
-                        if img_match:
-                            image_url = img_match.group(1)
-                        # Look for og:image or twitter:image meta tags in content
-                        og_match = re.search(r'<meta[^>]+property=["\']og:image["\'][^>]+content=["\']([^"\']+)["\']', summary_html, re.IGNORECASE)
-                        if og_match:
-                            image_url = og_match.group(1)
+                    image_url = summary.image_url
 
                 cleaned_article = ArticleCreate(
                     title=entry.get("title", "Untitled"),
@@ -102,11 +92,13 @@ class RSSIngestor(BaseIngestor):
                 )
                 # Attempt to fetch full content if available
                 try:
-                    response = requests.get(link, timeout=10)
-                    if response.ok:
-                        full_text = clean_html(response.text)
-                        if full_text:
-                            cleaned_article.content = full_text
+                    with requests.get(link, timeout=10, stream=True) as response:
+                        if response.ok:
+                            page = extract_content_stream(response.iter_content(65536), response.encoding)
+                            if len(page.text) > len(content_text):
+                                cleaned_article.content = page.text
+                            if not cleaned_article.image_url:
+                                cleaned_article.image_url = page.image_url
                 except Exception:
                     pass
                 collected.append(cleaned_article)
@@ -0,0 +1,169 @@
+import logging
+import random
+import signal
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings, get_settings
+from app.core.db import Base, SessionLocal, engine
+from app.models.ingestion_state import IngestionSourceState
+from app.services.ingestion.lock import IngestionLock, get_ingestion_lock
+
+logger = logging.getLogger(__name__)
+
+
+def source_intervals(settings: Optional[Settings] = None) -> Dict[str, int]:
+    """Seconds between scheduled runs per source; sources with 0 are not scheduled."""
+    settings = settings or get_settings()
+    intervals = {
+        "hacker_news": settings.ingestion_interval_hacker_news_seconds,
+        "rss": settings.ingestion_interval_rss_seconds,
+        "newsapi": settings.ingestion_interval_newsapi_seconds,
+    }
+    return {name: seconds for name, seconds in intervals.items() if seconds > 0}
+
+
+def source_status(session: Session, intervals: Dict[str, int]) -> List[Dict]:
+    states = {state.source: state for state in session.query(IngestionSourceState).all()}
+    status = []
+    for name in sorted(set(intervals) | set(states)):
+        state = states.get(name)
+        status.append(
+            {
+                "source": name,
+                "interval_seconds": intervals.get(name),
+                "last_started_at": state.last_started_at if state else None,
+                "last_success_at": state.last_success_at if state else None,
+                "last_error_at": state.last_error_at if state else None,
+                "last_error": state.last_error if state else None,
+                "consecutive_failures": state.consecutive_failures if state else 0,
+                "articles_last_run": state.articles_last_run if state else 0,
+                "next_run_at": state.next_run_at if state else None,
+            }
+        )
+    return status
+
+
+class IngestionScheduler:
+    """
+    Runs each source on its own interval, one source at a time.
+
+    The next run of a source is its last attempt plus its interval, scaled by a random
+    factor in ``[1 - jitter, 1 + jitter]`` so sources drift apart instead of firing
+    together. After a failure the delay is ``retry_base * 2**(failures - 1)``, capped at
+    the interval. State lives in ``ingestion_source_state``, so a restarted scheduler
+    picks up where it stopped and manual refreshes count as runs. ``after_run`` is called
+    once after each pass that ran sources, still under the lock.
+    """
+
+    def __init__(
+        self,
+        intervals: Dict[str, int],
+        runner: Callable[[Session, str], object],
+        after_run: Optional[Callable[[Session], object]] = None,
+        jitter: float = 0.1,
+        retry_base: float = 60.0,
+        lock: Optional[IngestionLock] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        clock: Callable[[], datetime] = datetime.utcnow,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.intervals = intervals
+        self.runner = runner
+        self.after_run = after_run
+        self.jitter = jitter
+        self.retry_base = retry_base
+        self.lock = lock or get_ingestion_lock()
+        self.session_factory = session_factory
+        self.clock = clock
+        self.rng = rng or random.Random()
+
+    def _next_run(self, state: IngestionSourceState) -> datetime:
+        attempts = [moment for moment in (state.last_success_at, state.last_error_at) if moment]
+        if not attempts:
+            return self.clock()
+        delay = float(self.intervals[state.source])
+        if state.consecutive_failures:
+            delay = min(delay, self.retry_base * 2 ** (state.consecutive_failures - 1))
+        delay *= 1 + self.rng.uniform(-self.jitter, self.jitter)
+        return max(attempts) + timedelta(seconds=delay)
+
+    def due_sources(self, session: Session) -> List[str]:
+        now = self.clock()
+        due = []
+        for name in self.intervals:
+            state = session.get(IngestionSourceState, name)
+            if state is None:
+                due.append(name)
+                continue
+            last_attempt = max((m for m in (state.last_success_at, state.last_error_at) if m), default=None)
+            # Fix the jittered time once per attempt so it is stable across polls
+            if state.next_run_at is None or (last_attempt and state.next_run_at <= last_attempt):
+                state.next_run_at = self._next_run(state)
+                session.commit()
+            if state.next_run_at <= now:
+                due.append(name)
+        return due
+
+    def run_pending(self) -> List[str]:
+        """Run every due source while holding the ingestion lock; returns the sources run."""
+        session = self.session_factory()
+        try:
+            due = self.due_sources(session)
+            if not due:
+                return []
+            if not self.lock.acquire(blocking=False):
+                logger.info("Another ingestion run holds the lock; postponing %s", ", ".join(due))
+                return []
+            try:
+                for name in due:
+                    self.runner(session, name)
+                    # Schedule from the fresh outcome of this run
+                    state = session.get(IngestionSourceState, name)
+                    if state is not None:
+                        state.next_run_at = self._next_run(state)
+                        session.commit()
+                        logger.info("Next %s run at %s", name, state.next_run_at.isoformat(timespec="seconds"))
+                if self.after_run is not None:
+                    self.after_run(session)
+            finally:
+                self.lock.release()
+            return due
+        finally:
+            session.close()
+
+    def run_forever(self, stop: threading.Event, poll_seconds: float = 5.0) -> None:
+        logger.info("Ingestion scheduler started for %s", ", ".join(f"{k}={v}s" for k, v in self.intervals.items()))
+        while not stop.is_set():
+            try:
+                self.run_pending()
+            except Exception:
+                logger.exception("Scheduler iteration failed")
+            stop.wait(poll_seconds)
+        logger.info("Ingestion scheduler stopped")
+
+
+def main() -> None:
+    from app.services.embeddings import get_embedding_provider
+    from app.services.ingestion.pipeline import after_ingestion, ingest_source
+    from app.services.vector_store import get_vector_store
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    settings = get_settings()
+    Base.metadata.create_all(bind=engine)
+    embedder = get_embedding_provider(settings)
+    vector_store = get_vector_store(embedding_model=embedder.model_name if embedder else None)
+    scheduler = IngestionScheduler(
+        source_intervals(settings),
+        runner=lambda session, name: ingest_source(session, name, vector_store, embedder),
+        after_run=lambda session: after_ingestion(session, embedder),
+        jitter=settings.ingestion_jitter_fraction,
+        retry_base=settings.ingestion_retry_base_seconds,
+    )
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    scheduler.run_forever(stop)
@@ -1,28 +1,34 @@
-from typing import Generator, List
+from typing import Generator, List, Optional
 
-from openai import OpenAI
+from app.services.embeddings import EmbeddingProvider, OpenAIEmbeddingProvider
+from app.services.openai_gateway import OpenAIGateway, get_openai_gateway
 
 
 class LLMClient:
-    def __init__(self, api_key: str, embedding_model: str = "text-embedding-3-small", llm_model: str = "gpt-4o-mini") -> None:
+    def __init__(
+        self,
+        api_key: str,
+        embedding_model: str = "text-embedding-3-small",
+        llm_model: str = "gpt-4o-mini",
+        embedding_provider: Optional[EmbeddingProvider] = None,
+        gateway: Optional[OpenAIGateway] = None,
+    ) -> None:
         self.api_key = api_key
-        self.embedding_model = embedding_model
         self.llm_model = llm_model
-        self.client = OpenAI(api_key=api_key)
+        self.gateway = gateway or get_openai_gateway(api_key)
+        self.embedding_provider = embedding_provider or OpenAIEmbeddingProvider(self.gateway, embedding_model)
+        self.embedding_model = self.embedding_provider.model_name
 
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        if not texts:
-            return []
-        response = self.client.embeddings.create(model=self.embedding_model, input=texts)
-        return [item.embedding for item in response.data]
+        return self.embedding_provider.embed_texts(texts)
 
     def generate_response(self, system_prompt: str, user_prompt: str) -> str:
-        response = self.client.chat.completions.create(
-            model=self.llm_model,
-            messages=[
+        response = self.gateway.create_chat_completion(
+            [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
+            model=self.llm_model,
             temperature=0.2,
         )
         if response.choices and len(response.choices) > 0:
@@ -31,14 +37,13 @@ class LLMClient:
 
     def generate_response_stream(self, system_prompt: str, user_prompt: str) -> Generator[str, None, None]:
         """Generator that yields tokens as they're generated for streaming"""
-        stream = self.client.chat.completions.create(
-            model=self.llm_model,
-            messages=[
+        stream = self.gateway.stream_chat_completion(
+            [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
+            model=self.llm_model,
             temperature=0.2,
-            stream=True,
         )
         for chunk in stream:
             if chunk.choices and len(chunk.choices) > 0:
@@ -0,0 +1,238 @@
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+import httpx
+from openai import APIConnectionError, APIStatusError, APITimeoutError, OpenAI, RateLimitError
+
+from app.core.config import Settings, get_settings
+from app.core.metrics import LLM_REQUESTS, LLM_TOKENS
+from app.services.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Rough chars-per-token ratio used to charge the tokens-per-minute bucket before a call
+CHARS_PER_TOKEN = 4
+# Completion tokens reserved for a chat call whose output length is not known up front
+DEFAULT_COMPLETION_TOKENS = 512
+
+
+def estimate_tokens(texts: List[str]) -> int:
+    return sum(len(text) // CHARS_PER_TOKEN + 1 for text in texts)
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, (RateLimitError, APITimeoutError, APIConnectionError)):
+        return True
+    if isinstance(exc, APIStatusError):
+        return exc.status_code in (408, 409) or exc.status_code >= 500
+    return False
+
+
+def _retry_after_seconds(exc: Exception) -> Optional[float]:
+    """Read the server's requested delay from ``retry-after-ms`` or ``retry-after`` (seconds or HTTP date)."""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        # Malformed header: fall back to the computed backoff
+        return None
+    if parsed is None:
+        return None
+    return max(0.0, parsed.timestamp() - time.time())
+
+
+class OpenAIGateway:
+    """
+    OpenAI client wrapper with retries, rate limiting and a pooled HTTP client.
+
+    Every attempt first takes a request (and estimated token) allowance from the shared
+    ``RateLimiter`` and holds a concurrency slot only while the request is in flight, not
+    during backoff. Transient failures (429, 5xx, timeouts, connection errors) are retried
+    with exponential backoff and jitter; a server-provided ``Retry-After`` takes precedence
+    over the computed backoff.
+    """
+
+    def __init__(
+        self,
+        client: OpenAI,
+        limiter: RateLimiter,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.client = client
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+
+    def _backoff(self, attempt: int, exc: Exception) -> float:
+        retry_after = _retry_after_seconds(exc)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        delay = min(self.backoff_max, self.backoff_base * (2**attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _call(self, operation: str, fn: Callable[[], T], tokens: int) -> T:
+        attempt = 0
+        while True:
+            self.limiter.acquire(tokens)
+            try:
+                with self.limiter.concurrency_slot():
+                    result = fn()
+                LLM_REQUESTS.inc(operation=operation, outcome="ok")
+                return result
+            except Exception as exc:
+                if not _is_retryable(exc) or attempt >= self.max_retries:
+                    LLM_REQUESTS.inc(operation=operation, outcome="error")
+                    raise
+                LLM_REQUESTS.inc(operation=operation, outcome="retry")
+                delay = self._backoff(attempt, exc)
+                attempt += 1
+                logger.warning(
+                    "OpenAI %s failed (%s), retrying in %.2fs (attempt %s/%s)",
+                    operation,
+                    exc.__class__.__name__,
+                    delay,
+                    attempt,
+                    self.max_retries,
+                )
+                self._sleep(delay)
+
+    def create_embeddings(self, model: str, texts: List[str]) -> Any:
+        tokens = estimate_tokens(texts)
+        response = self._call(
+            "embeddings",
+            lambda: self.client.embeddings.create(model=model, input=texts),
+            tokens,
+        )
+        usage = getattr(response, "usage", None)
+        LLM_TOKENS.inc(getattr(usage, "total_tokens", None) or tokens, model=model, kind="embedding")
+        return response
+
+    def create_chat_completion(self, messages: List[Dict[str, str]], **kwargs: Any) -> Any:
+        prompt_tokens = estimate_tokens([message["content"] for message in messages])
+        response = self._call(
+            "chat_completion",
+            lambda: self.client.chat.completions.create(messages=messages, **kwargs),
+            prompt_tokens + DEFAULT_COMPLETION_TOKENS,
+        )
+        model = kwargs.get("model", "")
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            LLM_TOKENS.inc(usage.prompt_tokens, model=model, kind="prompt")
+            LLM_TOKENS.inc(usage.completion_tokens, model=model, kind="completion")
+        else:
+            LLM_TOKENS.inc(prompt_tokens, model=model, kind="prompt")
+        return response
+
+    def stream_chat_completion(self, messages: List[Dict[str, str]], **kwargs: Any) -> Iterator[Any]:
+        """
+        Yield streamed chat chunks. Only opening the stream is retried; once tokens have been
+        delivered a failure propagates, since replaying would duplicate output.
+        The concurrency slot is released once the stream is open, so long generations do not
+        keep other calls waiting; the token allowance is still charged up front.
+        """
+        prompt_tokens = estimate_tokens([message["content"] for message in messages])
+        model = kwargs.get("model", "")
+        stream = self._call(
+            "chat_stream",
+            lambda: self.client.chat.completions.create(messages=messages, stream=True, **kwargs),
+            prompt_tokens + DEFAULT_COMPLETION_TOKENS,
+        )
+        # Streamed responses carry no usage block; count the prompt estimate and one token per chunk
+        completion_tokens = 0
+        try:
+            for chunk in stream:
+                completion_tokens += 1
+                yield chunk
+        finally:
+            LLM_TOKENS.inc(prompt_tokens, model=model, kind="prompt")
+            LLM_TOKENS.inc(completion_tokens, model=model, kind="completion")
+            response = getattr(stream, "response", None)
+            if response is not None:
+                response.close()
+
+
+def build_openai_client(settings: Settings, api_key: Optional[str] = None) -> OpenAI:
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+        ),
+        timeout=httpx.Timeout(settings.openai_timeout_seconds, connect=settings.openai_connect_timeout_seconds),
+    )
+    return OpenAI(
+        api_key=api_key if api_key is not None else settings.openai_api_key,
+        base_url=settings.openai_base_url or None,
+        timeout=httpx.Timeout(settings.openai_timeout_seconds, connect=settings.openai_connect_timeout_seconds),
+        # Retries are handled by OpenAIGateway so they respect the shared rate limiter
+        max_retries=0,
+        http_client=http_client,
+    )
+
+
+_gateway_lock = threading.Lock()
+_gateways: Dict[str, OpenAIGateway] = {}
+_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter(settings: Optional[Settings] = None) -> RateLimiter:
+    """
+    Limiter shared by everything in this process, and through ``OPENAI_RATE_LIMIT_DIR`` with
+    the other processes on the same data directory (the API, the scheduler and ``ingest.py``).
+    """
+    global _limiter
+    settings = settings or get_settings()
+    with _gateway_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(
+                requests_per_minute=settings.openai_requests_per_minute,
+                tokens_per_minute=settings.openai_tokens_per_minute,
+                max_concurrency=settings.openai_max_concurrency,
+                shared_dir=settings.openai_rate_limit_dir or None,
+            )
+        return _limiter
+
+
+def get_openai_gateway(api_key: Optional[str] = None, settings: Optional[Settings] = None) -> OpenAIGateway:
+    """Return the pooled gateway for ``api_key``, creating it on first use."""
+    settings = settings or get_settings()
+    key = api_key if api_key is not None else settings.openai_api_key
+    limiter = get_rate_limiter(settings)
+    with _gateway_lock:
+        gateway = _gateways.get(key)
+        if gateway is None:
+            gateway = OpenAIGateway(
+                build_openai_client(settings, api_key=key),
+                limiter,
+                max_retries=settings.openai_max_retries,
+                backoff_base=settings.openai_backoff_base_seconds,
+                backoff_max=settings.openai_backoff_max_seconds,
+            )
+            _gateways[key] = gateway
+        return gateway
@@ -0,0 +1,316 @@
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.config import get_settings
+from app.services.vector_store import ArticleChunks, EmbeddingModelMismatchError, timestamp
+
+logger = logging.getLogger(__name__)
+
+CHUNKS_TABLE = "article_chunks"
+META_TABLE = "vector_store_meta"
+
+
+def _vector_literal(embedding: List[float]) -> str:
+    return "[" + ",".join(repr(float(value)) for value in embedding) + "]"
+
+
+class PgVectorStore:
+    """
+    ``VectorStore`` on PostgreSQL with the pgvector extension.
+
+    Chunks live in ``article_chunks`` next to the articles, so every API replica sees the
+    same index. Like the Chroma store, rows keep only the filterable fields; article
+    details come from ``articles``. The vector column is sized from the first batch of embeddings and indexed
+    with HNSW (cosine distance). Vectors are sent as text literals, so only a Postgres
+    driver is needed, not the pgvector Python package.
+
+    The extension, ``vector_store_meta`` and the table are created by the first write; opening
+    the store only reads, so read-only replicas need no write or DDL privileges. A store opened
+    before the first write looks the dimensions up again on each call until the table exists.
+
+    A ``table`` other than ``article_chunks`` is a rebuild in progress: its settings are kept
+    under ``<table>:``-prefixed keys in ``vector_store_meta`` until ``activate`` renames it
+    into place.
+    """
+
+    def __init__(
+        self, embedding_model: Optional[str] = None, engine: Optional[Engine] = None, table: str = CHUNKS_TABLE
+    ) -> None:
+        settings = get_settings()
+        self.embedding_model = embedding_model or settings.embedding_model
+        if engine is None:
+            from app.core.db import build_engine, engine as default_engine
+
+            url = settings.vector_database_url
+            engine = build_engine(url) if url and url != settings.database_url else default_engine
+        self.engine = engine
+        self.table = table
+        self.dimensions: Optional[int] = None
+        self._check_model()
+
+    def _key(self, name: str) -> str:
+        return name if self.table == CHUNKS_TABLE else f"{self.table}:{name}"
+
+    def _read_meta(self, connection, name: str) -> Optional[str]:
+        """A ``vector_store_meta`` value, or None if it is unset or nothing has been written yet."""
+        if connection.execute(text(f"SELECT to_regclass('{META_TABLE}')")).scalar() is None:
+            return None
+        return connection.execute(
+            text(f"SELECT value FROM {META_TABLE} WHERE key = :key"), {"key": self._key(name)}
+        ).scalar()
+
+    def _read_dimensions(self, connection) -> None:
+        dimensions = self._read_meta(connection, "dimensions")
+        self.dimensions = int(dimensions) if dimensions else None
+
+    def _ready(self) -> bool:
+        """Whether the chunk table exists, checking again while it did not (it may have been created since)."""
+        if self.dimensions is None:
+            with self.engine.connect() as connection:
+                self._read_dimensions(connection)
+        return self.dimensions is not None
+
+    def _verify_model(self, stored: Optional[str]) -> None:
+        if stored is not None and stored != self.embedding_model:
+            raise EmbeddingModelMismatchError(
+                f"Table '{self.table}' holds '{stored}' embeddings but the configured model is "
+                f"'{self.embedding_model}'. Rebuild it with reindex.py."
+            )
+
+    def _check_model(self) -> None:
+        """Refuse a table of another embedding model; read-only, an unset model is claimed by the first write."""
+        with self.engine.connect() as connection:
+            self._verify_model(self._read_meta(connection, "embedding_model"))
+            self._read_dimensions(connection)
+
+    def _write_meta(self, connection) -> None:
+        """Create ``vector_store_meta`` if needed and claim this table for the model, unless it already is."""
+        connection.execute(text(f"CREATE TABLE IF NOT EXISTS {META_TABLE} (key TEXT PRIMARY KEY, value TEXT NOT NULL)"))
+        connection.execute(
+            text(f"INSERT INTO {META_TABLE} (key, value) VALUES (:key, :model) ON CONFLICT (key) DO NOTHING"),
+            {"key": self._key("embedding_model"), "model": self.embedding_model},
+        )
+        # Another process may have claimed it for a different model since this store was opened
+        self._verify_model(self._read_meta(connection, "embedding_model"))
+
+    def _create_table(self, dimensions: int) -> None:
+        with self.engine.begin() as connection:
+            self._write_meta(connection)
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+            connection.execute(
+                text(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS {self.table} (
+                        id TEXT PRIMARY KEY,
+                        article_id INTEGER NOT NULL,
+                        chunk_index INTEGER NOT NULL,
+                        category VARCHAR(64),
+                        published_ts BIGINT,
+                        chunk_start INTEGER NOT NULL,
+                        chunk_end INTEGER NOT NULL,
+                        embedding vector({int(dimensions)}) NOT NULL
+                    )
+                    """
+                )
+            )
+            connection.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{self.table}_article ON {self.table} (article_id)"))
+            connection.execute(
+                text(f"CREATE INDEX IF NOT EXISTS ix_{self.table}_filters ON {self.table} (category, published_ts)")
+            )
+            connection.execute(
+                text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{self.table}_embedding ON {self.table} "
+                    "USING hnsw (embedding vector_cosine_ops)"
+                )
+            )
+            connection.execute(
+                text(f"INSERT INTO {META_TABLE} (key, value) VALUES (:key, :dims) ON CONFLICT (key) DO NOTHING"),
+                {"key": self._key("dimensions"), "dims": str(dimensions)},
+            )
+        self.dimensions = dimensions
+
+    def add_chunks(
+        self,
+        article_id: int,
+        spans: List[Tuple[int, int]],
+        embeddings: List[List[float]],
+        metadata: Dict[str, Any],
+    ) -> None:
+        if not spans:
+            return
+        self._insert([(article_id, spans, embeddings, metadata)], replace=True)
+
+    def add_articles(self, articles: List[ArticleChunks]) -> None:
+        """Index several articles' chunks in one transaction, without removing chunks they had before."""
+        articles = [item for item in articles if item[1]]
+        if articles:
+            self._insert(articles, replace=False)
+
+    def _insert(self, articles: List[ArticleChunks], replace: bool) -> None:
+        if not self._ready():
+            self._create_table(len(articles[0][2][0]))
+        rows = []
+        for article_id, spans, embeddings, metadata in articles:
+            published_ts = timestamp(metadata["published_at"])
+            rows.extend(
+                {
+                    "id": f"article-{article_id}-chunk-{idx}",
+                    "article_id": article_id,
+                    "chunk_index": idx,
+                    "category": metadata["category"],
+                    "published_ts": published_ts,
+                    "chunk_start": span[0],
+                    "chunk_end": span[1],
+                    "embedding": _vector_literal(embedding),
+                }
+                for idx, (span, embedding) in enumerate(zip(spans, embeddings))
+            )
+        with self.engine.begin() as connection:
+            if replace:
+                connection.execute(
+                    text(f"DELETE FROM {self.table} WHERE article_id = ANY(:article_ids)"),
+                    {"article_ids": [item[0] for item in articles]},
+                )
+            connection.execute(
+                text(
+                    f"INSERT INTO {self.table} (id, article_id, chunk_index, category, published_ts, chunk_start, "
+                    "chunk_end, embedding) VALUES (:id, :article_id, :chunk_index, :category, :published_ts, "
+                    ":chunk_start, :chunk_end, CAST(:embedding AS vector)) ON CONFLICT (id) DO UPDATE SET "
+                    "category = EXCLUDED.category, published_ts = EXCLUDED.published_ts, "
+                    "chunk_start = EXCLUDED.chunk_start, chunk_end = EXCLUDED.chunk_end, embedding = EXCLUDED.embedding"
+                ),
+                rows,
+            )
+
+    def has_article(self, article_id: int) -> bool:
+        if not self._ready():
+            return False
+        with self.engine.connect() as connection:
+            return connection.execute(
+                text(f"SELECT 1 FROM {self.table} WHERE article_id = :article_id LIMIT 1"), {"article_id": article_id}
+            ).first() is not None
+
+    def article_embeddings(self, article_ids: List[int]) -> Dict[int, List[List[float]]]:
+        """Stored chunk embeddings of the given articles, keyed by article id."""
+        found: Dict[int, List[List[float]]] = {}
+        if not article_ids or not self._ready():
+            return found
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                text(f"SELECT article_id, embedding::text AS embedding FROM {self.table} WHERE article_id = ANY(:article_ids)"),
+                {"article_ids": list(article_ids)},
+            )
+            for row in rows:
+                found.setdefault(row.article_id, []).append(json.loads(row.embedding))
+        return found
+
+    def delete_article(self, article_id: int) -> None:
+        if not self._ready():
+            return
+        with self.engine.begin() as connection:
+            connection.execute(text(f"DELETE FROM {self.table} WHERE article_id = :article_id"), {"article_id": article_id})
+
+    def activate(self, promote: Optional[Callable[[], None]] = None) -> None:
+        """
+        Replace ``article_chunks`` with this table in one transaction. Queries running against
+        the old table finish first; later ones read the new rows. ``promote`` runs just before
+        the swap to move data staged for this table into place.
+        """
+        if promote is not None:
+            promote()
+        if self.table == CHUNKS_TABLE:
+            return
+        prefix = f"{self.table}:"
+        with self.engine.begin() as connection:
+            self._write_meta(connection)
+            connection.execute(text(f"DROP TABLE IF EXISTS {CHUNKS_TABLE}"))
+            # Without any chunks the table was never created; the index is simply emptied
+            if self.dimensions is not None:
+                connection.execute(text(f"ALTER TABLE {self.table} RENAME TO {CHUNKS_TABLE}"))
+                for suffix in ("article", "filters", "embedding"):
+                    connection.execute(
+                        text(f"ALTER INDEX ix_{self.table}_{suffix} RENAME TO ix_{CHUNKS_TABLE}_{suffix}")
+                    )
+            connection.execute(text(f"DELETE FROM {META_TABLE} WHERE key IN ('embedding_model', 'dimensions')"))
+            connection.execute(
+                text(f"UPDATE {META_TABLE} SET key = substr(key, :offset) WHERE key LIKE :pattern"),
+                {"offset": len(prefix) + 1, "pattern": prefix.replace("_", r"\_") + "%"},
+            )
+        self.table = CHUNKS_TABLE
+
+    def drop_inactive(self) -> None:
+        """Drop rebuild tables other than this one, with their ``vector_store_meta`` entries."""
+        with self.engine.begin() as connection:
+            self._write_meta(connection)
+            tables = connection.execute(
+                text(
+                    "SELECT table_name FROM information_schema.tables "
+                    "WHERE table_schema = current_schema() AND table_name LIKE :pattern"
+                ),
+                {"pattern": CHUNKS_TABLE.replace("_", r"\_") + r"\_%"},
+            ).scalars().all()
+            for table in tables:
+                if table == self.table:
+                    continue
+                logger.info("Dropping inactive table '%s'", table)
+                connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+                connection.execute(
+                    text(f"DELETE FROM {META_TABLE} WHERE key LIKE :pattern"),
+                    {"pattern": f"{table}:".replace("_", r"\_") + "%"},
+                )
+
+    def similarity_search(
+        self,
+        embedding: List[float],
+        top_k: int = 8,
+        category: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        with_embeddings: bool = False,
+    ) -> List[Dict[str, Any]]:
+        return self.similarity_search_batch([embedding], top_k, category, date_from, date_to, with_embeddings)[0]
+
+    def similarity_search_batch(
+        self,
+        embeddings: List[List[float]],
+        top_k: int = 8,
+        category: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        with_embeddings: bool = False,
+    ) -> List[List[Dict[str, Any]]]:
+        """Nearest chunks of each embedding. pgvector takes one query vector per statement; they share a connection."""
+        if not self._ready():
+            return [[] for _ in embeddings]
+        conditions = []
+        params: Dict[str, Any] = {"top_k": top_k}
+        if category:
+            conditions.append("category = :category")
+            params["category"] = category
+        if date_from:
+            conditions.append("published_ts >= :date_from")
+            params["date_from"] = timestamp(date_from)
+        if date_to:
+            conditions.append("published_ts <= :date_to")
+            params["date_to"] = timestamp(date_to)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        embedding_column = ", embedding::text AS embedding" if with_embeddings else ""
+        query = text(
+            f"SELECT article_id, chunk_index, category, published_ts, chunk_start AS start, chunk_end AS \"end\", "
+            f"embedding <=> CAST(:embedding AS vector) AS score{embedding_column} FROM {self.table} {where} "
+            "ORDER BY embedding <=> CAST(:embedding AS vector) LIMIT :top_k"
+        )
+        results = []
+        with self.engine.connect() as connection:
+            for embedding in embeddings:
+                rows = connection.execute(query, {**params, "embedding": _vector_literal(embedding)}).mappings()
+                results.append([dict(row) for row in rows])
+        if with_embeddings:
+            for record in (record for records in results for record in records):
+                record["embedding"] = json.loads(record["embedding"])
+        return results
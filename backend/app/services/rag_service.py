@@ -1,11 +1,20 @@
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import TYPE_CHECKING, Dict, Generator, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generator, Iterator, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
+from app.core.db import ReadSessionLocal
+from app.core.metrics import CACHE_REQUESTS, RAG_QUESTIONS, RAG_STAGE_SECONDS
 from app.models.article import Article
+from app.models.news_digest import NewsDigest
 from app.schemas.query import QueryArticle
+from app.services.category_router import CategoryRouter
+from app.services.coalescing import SingleFlight, StreamFanout, question_key
+from app.services.conversations import Conversation, ConversationStore, Filters, referenced_articles, unit
+from app.services.digests import find_digest
 from app.services.llm_client import LLMClient
 
 logger = logging.getLogger(__name__)
@@ -27,45 +36,207 @@ SYSTEM_PROMPT = (
 
 
 class RAGService:
-    def __init__(self, llm_client: LLMClient, vector_store: "VectorStore") -> None:
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        vector_store: "VectorStore",
+        coalesce: bool = True,
+        digests: bool = True,
+        category_router: Optional[CategoryRouter] = None,
+        conversations: Optional[ConversationStore] = None,
+        conversation_reuse_similarity: float = 0.75,
+        conversation_extend_similarity: float = 0.35,
+        session_factory: Callable[[], Session] = ReadSessionLocal,
+    ) -> None:
         self.llm_client = llm_client
         self.vector_store = vector_store
+        # Streamed questions without a category filter are routed to one by their embedding
+        self.category_router = category_router
+        # Identical questions arriving while one is being answered share its upstream work
+        self.coalesce = coalesce
+        # A shared stream is produced on its own thread with its own session, never the leader request's
+        self.session_factory = session_factory
+        # Generic questions ("latest tech news") are answered from the digests written at ingestion
+        self.digests = digests
+        # Questions sent with a conversation id can be answered from the previous answer's chunks
+        self.conversations = conversations
+        self.conversation_reuse_similarity = conversation_reuse_similarity
+        self.conversation_extend_similarity = conversation_extend_similarity
+        self._answer_flights: SingleFlight[Dict] = SingleFlight()
+        self._stream_flights: StreamFanout[Tuple[str, List[Dict], Dict[int, int]]] = StreamFanout()
+
+    def _detect_category(self, question_embedding: List[float], session: Session) -> Optional[str]:
+        """Category of the question from its embedding, if the router is confident enough."""
+        if self.category_router is None:
+            return None
+        with RAG_STAGE_SECONDS.time(stage="category_routing"):
+            return self.category_router.route(session, question_embedding)
+
+    def _find_digest(
+        self,
+        question: str,
+        session: Session,
+        category: Optional[str],
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+    ) -> Optional[NewsDigest]:
+        if not self.digests or date_from or date_to:
+            return None
+        with RAG_STAGE_SECONDS.time(stage="digest_lookup"):
+            return find_digest(session, question, category)
 
-    def _expand_query(self, question: str) -> str:
+    def _follow_up(
+        self, conversation_id: Optional[str], question: str, session: Session, filters: Filters, top_k: int
+    ) -> Tuple[Optional[Conversation], Optional[List[float]]]:
         """
-        Expand the query with related terms to improve semantic search.
-        This helps the embedding model find more relevant articles.
+        Context for a follow-up from the conversation's previous answer with the same filters:
+        its chunks when the question refers to one of its articles or is close to the previous
+        question, plus one search's new chunks when it is related, or None for full retrieval.
+        Also returns the question embedding if it was computed.
         """
-        question_lower = question.lower()
-        
-        # Technology-related expansions
-        if any(word in question_lower for word in ["technology", "tech", "tech trends", "tech news", "latest tech"]):
-            return f"{question} technology innovations software hardware AI artificial intelligence digital transformation tech industry"
-        
-        # Sports-related expansions
-        if any(word in question_lower for word in ["sports", "sport", "athlete", "game", "match"]):
-            return f"{question} sports news games matches athletes teams championships"
-        
-        # Business-related expansions
-        if any(word in question_lower for word in ["business", "economy", "market", "finance", "stock", "company"]):
-            return f"{question} business news economy market finance companies stocks"
-        
-        return question
+        if conversation_id is None or self.conversations is None:
+            return None, None
+        previous = self.conversations.get(conversation_id)
+        if previous is None or previous.filters != filters:
+            CACHE_REQUESTS.inc(cache="conversation", result="miss")
+            return None, None
+        referenced = referenced_articles(question, previous.records)
+        if referenced:
+            CACHE_REQUESTS.inc(cache="conversation", result="hit")
+            return previous.focused(referenced), None
+        with RAG_STAGE_SECONDS.time(stage="embed"):
+            question_embedding = self.llm_client.embed_texts([question])[0]
+        query = unit(question_embedding)
+        similarity = float(query @ previous.query)
+        if similarity >= self.conversation_reuse_similarity:
+            CACHE_REQUESTS.inc(cache="conversation", result="hit")
+            return previous.ranked(query, top_k), question_embedding
+        if similarity < self.conversation_extend_similarity:
+            CACHE_REQUESTS.inc(cache="conversation", result="miss")
+            return None, question_embedding
+        # Related: search near both questions and keep the closest of the held and new chunks
+        category, date_from, date_to = filters
+        with RAG_STAGE_SECONDS.time(stage="vector_search"):
+            found = self.vector_store.similarity_search(
+                unit(query + previous.query).tolist(),
+                top_k=top_k,
+                category=category,
+                date_from=date_from,
+                date_to=date_to,
+                with_embeddings=True,
+            )
+        held = previous.keys()
+        records, articles = self._attach_articles(
+            [record for record in found if (record["article_id"], record.get("chunk_index")) not in held], session
+        )
+        CACHE_REQUESTS.inc(cache="conversation", result="partial")
+        return previous.extended(records, articles, query, top_k), question_embedding
+
+    def _holds(self, conversation_id: Optional[str]) -> bool:
+        """Whether a context is held for the conversation, i.e. its next question is a real follow-up."""
+        return (
+            conversation_id is not None
+            and self.conversations is not None
+            and self.conversations.get(conversation_id) is not None
+        )
+
+    def _keep(self, conversation_id: Optional[str], context: Optional[Conversation]) -> None:
+        if conversation_id is not None and context is not None and self.conversations is not None:
+            self.conversations.put(conversation_id, context)
 
-    def _detect_category(self, question: str) -> Optional[str]:
+    def _context(
+        self,
+        filters: Filters,
+        question_embedding: List[float],
+        records: List[Dict],
+        articles: Dict[int, Any],
+    ) -> Optional[Conversation]:
+        """Freshly retrieved records, which carry their embeddings, as a conversation's context."""
+        if not records:
+            return None
+        return Conversation.from_records(filters, question_embedding, records, articles)
+
+    def _digest_articles(self, digest: NewsDigest, session: Session) -> List[Any]:
+        """The digest's articles that still exist, in citation order."""
+        rows = (
+            session.query(
+                Article.id, Article.title, Article.source, Article.url, Article.published_at, Article.category
+            )
+            .filter(Article.id.in_(digest.article_ids))
+            .all()
+        )
+        by_id = {row.id: row for row in rows}
+        return [by_id[article_id] for article_id in digest.article_ids if article_id in by_id]
+
+    def _digest_answer(self, digest: NewsDigest, session: Session) -> Dict:
+        return {
+            "answer": digest.summary,
+            "articles": [
+                QueryArticle(
+                    id=article.id,
+                    title=article.title,
+                    source=article.source,
+                    url=article.url,
+                    published_at=article.published_at,
+                    category=article.category,
+                )
+                for article in self._digest_articles(digest, session)
+            ],
+        }
+
+    def _attach_articles(self, records: List[Dict], session: Session) -> Tuple[List[Dict], Dict[int, Any]]:
         """
-        Detect category from question if not explicitly provided.
+        Chunks only carry ``article_id`` and their span in the article content; add each
+        record's text (``document``), title, source, url and published_at from one query
+        over the distinct articles. Records whose article no longer exists are dropped.
+        Returns the records and the article rows by id, in order of first appearance.
         """
-        question_lower = question.lower()
-        
-        if any(word in question_lower for word in ["technology", "tech", "software", "hardware", "AI", "artificial intelligence", "digital", "innovation"]):
-            return "technology"
-        elif any(word in question_lower for word in ["sports", "sport", "athlete", "game", "match", "football", "basketball"]):
-            return "sports"
-        elif any(word in question_lower for word in ["business", "economy", "market", "finance", "stock", "company", "corporate"]):
-            return "business"
-        
-        return None
+        return self._attach_articles_batch([records], session)[0]
+
+    def _attach_articles_batch(
+        self, record_lists: List[List[Dict]], session: Session
+    ) -> List[Tuple[List[Dict], Dict[int, Any]]]:
+        """``_attach_articles`` for several questions' records, with one query over all their articles."""
+        article_ids = list(dict.fromkeys(record["article_id"] for records in record_lists for record in records))
+        if not article_ids:
+            return [(records, {}) for records in record_lists]
+        with RAG_STAGE_SECONDS.time(stage="db_lookup"):
+            rows = (
+                session.query(
+                    Article.id,
+                    Article.title,
+                    Article.source,
+                    Article.url,
+                    Article.published_at,
+                    Article.category,
+                    Article.content,
+                )
+                .filter(Article.id.in_(article_ids))
+                .all()
+            )
+        by_id = {row.id: row for row in rows}
+        attached_lists = []
+        for records in record_lists:
+            articles = {}
+            attached = []
+            for record in records:
+                article = by_id.get(record["article_id"])
+                if article is None:
+                    continue
+                articles.setdefault(article.id, article)
+                if "start" in record:
+                    record["document"] = article.content[record["start"] : record["end"]]
+                record.update(
+                    title=article.title,
+                    source=article.source,
+                    url=article.url,
+                    published_at=article.published_at.isoformat() if article.published_at else None,
+                )
+                attached.append(record)
+            if len(attached) < len(records):
+                logger.warning(f"Dropped {len(records) - len(attached)} chunks of articles missing from the database")
+            attached_lists.append((attached, articles))
+        return attached_lists
 
     def _build_context(self, records: List[Dict]) -> str:
         """
@@ -77,7 +248,7 @@ class RAGService:
         
         for idx, record in enumerate(records, start=1):
             # Use document field which contains the full chunk text from vector store
-            excerpt = record.get("document") or record.get("snippet") or record.get("content") or ""
+            excerpt = record.get("document") or record.get("content") or ""
             
             # Skip records with empty excerpts
             if not excerpt or not excerpt.strip():
@@ -129,31 +300,91 @@ class RAGService:
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
         top_k: int = 8,
+        conversation_id: Optional[str] = None,
     ) -> Dict:
         """
-        Non-streaming RAG answer.
+        Non-streaming RAG answer. With a ``conversation_id`` the answer's context is kept for
+        the conversation's next question, and follow-ups may be answered from it. Identical
+        questions in flight together share one answer, except follow-ups of a conversation
+        whose context is held.
         Returns:
             {
                 "answer": str,
                 "articles": List[QueryArticle]
             }
         """
-        # 1. Embed the question
-        question_embedding = self.llm_client.embed_texts([question])[0]
-
-        # 2. Retrieve similar records from vector store
-        records = self.vector_store.similarity_search(
-            question_embedding,
-            top_k=top_k,
-            category=category,
-            date_from=date_from,
-            date_to=date_to,
+        digest = self._find_digest(question, session, category, date_from, date_to)
+        if digest is not None:
+            logger.info(f"Answered from the {digest.category} digest of {digest.day}: {question[:100]}")
+            RAG_QUESTIONS.inc(mode="answer", outcome="digest")
+            return self._digest_answer(digest, session)
+        if not self.coalesce or self._holds(conversation_id):
+            result, _ = self._answer_question(
+                question, session, category, date_from, date_to, top_k, conversation_id
+            )
+            return result
+        key = question_key(question, category, date_from, date_to, top_k)
+        (result, context), shared = self._answer_flights.do(
+            key,
+            lambda: self._answer_question(
+                question, session, category, date_from, date_to, top_k, keep_context=conversation_id is not None
+            ),
         )
+        CACHE_REQUESTS.inc(cache="coalesce_answer", result="hit" if shared else "miss")
+        if shared:
+            logger.info(f"Coalesced question onto in-flight answer: {question[:100]}")
+        # The shared answer's context, if it was retrieved with embeddings, starts this conversation
+        self._keep(conversation_id, context)
+        return result
+
+    def _answer_question(
+        self,
+        question: str,
+        session: Session,
+        category: Optional[str],
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+        top_k: int,
+        conversation_id: Optional[str] = None,
+        keep_context: bool = False,
+    ) -> Tuple[Dict, Optional[Conversation]]:
+        """
+        The answer and its context: kept for ``conversation_id``, and also returned (with
+        ``keep_context``) so a shared answer can start the conversations of all its callers.
+        """
+        started = time.perf_counter()
+        filters = (category, date_from, date_to)
+        keep = (conversation_id is not None or keep_context) and self.conversations is not None
+        follow_up, question_embedding = self._follow_up(conversation_id, question, session, filters, top_k)
+        if follow_up is not None:
+            records, articles = follow_up.records, follow_up.articles
+            kept: Optional[Conversation] = follow_up
+        else:
+            # 1. Embed the question
+            if question_embedding is None:
+                with RAG_STAGE_SECONDS.time(stage="embed"):
+                    question_embedding = self.llm_client.embed_texts([question])[0]
+
+            # 2. Retrieve similar records from vector store
+            search_options = {"with_embeddings": True} if keep else {}
+            with RAG_STAGE_SECONDS.time(stage="vector_search"):
+                records = self.vector_store.similarity_search(
+                    question_embedding,
+                    top_k=top_k,
+                    category=category,
+                    date_from=date_from,
+                    date_to=date_to,
+                    **search_options,
+                )
+            records, articles = self._attach_articles(records, session)
+            kept = self._context(filters, question_embedding, records, articles) if keep else None
+        self._keep(conversation_id, kept)
 
         logger.info(f"Retrieved {len(records)} records for question: {question[:100]}")
         if not records:
             logger.warning(f"No records found for question: {question}")
-            return {"answer": "No relevant articles found.", "articles": []}
+            RAG_QUESTIONS.inc(mode="answer", outcome="no_results")
+            return {"answer": "No relevant articles found.", "articles": []}, None
 
         # Log first record structure for debugging
         if records:
@@ -162,16 +393,15 @@ class RAGService:
             logger.debug(f"First record document length: {len(records[0].get('document', ''))}")
 
         # 3. Build context and user prompt
-        context = self._build_context(records)
-        user_prompt = self._build_user_prompt(context, question)
+        with RAG_STAGE_SECONDS.time(stage="context_build"):
+            context = self._build_context(records)
+            user_prompt = self._build_user_prompt(context, question)
 
         # 4. Get LLM answer
-        answer = self.llm_client.generate_response(SYSTEM_PROMPT, user_prompt)
-
-        # 5. Resolve article IDs and load full article metadata from DB
-        article_ids = {record["article_id"] for record in records}
-        articles = session.query(Article).filter(Article.id.in_(article_ids)).all()
+        with RAG_STAGE_SECONDS.time(stage="generation"):
+            answer = self.llm_client.generate_response(SYSTEM_PROMPT, user_prompt)
 
+        # 5. Article metadata was loaded with the records
         articles_payload = [
             QueryArticle(
                 id=article.id,
@@ -181,10 +411,12 @@ class RAGService:
                 published_at=article.published_at,
                 category=article.category,
             )
-            for article in articles
+            for article in articles.values()
         ]
 
-        return {"answer": answer, "articles": articles_payload}
+        RAG_QUESTIONS.inc(mode="answer", outcome="answered")
+        RAG_STAGE_SECONDS.observe(time.perf_counter() - started, stage="total")
+        return {"answer": answer, "articles": articles_payload}, kept
 
     def answer_question_stream(
         self,
@@ -195,6 +427,7 @@ class RAGService:
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
         top_k: int = 8,
+        conversation_id: Optional[str] = None,
     ) -> Generator[Tuple[str, List[Dict], Dict[int, int]], None, None]:
         """
         Streaming RAG answer.
@@ -205,55 +438,139 @@ class RAGService:
         - During streaming, articles_payload will be [] until the final yield.
         - article_number_to_id_mapping is always provided once records are found:
             { article_number (1-based): article_id (DB PK) }
+
+        Identical questions streamed concurrently share one upstream generation; later
+        subscribers replay the partial answers produced so far and then follow live. Generic
+        questions with a stored digest get it in a single yield. With a ``conversation_id``
+        the answer's context is kept for the conversation's next question, which may be
+        answered from it; such follow-ups are not coalesced.
         """
-        # 1. Detect category from question if not provided
-        detected_category = category or self._detect_category(question)
-        if detected_category and not category:
-            logger.info(f"Auto-detected category '{detected_category}' from streaming question: {question[:100]}")
-        
-        # 2. Expand query for better semantic search
-        expanded_query = self._expand_query(question)
-        logger.info(f"Original streaming query: {question[:100]}, Expanded: {expanded_query[:150]}")
-        
-        # 3. Embed the expanded question
-        question_embedding = self.llm_client.embed_texts([expanded_query])[0]
-
-        # 4. Retrieve similar records from vector store (increase top_k for better results)
-        search_top_k = max(top_k * 2, 16)  # Get more candidates
-        records = self.vector_store.similarity_search(
-            question_embedding,
-            top_k=search_top_k,
-            category=detected_category,
-            date_from=date_from,
-            date_to=date_to,
-        )
-        
-        # 5. If we have a detected category but got few results, try without category filter
-        if detected_category and len(records) < top_k:
-            logger.info(f"Got only {len(records)} results with category filter, trying without category")
-            records_no_filter = self.vector_store.similarity_search(
-                question_embedding,
-                top_k=search_top_k,
-                category=None,
-                date_from=date_from,
-                date_to=date_to,
+        digest = self._find_digest(question, session, category, date_from, date_to)
+        if digest is not None:
+            logger.info(f"Streamed the {digest.category} digest of {digest.day}: {question[:100]}")
+            RAG_QUESTIONS.inc(mode="stream", outcome="digest")
+            articles = self._digest_articles(digest, session)
+            # The summary cites articles by their number in the stored list; deleted ones are left unlinked
+            numbers = {article_id: number for number, article_id in enumerate(digest.article_ids, start=1)}
+            articles_payload: List[Dict] = [
+                {
+                    "id": article.id,
+                    "title": article.title,
+                    "source": article.source,
+                    "url": article.url,
+                    "published_at": article.published_at.isoformat() if article.published_at else None,
+                    "category": article.category,
+                }
+                for article in articles
+            ]
+            yield (digest.summary, articles_payload, {numbers[article.id]: article.id for article in articles})
+            return
+        if not self.coalesce or self._holds(conversation_id):
+            yield from self._answer_question_stream(
+                question, session, category, date_from, date_to, top_k, conversation_id
             )
-            # Merge and deduplicate by article_id, keeping best matches
-            seen_ids = {r["article_id"] for r in records}
-            for record in records_no_filter:
-                if record["article_id"] not in seen_ids:
-                    records.append(record)
-                    seen_ids.add(record["article_id"])
-                if len(records) >= search_top_k:
-                    break
-        
-        # 6. Take top_k results (they're already sorted by similarity)
-        records = records[:top_k]
+            return
+        key = question_key(question, category, date_from, date_to, top_k)
+
+        def produce() -> Generator[Tuple[str, List[Dict], Dict[int, int]], None, Optional[Conversation]]:
+            producer_session = self.session_factory()
+            try:
+                return (
+                    yield from self._answer_question_stream(
+                        question,
+                        producer_session,
+                        category,
+                        date_from,
+                        date_to,
+                        top_k,
+                        keep_context=conversation_id is not None,
+                    )
+                )
+            finally:
+                producer_session.close()
+
+        stream, shared = self._stream_flights.subscribe(key, produce)
+        CACHE_REQUESTS.inc(cache="coalesce_stream", result="hit" if shared else "miss")
+        if shared:
+            logger.info(f"Coalesced streaming question onto in-flight generation: {question[:100]}")
+        # The shared answer's context, if it was retrieved with embeddings, starts this conversation
+        self._keep(conversation_id, (yield from stream))
+
+    def _answer_question_stream(
+        self,
+        question: str,
+        session: Session,
+        category: Optional[str],
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+        top_k: int,
+        conversation_id: Optional[str] = None,
+        keep_context: bool = False,
+    ) -> Generator[Tuple[str, List[Dict], Dict[int, int]], None, Optional[Conversation]]:
+        """Streams the answer, keeping its context as ``_answer_question`` does and returning it."""
+        started = time.perf_counter()
+        filters = (category, date_from, date_to)
+        keep = (conversation_id is not None or keep_context) and self.conversations is not None
+        follow_up, question_embedding = self._follow_up(conversation_id, question, session, filters, top_k)
+        if follow_up is not None:
+            records, articles = follow_up.records, follow_up.articles
+            kept: Optional[Conversation] = follow_up
+        else:
+            # 1. Embed the question
+            if question_embedding is None:
+                with RAG_STAGE_SECONDS.time(stage="embed"):
+                    question_embedding = self.llm_client.embed_texts([question])[0]
+
+            # 2. Route the question to a category from its embedding if none was given
+            detected_category = category or self._detect_category(question_embedding, session)
+            if detected_category and not category:
+                logger.info(f"Routed streaming question to category '{detected_category}': {question[:100]}")
+
+            # 3. Retrieve similar records from vector store (increase top_k for better results)
+            search_top_k = max(top_k * 2, 16)  # Get more candidates
+            search_options = {"with_embeddings": True} if keep else {}
+            with RAG_STAGE_SECONDS.time(stage="vector_search"):
+                records = self.vector_store.similarity_search(
+                    question_embedding,
+                    top_k=search_top_k,
+                    category=detected_category,
+                    date_from=date_from,
+                    date_to=date_to,
+                    **search_options,
+                )
+            
+            # 4. If we have a detected category but got few results, try without category filter
+            if detected_category and len(records) < top_k:
+                logger.info(f"Got only {len(records)} results with category filter, trying without category")
+                with RAG_STAGE_SECONDS.time(stage="vector_search_fallback"):
+                    records_no_filter = self.vector_store.similarity_search(
+                        question_embedding,
+                        top_k=search_top_k,
+                        category=None,
+                        date_from=date_from,
+                        date_to=date_to,
+                        **search_options,
+                    )
+                # Merge and deduplicate by article_id, keeping best matches
+                seen_ids = {r["article_id"] for r in records}
+                for record in records_no_filter:
+                    if record["article_id"] not in seen_ids:
+                        records.append(record)
+                        seen_ids.add(record["article_id"])
+                    if len(records) >= search_top_k:
+                        break
+            
+            # 5. Take top_k results (they're already sorted by similarity)
+            records, articles = self._attach_articles(records, session)
+            records = records[:top_k]
+            kept = self._context(filters, question_embedding, records, articles) if keep else None
+        self._keep(conversation_id, kept)
 
         logger.info(f"Retrieved {len(records)} records for streaming question: {question[:100]}")
         if not records:
             logger.warning(f"No records found for streaming question: {question}")
             # No records: single yield with a message and empty metadata
+            RAG_QUESTIONS.inc(mode="stream", outcome="no_results")
             yield ("No relevant articles found.", [], {})
             return
 
@@ -263,20 +580,24 @@ class RAGService:
             article_number_to_id[idx] = record["article_id"]
 
         # 4. Build context and user prompt
-        context = self._build_context(records)
-        user_prompt = self._build_user_prompt(context, question)
+        with RAG_STAGE_SECONDS.time(stage="context_build"):
+            context = self._build_context(records)
+            user_prompt = self._build_user_prompt(context, question)
 
         # 5. Stream the answer tokens
         full_answer = ""
+        generation_started = time.perf_counter()
         for token in self.llm_client.generate_response_stream(SYSTEM_PROMPT, user_prompt):
+            if not full_answer:
+                # Measured from the start of the request, i.e. what the user waits for
+                RAG_STAGE_SECONDS.observe(time.perf_counter() - started, stage="time_to_first_token")
             full_answer += token
             # During streaming we don't yet have the DB articles payload, only mapping
             yield (full_answer, [], article_number_to_id)
+        RAG_STAGE_SECONDS.observe(time.perf_counter() - generation_started, stage="generation")
 
-        # 6. After streaming completes, fetch full article metadata from DB
-        article_ids = {record["article_id"] for record in records}
-        articles = session.query(Article).filter(Article.id.in_(article_ids)).all()
-
+        # 6. Article metadata for the cited records was loaded with them
+        cited_ids = set(article_number_to_id.values())
         articles_payload: List[Dict] = [
             {
                 "id": article.id,
@@ -286,8 +607,113 @@ class RAGService:
                 "published_at": article.published_at.isoformat() if article.published_at else None,
                 "category": article.category,
             }
-            for article in articles
+            for article in articles.values()
+            if article.id in cited_ids
         ]
 
         # 7. Final yield with complete answer, articles, and mapping
+        RAG_QUESTIONS.inc(mode="stream", outcome="answered")
+        RAG_STAGE_SECONDS.observe(time.perf_counter() - started, stage="total")
         yield (full_answer, articles_payload, article_number_to_id)
+        return kept
+
+    def _generate(self, user_prompt: str) -> str:
+        with RAG_STAGE_SECONDS.time(stage="generation"):
+            return self.llm_client.generate_response(SYSTEM_PROMPT, user_prompt)
+
+    def answer_batch(
+        self,
+        questions: List[str],
+        session: Session,
+        *,
+        category: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        top_k: int = 8,
+        concurrency: int = 4,
+    ) -> Iterator[Dict]:
+        """
+        Answer several questions with the same filters, sharing the retrieval work: one
+        embedding request, one batched vector search and one article query for all of them,
+        then up to ``concurrency`` generations at a time. Generic questions with a stored
+        digest are answered from it and identical questions only once.
+
+        Yields, as each question completes (not in input order):
+            {"index": int, "question": str, "answer": str, "articles": List[QueryArticle]}
+        or ``{"index": int, "question": str, "error": str}`` if its generation failed.
+        """
+        started = time.perf_counter()
+        # Input positions of each distinct question still to answer
+        positions: Dict[str, List[int]] = {}
+        for index, question in enumerate(questions):
+            digest = self._find_digest(question, session, category, date_from, date_to)
+            if digest is not None:
+                RAG_QUESTIONS.inc(mode="batch", outcome="digest")
+                yield {"index": index, "question": question, **self._digest_answer(digest, session)}
+            else:
+                positions.setdefault(question, []).append(index)
+        if not positions:
+            return
+        texts = list(positions)
+
+        # 1. Embed every question in one request
+        with RAG_STAGE_SECONDS.time(stage="embed"):
+            embeddings = self.llm_client.embed_texts(texts)
+
+        # 2. One batched vector search, then one query for the articles of all results
+        with RAG_STAGE_SECONDS.time(stage="vector_search"):
+            record_lists = self.vector_store.similarity_search_batch(
+                embeddings, top_k=top_k, category=category, date_from=date_from, date_to=date_to
+            )
+        retrieved = self._attach_articles_batch(record_lists, session)
+        logger.info(
+            f"Retrieved records for {len(texts)} batched questions "
+            f"({len(questions)} asked) from {len({a for _, articles in retrieved for a in articles})} articles"
+        )
+
+        # 3. Generate concurrently; results are yielded in order of completion
+        executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="batch")
+        try:
+            futures = {}
+            for question, (records, articles) in zip(texts, retrieved):
+                if not records:
+                    RAG_QUESTIONS.inc(len(positions[question]), mode="batch", outcome="no_results")
+                    for index in positions[question]:
+                        yield {
+                            "index": index,
+                            "question": question,
+                            "answer": "No relevant articles found.",
+                            "articles": [],
+                        }
+                    continue
+                with RAG_STAGE_SECONDS.time(stage="context_build"):
+                    user_prompt = self._build_user_prompt(self._build_context(records), question)
+                futures[executor.submit(self._generate, user_prompt)] = (question, articles)
+            for future in as_completed(futures):
+                question, articles = futures[future]
+                try:
+                    answer = future.result()
+                except Exception as exc:
+                    logger.exception(f"Generation failed for batched question: {question[:100]}")
+                    RAG_QUESTIONS.inc(len(positions[question]), mode="batch", outcome="error")
+                    for index in positions[question]:
+                        yield {"index": index, "question": question, "error": str(exc)}
+                    continue
+                articles_payload = [
+                    QueryArticle(
+                        id=article.id,
+                        title=article.title,
+                        source=article.source,
+                        url=article.url,
+                        published_at=article.published_at,
+                        category=article.category,
+                    )
+                    for article in articles.values()
+                ]
+                RAG_QUESTIONS.inc(len(positions[question]), mode="batch", outcome="answered")
+                for index in positions[question]:
+                    yield {"index": index, "question": question, "answer": answer, "articles": articles_payload}
+        finally:
+            # A client that disconnects stops the generations that have not started
+            executor.shutdown(wait=False, cancel_futures=True)
+        RAG_STAGE_SECONDS.observe(time.perf_counter() - started, stage="batch_total")
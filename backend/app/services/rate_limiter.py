@@ -0,0 +1,181 @@
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    ``capacity`` tokens are available up front and refill continuously at
+    ``refill_per_second``. A capacity of 0 disables the bucket.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float) -> None:
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+
+    def _take(self, amount: float) -> float:
+        """Take ``amount`` tokens and return 0 if they are available, else the seconds until they will be."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.refill_per_second
+
+    def acquire(self, amount: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Block until ``amount`` tokens are available. Returns False if ``timeout`` expires first."""
+        if self.capacity <= 0:
+            return True
+        # A single request larger than the bucket would otherwise wait forever
+        amount = min(amount, self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self._take(amount)
+            if not wait:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket whose level is kept in the file at ``path``, so every process using the file
+    draws from one budget. Each take locks the file with ``flock``; refills are timed with the
+    wall clock, which unlike the monotonic clock is the same in every process.
+    """
+
+    def __init__(self, path: Path, capacity: float, refill_per_second: float) -> None:
+        super().__init__(capacity, refill_per_second)
+        self.path = path
+
+    def _take(self, amount: float) -> float:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            now = time.time()
+            try:
+                state = json.loads(os.pread(fd, 256, 0))
+                tokens = min(self.capacity, state["tokens"] + max(0.0, now - state["updated"]) * self.refill_per_second)
+            except (ValueError, TypeError, KeyError):
+                tokens = self.capacity  # a new or unreadable file starts full
+            wait = 0.0
+            if tokens >= amount:
+                tokens -= amount
+            else:
+                wait = (amount - tokens) / self.refill_per_second
+            os.ftruncate(fd, 0)
+            os.pwrite(fd, json.dumps({"tokens": tokens, "updated": now}).encode("ascii"), 0)
+            return wait
+        finally:
+            os.close(fd)  # releases the flock
+
+
+class SharedSemaphore:
+    """
+    ``size`` slots shared by every process using ``directory``, each held as an ``flock`` on its
+    own file. A caller takes the first free slot; when all are busy it waits for a random one.
+    """
+
+    def __init__(self, directory: Path, size: int) -> None:
+        self.paths = [directory / f"slot-{index}.lock" for index in range(size)]
+
+    def acquire(self) -> int:
+        """Hold a slot; returns the descriptor to pass to ``release``."""
+        offset = random.randrange(len(self.paths))
+        for path in self.paths[offset:] + self.paths[:offset]:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except BlockingIOError:
+                os.close(fd)
+        fd = os.open(self.paths[offset], os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        except BaseException:
+            os.close(fd)
+            raise
+        return fd
+
+    def release(self, fd: int) -> None:
+        os.close(fd)
+
+
+class RateLimiter:
+    """
+    Combined requests-per-minute, tokens-per-minute and concurrency limits.
+
+    One instance is shared by everything in a process that talks to the same upstream
+    API. With ``shared_dir`` the budgets and slots live in files there, so processes using
+    the same directory (the API, the scheduler and ``ingest.py`` on one data volume) share one
+    budget; without it, or where ``fcntl`` is unavailable, the limits are per process.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int,
+        shared_dir: Optional[str] = None,
+    ) -> None:
+        directory = Path(shared_dir) if shared_dir and fcntl is not None else None
+        self._slots: Optional[SharedSemaphore] = None
+        self._concurrency: Optional[threading.BoundedSemaphore] = None
+        if directory is None:
+            self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+            self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+            if max_concurrency > 0:
+                self._concurrency = threading.BoundedSemaphore(max_concurrency)
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        self.requests = SharedTokenBucket(directory / "requests.json", requests_per_minute, requests_per_minute / 60.0)
+        self.tokens = SharedTokenBucket(directory / "tokens.json", tokens_per_minute, tokens_per_minute / 60.0)
+        if max_concurrency > 0:
+            self._slots = SharedSemaphore(directory, max_concurrency)
+
+    def acquire(self, tokens: int = 0) -> None:
+        self.requests.acquire(1)
+        if tokens:
+            self.tokens.acquire(tokens)
+
+    @contextmanager
+    def concurrency_slot(self) -> Iterator[None]:
+        if self._slots is not None:
+            fd = self._slots.acquire()
+            try:
+                yield
+            finally:
+                self._slots.release(fd)
+            return
+        if self._concurrency is None:
+            yield
+            return
+        self._concurrency.acquire()
+        try:
+            yield
+        finally:
+            self._concurrency.release()
@@ -0,0 +1,193 @@
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.article import Article
+from app.models.article_vector import ArticleVector, StagedArticleVector
+
+logger = logging.getLogger(__name__)
+
+# Rows converted to float32 at a time while scoring, bounding the temporary copy
+SCORE_BLOCK_ROWS = 4096
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    """Published dates are stored as naive UTC; aware filters are converted before dropping the offset."""
+    return moment.astimezone(timezone.utc).replace(tzinfo=None) if moment.tzinfo else moment
+
+
+def centroid(embeddings: Sequence[Sequence[float]]) -> bytes:
+    """Unit-length mean of the unit-normalised chunk embeddings, as float16 bytes."""
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    matrix /= np.clip(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12, None)
+    mean = matrix.mean(axis=0)
+    mean /= max(float(np.linalg.norm(mean)), 1e-12)
+    return mean.astype(np.float16).tobytes()
+
+
+def store_article_vector(session: Session, article_id: int, model: str, embeddings: Sequence[Sequence[float]]) -> bytes:
+    """Insert or replace the article's centroid and return it. The caller commits."""
+    vector = centroid(embeddings)
+    session.merge(ArticleVector(article_id=article_id, model=model, vector=vector, updated_at=datetime.utcnow()))
+    return vector
+
+
+def delete_article_vector(session: Session, article_id: int) -> None:
+    session.query(ArticleVector).filter(ArticleVector.article_id == article_id).delete(synchronize_session=False)
+
+
+def stage_article_vector(
+    session: Session, index_name: str, article_id: int, model: str, embeddings: Sequence[Sequence[float]]
+) -> None:
+    """Keep the article's centroid for the rebuild of ``index_name`` until it is activated. The caller commits."""
+    session.merge(
+        StagedArticleVector(index_name=index_name, article_id=article_id, model=model, vector=centroid(embeddings))
+    )
+
+
+def promote_staged_vectors(session: Session, index_name: str) -> None:
+    """
+    Replace ``article_vectors`` with the vectors staged for ``index_name``. The staged rows
+    are kept, so promoting again (a retried activation) gives the same result. The caller
+    commits.
+    """
+    session.query(ArticleVector).delete(synchronize_session=False)
+    staged = select(
+        StagedArticleVector.article_id,
+        StagedArticleVector.model,
+        StagedArticleVector.vector,
+        literal(datetime.utcnow(), ArticleVector.updated_at.type),
+    ).where(StagedArticleVector.index_name == index_name)
+    session.execute(insert(ArticleVector).from_select(["article_id", "model", "vector", "updated_at"], staged))
+
+
+class _ModelVectors:
+    """Centroids of one embedding model with the fields related-article queries filter on."""
+
+    def __init__(self, rows: List) -> None:
+        self.ids = np.array([row.article_id for row in rows], dtype=np.int64)
+        self.matrix = np.stack([np.frombuffer(row.vector, dtype=np.float16) for row in rows])
+        self.categories = np.array([row.category for row in rows], dtype=object)
+        self.published = np.array([row.published_at for row in rows], dtype="datetime64[s]")
+
+
+class RelatedArticlesIndex:
+    """
+    Article centroids held in memory for brute-force cosine kNN, with a small LRU cache of
+    results. Both are rebuilt when ``article_vectors`` changes (ingestion, reindex), which is
+    detected with one aggregate query per lookup, so API processes see new articles without
+    the embedding API ever being called at request time.
+    """
+
+    def __init__(self, cache_size: int = 1024) -> None:
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._version: Optional[Tuple] = None
+        self._models: Dict[str, _ModelVectors] = {}
+        self._positions: Dict[int, Tuple[str, int]] = {}
+        self._results: "OrderedDict[Tuple, List[Tuple[int, float]]]" = OrderedDict()
+
+    def _load(self, session: Session) -> None:
+        rows = (
+            session.query(
+                ArticleVector.article_id,
+                ArticleVector.model,
+                ArticleVector.vector,
+                Article.category,
+                Article.published_at,
+            )
+            .join(Article, Article.id == ArticleVector.article_id)
+            .order_by(ArticleVector.article_id)
+            .all()
+        )
+        by_model: Dict[str, List] = {}
+        for row in rows:
+            by_model.setdefault(row.model, []).append(row)
+        self._models = {model: _ModelVectors(model_rows) for model, model_rows in by_model.items()}
+        self._positions = {
+            int(article_id): (model, position)
+            for model, vectors in self._models.items()
+            for position, article_id in enumerate(vectors.ids)
+        }
+        self._results.clear()
+        logger.info("Loaded %s article vectors for related-article lookups", len(rows))
+
+    def related(
+        self,
+        session: Session,
+        article_id: int,
+        limit: int = 5,
+        category: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> List[Tuple[int, float]]:
+        """Up to ``limit`` ``(article_id, cosine similarity)`` pairs nearest to ``article_id``'s centroid."""
+        version = tuple(
+            session.query(func.count(ArticleVector.article_id), func.max(ArticleVector.updated_at)).one()
+        )
+        key = (article_id, limit, category, date_from, date_to)
+        with self._lock:
+            if version != self._version:
+                self._load(session)
+                self._version = version
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                return cached
+            result = self._search(article_id, limit, category, date_from, date_to)
+            self._results[key] = result
+            if len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+            return result
+
+    def _search(
+        self,
+        article_id: int,
+        limit: int,
+        category: Optional[str],
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+    ) -> List[Tuple[int, float]]:
+        position = self._positions.get(article_id)
+        if position is None:
+            return []
+        model, row = position
+        vectors = self._models[model]
+        mask = vectors.ids != article_id
+        if category:
+            mask &= vectors.categories == category
+        if date_from:
+            mask &= vectors.published >= np.datetime64(_naive_utc(date_from), "s")
+        if date_to:
+            mask &= vectors.published <= np.datetime64(_naive_utc(date_to), "s")
+        candidates = np.flatnonzero(mask)
+        if not len(candidates):
+            return []
+        query = vectors.matrix[row].astype(np.float32)
+        scores = np.concatenate(
+            [
+                vectors.matrix[candidates[start : start + SCORE_BLOCK_ROWS]].astype(np.float32) @ query
+                for start in range(0, len(candidates), SCORE_BLOCK_ROWS)
+            ]
+        )
+        top = np.argsort(-scores, kind="stable")[:limit]
+        return [(int(vectors.ids[candidates[index]]), round(float(scores[index]), 4)) for index in top]
+
+
+_index: Optional[RelatedArticlesIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_related_index() -> RelatedArticlesIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = RelatedArticlesIndex(cache_size=get_settings().related_articles_cache_size)
+        return _index
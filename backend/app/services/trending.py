@@ -0,0 +1,173 @@
+"""
+Trending topics: online clustering of recent articles at ingestion time.
+
+Each embedded article published within ``TRENDING_WINDOW_HOURS`` joins the active cluster
+whose centroid is most similar to its vector if the similarity reaches
+``TRENDING_SIMILARITY_THRESHOLD``, and starts a new cluster otherwise. Other outlets'
+copies of a story count towards their canonical article's cluster. A cluster's score is
+its number of articles, each weighted by half for every ``TRENDING_HALF_LIFE_HOURS``
+since it was published. All scores decay at the same rate, so clusters rank by
+
+    trend = log2(score at time t) + t / half_life
+
+which is the same whatever ``t`` it is evaluated at. It is stored and indexed, and the
+trending endpoint reads the top rows without recomputing anything.
+"""
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings, get_settings
+from app.models.topic_cluster import TopicCluster, TopicClusterArticle
+
+logger = logging.getLogger(__name__)
+
+# Article ids kept per cluster for display, newest first
+MAX_RECENT_ARTICLES = 5
+EPOCH = datetime(1970, 1, 1)
+
+
+def _hours(moment: datetime) -> float:
+    return (moment - EPOCH).total_seconds() / 3600
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    return moment.astimezone(timezone.utc).replace(tzinfo=None) if moment.tzinfo else moment
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+
+def current_score(cluster: TopicCluster, now: datetime, half_life_hours: float) -> float:
+    """Decayed article count of a cluster at ``now``."""
+    return 2 ** (cluster.trend - _hours(now) / half_life_hours)
+
+
+class TopicClusterer:
+    """
+    Assigns articles of one ingestion run to topic clusters. Active clusters are loaded
+    once; clusters without an article inside the window are deleted first. Ingestion runs
+    never overlap, so no other writer changes the clusters meanwhile. The caller commits.
+    """
+
+    def __init__(self, session: Session, settings: Optional[Settings] = None, now: Optional[datetime] = None) -> None:
+        settings = settings or get_settings()
+        self.session = session
+        self.now = now or datetime.utcnow()
+        self.window_start = self.now - timedelta(hours=settings.trending_window_hours)
+        self.half_life_hours = settings.trending_half_life_hours
+        self.threshold = settings.trending_similarity_threshold
+
+        stale = session.query(TopicCluster.id).filter(TopicCluster.last_article_at < self.window_start)
+        session.query(TopicClusterArticle).filter(TopicClusterArticle.cluster_id.in_(stale.scalar_subquery())).delete(
+            synchronize_session=False
+        )
+        removed = session.query(TopicCluster).filter(TopicCluster.last_article_at < self.window_start).delete(
+            synchronize_session=False
+        )
+        session.commit()
+        if removed:
+            logger.info("Removed %s topic clusters with no articles in the last %sh", removed, settings.trending_window_hours)
+
+        self._clusters: Dict[str, List[TopicCluster]] = {}
+        for cluster in session.query(TopicCluster).order_by(TopicCluster.id):
+            self._clusters.setdefault(cluster.model, []).append(cluster)
+        # Unit-length centroids per embedding model, row i belonging to self._clusters[model][i]
+        self._centroids: Dict[str, np.ndarray] = {
+            model: np.stack([_unit(np.frombuffer(cluster.centroid, dtype=np.float32)) for cluster in clusters])
+            for model, clusters in self._clusters.items()
+        }
+
+    def add_article(
+        self, article_id: int, category: str, published_at: datetime, model: str, vector: bytes
+    ) -> Optional[int]:
+        """Cluster an embedded article given its stored vector; returns the cluster id, or None if skipped."""
+        published_at = _naive_utc(published_at)
+        if published_at < self.window_start or self.session.get(TopicClusterArticle, article_id) is not None:
+            return None
+        point = np.frombuffer(vector, dtype=np.float16).astype(np.float32)
+        clusters = self._clusters.setdefault(model, [])
+        best = None
+        if clusters:
+            similarities = self._centroids[model] @ point
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                best = None
+        if best is None:
+            cluster = TopicCluster(
+                model=model,
+                centroid=point.tobytes(),
+                category=category,
+                size=0,
+                stories=0,
+                recent_article_ids=[],
+                last_article_at=published_at,
+                trend=0.0,
+            )
+            self.session.add(cluster)
+            self.session.flush()
+            clusters.append(cluster)
+            centroids = self._centroids.get(model)
+            self._centroids[model] = point[None, :] if centroids is None else np.vstack([centroids, point])
+        else:
+            cluster = clusters[best]
+            mean = np.frombuffer(cluster.centroid, dtype=np.float32)
+            mean = mean + (point - mean) / (cluster.stories + 1)
+            cluster.centroid = mean.astype(np.float32).tobytes()
+            self._centroids[model][best] = _unit(mean)
+        cluster.stories += 1
+        self._count(cluster, article_id, published_at)
+        return cluster.id
+
+    def add_copy(self, article_id: int, canonical_id: int, published_at: datetime) -> Optional[int]:
+        """Count another outlet's copy towards its canonical article's cluster."""
+        published_at = _naive_utc(published_at)
+        if published_at < self.window_start or self.session.get(TopicClusterArticle, article_id) is not None:
+            return None
+        canonical = self.session.get(TopicClusterArticle, canonical_id)
+        if canonical is None:
+            return None
+        cluster = self.session.get(TopicCluster, canonical.cluster_id)
+        self._count(cluster, article_id, published_at)
+        return cluster.id
+
+    def _count(self, cluster: TopicCluster, article_id: int, published_at: datetime) -> None:
+        published_at = min(published_at, self.now)
+        if cluster.size:
+            last = cluster.last_article_at
+            score = 2 ** (cluster.trend - _hours(last) / self.half_life_hours)
+        else:
+            last, score = published_at, 0.0
+        if published_at > last:
+            score *= 2 ** (-(_hours(published_at) - _hours(last)) / self.half_life_hours)
+            last = published_at
+        score += 2 ** (-(_hours(last) - _hours(published_at)) / self.half_life_hours)
+        cluster.size += 1
+        cluster.last_article_at = last
+        cluster.trend = math.log2(score) + _hours(last) / self.half_life_hours
+        # Reassigned, not appended: in-place changes to a JSON column are not tracked
+        cluster.recent_article_ids = [article_id, *cluster.recent_article_ids][:MAX_RECENT_ARTICLES]
+        self.session.add(TopicClusterArticle(article_id=article_id, cluster_id=cluster.id))
+
+
+def trending_clusters(
+    session: Session,
+    limit: int = 10,
+    category: Optional[str] = None,
+    settings: Optional[Settings] = None,
+    now: Optional[datetime] = None,
+) -> List[TopicCluster]:
+    """Top clusters by trend with an article inside the window: one indexed query."""
+    settings = settings or get_settings()
+    now = now or datetime.utcnow()
+    query = session.query(TopicCluster).filter(
+        TopicCluster.last_article_at >= now - timedelta(hours=settings.trending_window_hours)
+    )
+    if category:
+        query = query.filter(TopicCluster.category == category)
+    return query.order_by(TopicCluster.trend.desc()).limit(limit).all()
@@ -1,43 +1,208 @@
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-import chromadb
-
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.services.embeddings import LEGACY_EMBEDDING_MODEL
 
 logger = logging.getLogger(__name__)
 
+COLLECTION_NAME = "news_articles"
+# File in the vector store directory naming the collection in use; absent means COLLECTION_NAME
+ACTIVE_COLLECTION_FILE = "active_collection"
+
+# (article_id, spans, embeddings, metadata) as taken by ``add_chunks``
+ArticleChunks = Tuple[int, List[Tuple[int, int]], List[List[float]], Dict[str, Any]]
+
+
+class EmbeddingModelMismatchError(RuntimeError):
+    pass
+
+
+def timestamp(moment: Union[datetime, str]) -> int:
+    """Epoch seconds for chunk metadata; Chroma range filters only accept numbers. Naive means UTC."""
+    if isinstance(moment, str):
+        moment = datetime.fromisoformat(moment)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def chunk_metadata(article_id: int, chunk_index: int, span: Tuple[int, int], metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Everything a chunk stores besides its vector: the article id, the chunk's character
+    span in the article content and the fields searches filter on. The chunk text, title,
+    source and URL are read from ``articles`` at query time instead of being copied here.
+    """
+    return {
+        "article_id": article_id,
+        "chunk_index": chunk_index,
+        "start": span[0],
+        "end": span[1],
+        "category": metadata["category"],
+        "published_ts": timestamp(metadata["published_at"]),
+    }
+
+
+def active_collection_name(path: Path) -> str:
+    try:
+        return (path / ACTIVE_COLLECTION_FILE).read_text(encoding="utf-8").strip() or COLLECTION_NAME
+    except FileNotFoundError:
+        return COLLECTION_NAME
+
+
+def set_active_collection(path: Path, name: str) -> None:
+    """Point every store opened on ``path`` at collection ``name``; readers see the old or new name, never a mix."""
+    staging = path / f"{ACTIVE_COLLECTION_FILE}.tmp"
+    staging.write_text(name, encoding="utf-8")
+    os.replace(staging, path / ACTIVE_COLLECTION_FILE)
+
 
 class VectorStore:
-    def __init__(self) -> None:
-        settings = get_settings()
-        self.client = chromadb.PersistentClient(path=str(settings.vector_store_path))
-        self.collection = self.client.get_or_create_collection(name="news_articles")
+    """
+    Chroma collection of article chunks.
+
+    Without ``collection_name`` the store uses the active collection and switches to a new
+    one when ``reindex.py`` activates it, so long-running processes pick up a rebuilt index
+    without a restart. A named collection is used as-is (the reindex builds into one).
+    """
+
+    def __init__(
+        self,
+        embedding_model: Optional[str] = None,
+        collection_name: Optional[str] = None,
+        settings: Optional[Settings] = None,
+    ) -> None:
+        # chromadb takes seconds to import; only processes that open the store pay for it
+        import chromadb
+
+        settings = settings or get_settings()
+        self.embedding_model = embedding_model or settings.embedding_model
+        self.path = settings.vector_store_path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.client = chromadb.PersistentClient(path=str(self.path))
+        self.follows_active = collection_name is None
+        self._pointer_mtime = self._read_pointer_mtime()
+        self.collection_name = collection_name or active_collection_name(self.path)
+        self.collection = self._open(self.collection_name)
+
+    def _open(self, name: str):
+        # Passing metadata to get_or_create_collection would overwrite the existing tag,
+        # so the collection is opened bare and tagged explicitly.
+        collection = self.client.get_or_create_collection(name=name)
+        self._check_embedding_model(collection)
+        return collection
+
+    def _read_pointer_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path / ACTIVE_COLLECTION_FILE).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _follow_active(self) -> None:
+        """Switch to the active collection if a reindex activated another one since the last call."""
+        if not self.follows_active:
+            return
+        mtime = self._read_pointer_mtime()
+        if mtime == self._pointer_mtime:
+            return
+        self._pointer_mtime = mtime
+        name = active_collection_name(self.path)
+        if name == self.collection_name:
+            return
+        try:
+            self.collection = self._open(name)
+        except EmbeddingModelMismatchError:
+            logger.error(
+                "Collection '%s' was activated but holds embeddings of another model; still using '%s' "
+                "until this process is restarted with the matching embedding settings",
+                name, self.collection_name,
+            )
+            return
+        logger.info("Switched vector store collection from '%s' to '%s'", self.collection_name, name)
+        self.collection_name = name
+
+    def _check_embedding_model(self, collection) -> None:
+        """
+        Refuse to mix vectors from different embedding models in one collection.
+        Collections created before tagging existed were always built with the legacy OpenAI model.
+        """
+        metadata = collection.metadata or {}
+        stored_model = metadata.get("embedding_model")
+        if stored_model is None:
+            if collection.count() == 0 or self.embedding_model == LEGACY_EMBEDDING_MODEL:
+                collection.modify(metadata={**metadata, "embedding_model": self.embedding_model})
+                return
+            stored_model = LEGACY_EMBEDDING_MODEL
+        if stored_model != self.embedding_model:
+            raise EmbeddingModelMismatchError(
+                f"Collection '{collection.name}' holds '{stored_model}' embeddings but the configured "
+                f"model is '{self.embedding_model}'. Rebuild it with reindex.py or point "
+                "VECTOR_STORE_DIR at a fresh directory."
+            )
 
     def add_chunks(
         self,
         article_id: int,
-        chunks: List[str],
+        spans: List[Tuple[int, int]],
         embeddings: List[List[float]],
         metadata: Dict[str, Any],
     ) -> None:
-        ids = [f"article-{article_id}-chunk-{idx}" for idx in range(len(chunks))]
-        metadatas = []
-        for idx, chunk in enumerate(chunks):
-            metadatas.append(
-                {
-                    "article_id": article_id,
-                    "chunk_index": idx,
-                    "category": metadata.get("category"),
-                    "published_at": metadata.get("published_at"),
-                    "title": metadata.get("title"),
-                    "source": metadata.get("source"),
-                    "url": metadata.get("url"),
-                    "snippet": chunk[:400],
-                }
-            )
-        self.collection.upsert(ids=ids, documents=chunks, embeddings=embeddings, metadatas=metadatas)
+        """Index an article's chunks, given as ``(start, end)`` offsets into its content."""
+        # Re-chunked content may produce fewer chunks; drop the old ones so none linger
+        self.delete_article(article_id)
+        self.add_articles([(article_id, spans, embeddings, metadata)])
+
+    def add_articles(self, articles: List[ArticleChunks]) -> None:
+        """Index several articles' chunks in one write, without removing chunks they had before."""
+        self._follow_active()
+        ids, vectors, metadatas = [], [], []
+        for article_id, spans, embeddings, metadata in articles:
+            ids.extend(f"article-{article_id}-chunk-{idx}" for idx in range(len(spans)))
+            vectors.extend(embeddings)
+            metadatas.extend(chunk_metadata(article_id, idx, span, metadata) for idx, span in enumerate(spans))
+        if ids:
+            self.collection.upsert(ids=ids, embeddings=vectors, metadatas=metadatas)
+
+    def has_article(self, article_id: int) -> bool:
+        self._follow_active()
+        return bool(self.collection.get(ids=[f"article-{article_id}-chunk-0"], include=[])["ids"])
+
+    def article_embeddings(self, article_ids: List[int]) -> Dict[int, List[List[float]]]:
+        """Stored chunk embeddings of the given articles, keyed by article id."""
+        self._follow_active()
+        found: Dict[int, List[List[float]]] = {}
+        if not article_ids:
+            return found
+        result = self.collection.get(
+            where={"article_id": {"$in": list(article_ids)}}, include=["embeddings", "metadatas"]
+        )
+        for embedding, metadata in zip(result["embeddings"], result["metadatas"]):
+            found.setdefault(int(metadata["article_id"]), []).append(list(embedding))
+        return found
+
+    def delete_article(self, article_id: int) -> None:
+        self._follow_active()
+        self.collection.delete(where={"article_id": article_id})
+
+    def activate(self, promote: Optional[Callable[[], None]] = None) -> None:
+        """
+        Make this collection the one every store on the directory reads and writes.
+        ``promote`` runs just before the swap to move data staged for it into place.
+        """
+        if promote is not None:
+            promote()
+        set_active_collection(self.path, self.collection_name)
+
+    def drop_inactive(self) -> None:
+        """Delete news collections other than the active one and this one (earlier or abandoned rebuilds)."""
+        keep = {active_collection_name(self.path), self.collection_name}
+        for collection in self.client.list_collections():
+            if collection.name.startswith(COLLECTION_NAME) and collection.name not in keep:
+                logger.info("Deleting inactive collection '%s'", collection.name)
+                self.client.delete_collection(collection.name)
 
     def similarity_search(
         self,
@@ -46,36 +211,65 @@ class VectorStore:
         category: Optional[str] = None,
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
+        with_embeddings: bool = False,
     ) -> List[Dict[str, Any]]:
-        where: Dict[str, Any] = {}
+        """
+        Nearest chunks as ``chunk_metadata`` records plus ``score``, and their ``embedding``
+        if asked for. ``RAGService`` adds the chunk text and article fields from the database.
+        """
+        return self.similarity_search_batch([embedding], top_k, category, date_from, date_to, with_embeddings)[0]
+
+    def similarity_search_batch(
+        self,
+        embeddings: List[List[float]],
+        top_k: int = 8,
+        category: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        with_embeddings: bool = False,
+    ) -> List[List[Dict[str, Any]]]:
+        """``similarity_search`` for several embeddings with the same filters, in one collection query."""
+        if not embeddings:
+            return []
+        conditions: List[Dict[str, Any]] = []
         if category:
-            where["category"] = category
-        if date_from or date_to:
-            date_filter: Dict[str, Any] = {}
-            if date_from:
-                date_filter["$gte"] = date_from.isoformat()
-            if date_to:
-                date_filter["$lte"] = date_to.isoformat()
-            where["published_at"] = date_filter
+            conditions.append({"category": category})
+        if date_from:
+            conditions.append({"published_ts": {"$gte": timestamp(date_from)}})
+        if date_to:
+            conditions.append({"published_ts": {"$lte": timestamp(date_to)}})
+        # Chroma takes a single field per clause; several must be combined with $and
+        where = conditions[0] if len(conditions) == 1 else ({"$and": conditions} if conditions else None)
+        self._follow_active()
         # Check collection count for debugging
         collection_count = self.collection.count()
-        logger.info(f"Vector store collection has {collection_count} items. Querying with top_k={top_k}, category={category}, date_from={date_from}, date_to={date_to}")
-        
-        results = self.collection.query(query_embeddings=[embedding], n_results=top_k, where=where)
-        metadatas = results.get("metadatas", [[]])[0] or []
-        documents = results.get("documents", [[]])[0] or []
-        distances = results.get("distances", [[]])[0] or []
-        
-        logger.info(f"Query returned {len(documents)} documents, {len(metadatas)} metadatas")
-        
-        records = []
-        for meta, doc, distance in zip(metadatas, documents, distances):
-            # Only include records with valid document content
-            if doc and doc.strip():
-                record = {**meta, "document": doc, "score": distance}
-                records.append(record)
-            else:
-                logger.warning(f"Skipping record with empty document. Metadata: {meta}")
-        
-        logger.info(f"Returning {len(records)} valid records after filtering")
-        return records
+        logger.info(f"Vector store collection has {collection_count} items. Querying {len(embeddings)} embeddings with top_k={top_k}, category={category}, date_from={date_from}, date_to={date_to}")
+
+        include = ["metadatas", "distances", "embeddings"] if with_embeddings else ["metadatas", "distances"]
+        results = self.collection.query(query_embeddings=embeddings, n_results=top_k, where=where, include=include)
+        batches = []
+        for index in range(len(embeddings)):
+            metadatas = results["metadatas"][index] or []
+            distances = results["distances"][index] or []
+            records = [{**meta, "score": distance} for meta, distance in zip(metadatas, distances)]
+            if with_embeddings:
+                for record, chunk_embedding in zip(records, results["embeddings"][index]):
+                    record["embedding"] = list(chunk_embedding)
+            batches.append(records)
+        logger.info(f"Query returned {sum(len(records) for records in batches)} chunks")
+        return batches
+
+
+def get_vector_store(embedding_model: Optional[str] = None, index_name: Optional[str] = None):
+    """
+    The vector store selected by ``VECTOR_BACKEND``. ``index_name`` opens a specific
+    collection or table instead of the active one, as used when rebuilding the index.
+    """
+    backend = get_settings().vector_backend.lower()
+    if backend == "chroma":
+        return VectorStore(embedding_model=embedding_model, collection_name=index_name)
+    if backend == "pgvector":
+        from app.services.pgvector_store import CHUNKS_TABLE, PgVectorStore
+
+        return PgVectorStore(embedding_model=embedding_model, table=index_name or CHUNKS_TABLE)
+    raise ValueError(f"Unknown vector backend '{backend}'; expected 'chroma' or 'pgvector'")
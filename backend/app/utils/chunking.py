@@ -0,0 +1,168 @@
+import re
+from typing import Callable, Iterator, List, Tuple
+
+# Exact counts for OpenAI embedding models. The encoding is downloaded on first use, so an
+# offline host without a cached copy falls back to the approximation.
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # pragma: no cover - depends on the cached encoding file
+    _ENCODING = None
+
+PARAGRAPH_RE = re.compile(r"\n\s*\n")
+# A sentence ends at . ! or ? (plus closing quotes/brackets) followed by whitespace and
+# an uppercase letter, digit or opening quote. Abbreviations like "U.S. officials" stay whole
+# because the next word is lowercase.
+SENTENCE_END_RE = re.compile(r"[.!?]+[\"')\]]*\s+(?=[\"'(\[]?[A-Z0-9])")
+WORD_RE = re.compile(r"\S+")
+TOKEN_APPROX_RE = re.compile(r"\w+|[^\w\s]")
+
+# (start offset, end offset, token count, starts a new paragraph) of one sentence
+Unit = Tuple[int, int, int, bool]
+Span = Tuple[int, int]
+
+
+def count_tokens(text: str) -> int:
+    """Token count under cl100k_base, or a word/punctuation approximation without tiktoken."""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return len(TOKEN_APPROX_RE.findall(text))
+
+
+def _strip(text: str, start: int, end: int) -> Span:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _units(text: str, counter: Callable[[str], int]) -> Iterator[Unit]:
+    """Single left-to-right pass over paragraphs and their sentences."""
+    boundaries = [(match.start(), match.end()) for match in PARAGRAPH_RE.finditer(text)]
+    paragraph_starts = [0] + [end for _, end in boundaries]
+    paragraph_ends = [start for start, _ in boundaries] + [len(text)]
+    for paragraph_start, paragraph_end in zip(paragraph_starts, paragraph_ends):
+        paragraph_start, paragraph_end = _strip(text, paragraph_start, paragraph_end)
+        first = True
+        position = paragraph_start
+        ends = [match.end() for match in SENTENCE_END_RE.finditer(text, paragraph_start, paragraph_end)]
+        for sentence_end in ends + [paragraph_end]:
+            start, end = _strip(text, position, sentence_end)
+            position = sentence_end
+            if start < end:
+                yield start, end, counter(text[start:end]), first
+                first = False
+
+
+def _hard_split(text: str, start: int, end: int, max_tokens: int, counter: Callable[[str], int]) -> List[Span]:
+    """Split ``text[start:end]`` anywhere into the longest pieces of at most ``max_tokens`` tokens."""
+    pieces: List[Span] = []
+    while start < end:
+        # Binary search for the longest prefix within the limit; one character always goes in
+        low, high = start + 1, end
+        while low < high:
+            middle = (low + high + 1) // 2
+            if counter(text[start:middle]) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        piece = _strip(text, start, low)
+        if piece[0] < piece[1]:
+            pieces.append(piece)
+        start = low
+    return pieces
+
+
+def _split_long(text: str, unit: Unit, max_tokens: int, counter: Callable[[str], int]) -> List[Span]:
+    """
+    Fallback for a single sentence over the limit: pack whole words greedily. A word over
+    the limit on its own, or a packed piece that counts over it once joined, is split
+    within words.
+    """
+    packed: List[Span] = []
+    piece_start = piece_end = None
+    tokens = 0
+    for match in WORD_RE.finditer(text, unit[0], unit[1]):
+        size = counter(match.group())
+        if piece_start is not None and (tokens + size > max_tokens or size > max_tokens):
+            packed.append((piece_start, piece_end))
+            piece_start, tokens = None, 0
+        if size > max_tokens:
+            packed.append((match.start(), match.end()))
+            continue
+        if piece_start is None:
+            piece_start = match.start()
+        piece_end = match.end()
+        tokens += size
+    if piece_start is not None:
+        packed.append((piece_start, piece_end))
+    pieces: List[Span] = []
+    for start, end in packed:
+        if counter(text[start:end]) <= max_tokens:
+            pieces.append((start, end))
+        else:
+            pieces.extend(_hard_split(text, start, end, max_tokens, counter))
+    return pieces
+
+
+def chunk_spans(
+    text: str,
+    max_tokens: int,
+    overlap_tokens: int,
+    counter: Callable[[str], int] = count_tokens,
+) -> List[Span]:
+    """
+    Split ``text`` into chunks of at most ``max_tokens`` tokens along sentence boundaries,
+    returned as ``(start, end)`` character offsets into ``text``.
+
+    Sentences are packed greedily. When a chunk is full, the next one starts with as many
+    trailing whole sentences of the previous chunk as fit in ``overlap_tokens``; no overlap
+    is carried into a new paragraph, where context usually changes anyway. Only a single
+    sentence longer than ``max_tokens`` is split, at word boundaries (within a word that is
+    itself too long). ``counter`` should be the embedding model's tokenizer
+    (``EmbeddingProvider.count_tokens``) so that chunks fit its input limit.
+    """
+    if not text:
+        return []
+    spans: List[Span] = []
+    current: List[Unit] = []
+    current_tokens = 0
+
+    def flush() -> None:
+        if current:
+            spans.append((current[0][0], current[-1][1]))
+
+    for unit in _units(text, counter):
+        tokens, starts_paragraph = unit[2], unit[3]
+        if tokens > max_tokens:
+            flush()
+            spans.extend(_split_long(text, unit, max_tokens, counter))
+            current, current_tokens = [], 0
+            continue
+        if current and current_tokens + tokens > max_tokens:
+            flush()
+            overlap: List[Unit] = []
+            overlap_size = 0
+            if not starts_paragraph:
+                for previous in reversed(current):
+                    if overlap_size + previous[2] > overlap_tokens or overlap_size + previous[2] + tokens > max_tokens:
+                        break
+                    overlap.insert(0, previous)
+                    overlap_size += previous[2]
+            current, current_tokens = overlap, overlap_size
+        current.append(unit)
+        current_tokens += tokens
+    flush()
+    return spans
+
+
+def chunk_text(
+    text: str,
+    max_tokens: int,
+    overlap_tokens: int,
+    counter: Callable[[str], int] = count_tokens,
+) -> List[str]:
+    """The chunks of ``chunk_spans`` as strings (exact slices of ``text``)."""
+    return [text[start:end] for start, end in chunk_spans(text, max_tokens, overlap_tokens, counter)]
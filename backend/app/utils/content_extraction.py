@@ -0,0 +1,241 @@
+import codecs
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Elements whose whole subtree is never article text
+SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "object",
+    "nav", "header", "footer", "aside", "form", "button", "select", "textarea", "figure",
+}
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "header", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6",
+    "blockquote", "pre", "td", "tr", "table", "dd", "dt", "br", "hr", "body",
+}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+# Start tags that close an open element whose end tag may be omitted (HTML's implied end tags)
+IMPLIED_END_TAGS = {
+    "p": {
+        "address", "article", "aside", "blockquote", "details", "div", "dl", "fieldset", "figcaption", "figure",
+        "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "main", "menu", "nav", "ol", "p",
+        "pre", "section", "table", "ul",
+    },
+    "li": {"li"},
+    "dt": {"dt", "dd"},
+    "dd": {"dt", "dd"},
+}
+# Words marking containers that hold chrome rather than the story. A class or id token
+# matches when it is one of them or starts or ends with one ("related-stories",
+# "post-comments"), not when it merely contains one ("commentary", "article-related-body").
+_BOILERPLATE_WORDS = (
+    r"cookies?|consent|banners?|newsletters?|subscribe|related|recommend(?:ed|ations?)?|share|sharing|social|"
+    r"comments?|promos?|adverts?|advertisements?|ads?|sponsor(?:ed)?|sidebar|menu|breadcrumbs?|byline-tools|"
+    r"paywall|popup|modal|footer|masthead"
+)
+BOILERPLATE_RE = re.compile(rf"^(?:{_BOILERPLATE_WORDS})(?:[-_]\S*)?$|^\S*[-_](?:{_BOILERPLATE_WORDS})$", re.IGNORECASE)
+WHITESPACE_RE = re.compile(r"\s+")
+META_IMAGE_KEYS = ("og:image", "og:image:url", "og:image:secure_url", "twitter:image", "twitter:image:src")
+
+# A block is kept when at least this many words are not link text...
+MIN_BLOCK_WORDS = 10
+# ...or it is a short paragraph/heading that is not mostly links
+MIN_PARAGRAPH_WORDS = 4
+MAX_LINK_DENSITY = 0.35
+MAX_PAGE_BYTES = 2_000_000
+
+
+@dataclass
+class ExtractedContent:
+    text: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    image_url: Optional[str] = None
+
+
+class ContentExtractor(HTMLParser):
+    """
+    Incremental main-content extractor; call ``feed`` with pieces of a page, then ``result``.
+
+    The page is split into text blocks at block-level tags. Chrome (scripts, navigation,
+    cookie banners, related-article lists, ...) is dropped while parsing, and the remaining
+    blocks are kept by word count and link density. When the page marks its story with
+    ``<article>`` or ``<main>``, blocks outside it are ignored; a ``<header>`` inside it
+    holds the story's headline and is kept. A skipped element ends at its end tag, or where
+    it is implicitly closed (a new paragraph after an unclosed ``<p>``, the end of an
+    enclosing element), so an omitted end tag cannot hide the rest of the page.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.meta: Dict[str, str] = {}
+        self.title_parts: List[str] = []
+        self.first_image: Optional[str] = None
+        # (text, words, link_words, tag, inside article/main)
+        self.blocks: List[Tuple[str, int, int, str, bool]] = []
+        self._parts: List[str] = []
+        self._link_parts: List[str] = []
+        self._block_tag = "body"
+        # Open elements of the subtree being skipped, and outside it; outermost first
+        self._skipped: List[str] = []
+        self._open: List[str] = []
+        self._main_depth = 0
+        self._link_depth = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if self._skipped:
+            _close_implied(self._skipped, tag)
+            if self._skipped:
+                if tag not in VOID_TAGS:
+                    self._skipped.append(tag)
+                return
+        _close_implied(self._open, tag)
+        attributes = {name: value or "" for name, value in attrs}
+        if tag == "meta":
+            key = (attributes.get("property") or attributes.get("name") or "").lower()
+            if key and attributes.get("content"):
+                self.meta.setdefault(key, attributes["content"].strip())
+            return
+        if tag == "title":
+            self._in_title = True
+            return
+        if tag == "img":
+            if self.first_image is None and attributes.get("src", "").startswith(("http://", "https://")):
+                self.first_image = attributes["src"]
+            return
+        story_header = tag == "header" and self._main_depth > 0
+        if (tag in SKIP_TAGS and not story_header) or (
+            tag not in VOID_TAGS
+            and tag not in ("body", "html", "article", "main")
+            and any(
+                BOILERPLATE_RE.match(token)
+                for token in f"{attributes.get('class', '')} {attributes.get('id', '')}".split()
+            )
+        ):
+            self._skipped = [tag]
+            return
+        if tag not in VOID_TAGS:
+            self._open.append(tag)
+        if tag == "a":
+            self._link_depth += 1
+        if tag in BLOCK_TAGS:
+            self._close_block()
+            self._block_tag = tag
+        if tag in ("article", "main"):
+            self._main_depth += 1
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._skipped:
+            if tag in self._skipped:
+                _close(self._skipped, tag)
+                return
+            if tag not in self._open:
+                return
+            # An enclosing element ended, so the skipped one's end tag was omitted
+            self._skipped = []
+        _close(self._open, tag)
+        if tag == "title":
+            self._in_title = False
+        elif tag == "a":
+            self._link_depth = max(0, self._link_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self._close_block()
+            self._block_tag = "div"
+            if tag in ("article", "main"):
+                self._main_depth = max(0, self._main_depth - 1)
+
+    def handle_data(self, data: str) -> None:
+        if self._skipped:
+            return
+        if self._in_title:
+            self.title_parts.append(data)
+            return
+        self._parts.append(data)
+        if self._link_depth:
+            self._link_parts.append(data)
+
+    def _close_block(self) -> None:
+        if not self._parts:
+            return
+        text = WHITESPACE_RE.sub(" ", "".join(self._parts)).strip()
+        if text:
+            words = text.count(" ") + 1
+            link_text = "".join(self._link_parts).strip()
+            link_words = link_text.count(" ") + 1 if link_text else 0
+            self.blocks.append((text, words, link_words, self._block_tag, self._main_depth > 0))
+        self._parts = []
+        self._link_parts = []
+
+    def result(self) -> ExtractedContent:
+        self.close()
+        self._close_block()
+        kept = [block for block in self.blocks if _is_content(block)]
+        if any(block[4] for block in kept):
+            kept = [block for block in kept if block[4]]
+        if kept:
+            text = "\n\n".join(block[0] for block in kept)
+        else:
+            # Fragments such as feed summaries have no structure to score; keep all visible text
+            text = "\n\n".join(block[0] for block in self.blocks)
+
+        image_url = next((self.meta[key] for key in META_IMAGE_KEYS if self.meta.get(key)), None)
+        title = self.meta.get("og:title") or WHITESPACE_RE.sub(" ", "".join(self.title_parts)).strip()
+        return ExtractedContent(
+            text=text,
+            title=title or None,
+            description=self.meta.get("og:description") or self.meta.get("description"),
+            image_url=image_url or self.first_image,
+        )
+
+
+def _close(open_tags: List[str], tag: str) -> None:
+    """Close the innermost open ``tag`` and everything opened inside it."""
+    if tag in open_tags:
+        del open_tags[len(open_tags) - 1 - open_tags[::-1].index(tag) :]
+
+
+def _close_implied(open_tags: List[str], tag: str) -> None:
+    """Close the open elements that a ``tag`` start tag ends implicitly (``<p>`` after an unclosed ``<p>``)."""
+    while open_tags and tag in IMPLIED_END_TAGS.get(open_tags[-1], ()):
+        open_tags.pop()
+
+
+def _is_content(block: Tuple[str, int, int, str, bool]) -> bool:
+    _, words, link_words, tag, _ = block
+    if link_words / words > MAX_LINK_DENSITY:
+        return False
+    if words - link_words >= MIN_BLOCK_WORDS:
+        return True
+    return tag in ("p", "blockquote", "h1", "h2", "h3") and words >= MIN_PARAGRAPH_WORDS
+
+
+def extract_content(html: str) -> ExtractedContent:
+    """Main text plus title/description/image metadata of an HTML page or fragment."""
+    extractor = ContentExtractor()
+    extractor.feed(html or "")
+    return extractor.result()
+
+
+def extract_content_stream(
+    chunks: Iterable[bytes], encoding: Optional[str] = None, max_bytes: int = MAX_PAGE_BYTES
+) -> ExtractedContent:
+    """Extract from a byte stream (e.g. ``response.iter_content()``) without buffering the page."""
+    try:
+        decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    extractor = ContentExtractor()
+    received = 0
+    for chunk in chunks:
+        received += len(chunk)
+        extractor.feed(decoder.decode(chunk))
+        if received >= max_bytes:
+            break
+    extractor.feed(decoder.decode(b"", final=True))
+    return extractor.result()
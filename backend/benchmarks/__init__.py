@@ -0,0 +1,7 @@
+"""
+Offline performance benchmarks for NewsIQ.
+
+Everything here runs without network access: the corpus is synthetic, embeddings
+come from the deterministic hashing provider and the LLM is a fake with
+configurable latency. See ``python -m benchmarks.run --help``.
+"""
@@ -0,0 +1,107 @@
+"""
+Throughput of main-content extraction versus the regex ``clean_html``.
+
+    python -m benchmarks.content_extraction --pages 200
+    python -m benchmarks.content_extraction --html saved/*.html
+
+Without ``--html`` synthetic news pages are generated: a corpus article wrapped in
+navigation, scripts, a cookie banner, share links, a related-articles list and a footer.
+Reports MB/s of input HTML and the size of the text each extractor keeps, which is
+what gets chunked and embedded downstream.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def synthetic_page(title: str, body: str, rng: random.Random) -> str:
+    nav = "".join(f'<li><a href="/section/{index}">Section {index}</a></li>' for index in range(25))
+    related = "".join(
+        f'<li><a href="/story/{rng.randint(1, 10**6)}">Another headline about things number {index}</a></li>'
+        for index in range(15)
+    )
+    paragraphs = "".join(f"<p>{paragraph}</p>" for paragraph in body.split("\n\n"))
+    script = "var tracking = {" + ", ".join(f'"k{index}": {index}' for index in range(300)) + "};"
+    return (
+        f"<!doctype html><html><head><title>{title}</title>"
+        f'<meta property="og:image" content="https://img.example.com/{rng.randint(1, 999)}.jpg">'
+        f"<style>body {{ font-family: sans-serif; }} {'.x { color: red; } ' * 200}</style>"
+        f"<script>{script}</script></head><body>"
+        f'<header><nav><ul>{nav}</ul></nav></header>'
+        '<div class="cookie-banner">We use cookies to improve your experience. Accept all cookies?</div>'
+        f'<main><article><h1>{title}</h1><div class="share-tools"><a href="#">Share</a><a href="#">Tweet</a></div>'
+        f"{paragraphs}</article>"
+        f'<aside><h3>Related</h3><ul>{related}</ul></aside></main>'
+        '<div class="newsletter">Subscribe to our newsletter for the latest updates every morning.</div>'
+        f"<footer><p>Copyright 2024 Example News. All rights reserved.</p><ul>{nav}</ul></footer>"
+        f"<script>{script}</script></body></html>"
+    )
+
+
+def run(pages: List[str], extractor: Callable[[str], str], repeat: int) -> Dict[str, float]:
+    from benchmarks.stats import summarize
+
+    latencies: List[float] = []
+    kept = 0
+    for _ in range(repeat):
+        for page in pages:
+            started = time.perf_counter()
+            text = extractor(page)
+            latencies.append(time.perf_counter() - started)
+            kept += len(text)
+    total_bytes = repeat * sum(len(page.encode("utf-8")) for page in pages)
+    stats = summarize(latencies)
+    stats["mb_per_s"] = round(total_bytes / sum(latencies) / 1e6, 2)
+    stats["kept_chars_per_page"] = round(kept / (repeat * len(pages)))
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200, help="synthetic pages to generate")
+    parser.add_argument("--html", nargs="*", help="saved HTML files to use instead of synthetic pages")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    from app.utils.content_extraction import extract_content
+    from app.utils.text_cleaning import clean_html
+    from benchmarks.corpus import generate_articles
+
+    if args.html:
+        pages = [Path(path).read_text(encoding="utf-8", errors="replace") for path in args.html]
+    else:
+        rng = random.Random(args.seed)
+        pages = [
+            synthetic_page(article.title, article.content, rng)
+            for article in generate_articles(args.pages, seed=args.seed)
+        ]
+
+    results = {
+        "clean_html": run(pages, clean_html, args.repeat),
+        "extract_content": run(pages, lambda page: extract_content(page).text, args.repeat),
+    }
+    average_bytes = round(sum(len(page.encode("utf-8")) for page in pages) / len(pages))
+    print(f"{len(pages)} pages, {average_bytes} bytes of HTML each on average\n")
+    header = f"{'extractor':<18}{'MB/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'kept chars':>12}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in results.items():
+        print(f"{name:<18}{stats['mb_per_s']:>8}{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['kept_chars_per_page']:>12}")
+    if args.output:
+        Path(args.output).write_text(json.dumps({"pages": len(pages), "results": results}, indent=2), encoding="utf-8")
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Size and read throughput of article storage before and after content compression.
+
+    python -m benchmarks.content_storage --articles 5000
+    python -m benchmarks.content_storage --database-url sqlite:///news_iq.db
+
+Builds a SQLite database in the previous layout (plain-text ``content``, no ``excerpt``),
+copies it and runs ``migrate_compress_content`` on the copy, then compares the two:
+file size after VACUUM, listing pages of 20 newest articles (all columns before,
+``excerpt`` instead of ``content`` after), reading every article's full text, and a
+substring search. Without ``--database-url`` the synthetic corpus is used; its small
+vocabulary compresses better than real news, so prefer a copy of a real database.
+"""
+import argparse
+import json
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+LEGACY_SCHEMA = (
+    "CREATE TABLE articles (id INTEGER PRIMARY KEY, title VARCHAR(512) NOT NULL, source VARCHAR(128) NOT NULL, "
+    "url VARCHAR(512) NOT NULL UNIQUE, published_at DATETIME NOT NULL, category VARCHAR(64) NOT NULL, "
+    "content TEXT NOT NULL, image_url VARCHAR(512), created_at DATETIME NOT NULL, minhash BLOB, canonical_id INTEGER)"
+)
+LIST_COLUMNS = "id, title, source, url, published_at, category, image_url, created_at, canonical_id"
+PAGE_SIZE = 20
+
+
+def load_articles(database_url: Optional[str], count: int, seed: int) -> List[tuple]:
+    if database_url:
+        from sqlalchemy.orm import sessionmaker
+
+        from app.core.db import build_engine
+        from app.models.article import Article
+
+        session = sessionmaker(bind=build_engine(database_url))()
+        try:
+            query = session.query(
+                Article.title, Article.source, Article.url, Article.published_at, Article.category, Article.content
+            ).order_by(Article.id)
+            return [tuple(row) for row in (query.limit(count) if count else query)]
+        finally:
+            session.close()
+    from benchmarks.corpus import generate_articles
+
+    return [
+        (item.title, item.source, str(item.url), item.published_at, item.category, item.content)
+        for item in generate_articles(count, seed=seed)
+    ]
+
+
+def build_legacy_database(path: Path, articles: List[tuple]) -> None:
+    connection = sqlite3.connect(path)
+    connection.execute(LEGACY_SCHEMA)
+    connection.executemany(
+        "INSERT INTO articles (title, source, url, published_at, category, content, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(*article[:3], str(article[3]), article[4], article[5], str(article[3])) for article in articles],
+    )
+    connection.commit()
+    connection.execute("CREATE INDEX ix_articles_published_at ON articles (published_at)")
+    connection.execute("VACUUM")
+    connection.close()
+
+
+def measure(path: Path, listing: str, content: str, repeat: int) -> Dict[str, float]:
+    from app.utils.compression import decompress_text
+
+    connection = sqlite3.connect(path)
+    connection.create_function("decompress_text", 1, decompress_text, deterministic=True)
+    total = connection.execute("SELECT count(*) FROM articles").fetchone()[0]
+    pages = max(1, (total + PAGE_SIZE - 1) // PAGE_SIZE)
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for page in range(pages):
+            connection.execute(
+                f"SELECT {listing} FROM articles ORDER BY published_at DESC LIMIT ? OFFSET ?",
+                (PAGE_SIZE, page * PAGE_SIZE),
+            ).fetchall()
+    list_seconds = (time.perf_counter() - started) / (repeat * pages)
+
+    text_bytes = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for (value,) in connection.execute("SELECT content FROM articles"):
+            text_bytes += len(decompress_text(value))
+    read_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        connection.execute(f"SELECT count(*) FROM articles WHERE lower({content}) LIKE '%inflation%'").fetchone()
+    search_seconds = (time.perf_counter() - started) / repeat
+    connection.close()
+    return {
+        "file_mb": round(path.stat().st_size / 1e6, 2),
+        "list_page_ms": round(list_seconds * 1000, 3),
+        "read_text_mb_per_s": round(text_bytes / read_seconds / 1e6, 1),
+        "search_ms": round(search_seconds * 1000, 2),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=5000, help="synthetic articles, or a limit with --database-url")
+    parser.add_argument("--database-url", help="read articles from this database instead of the synthetic corpus")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    from migrate_compress_content import migrate_database
+
+    articles = load_articles(args.database_url, args.articles, args.seed)
+    workdir = Path(tempfile.mkdtemp(prefix="content-storage-"))
+    try:
+        plain, compressed = workdir / "plain.db", workdir / "compressed.db"
+        build_legacy_database(plain, articles)
+        shutil.copy(plain, compressed)
+        migrate_database(f"sqlite:///{compressed}")
+        results = {
+            "plain": measure(plain, f"{LIST_COLUMNS}, content", "content", args.repeat),
+            "compressed": measure(compressed, f"{LIST_COLUMNS}, excerpt", "decompress_text(content)", args.repeat),
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    text_mb = sum(len(article[5].encode("utf-8")) for article in articles) / 1e6
+    print(f"\n{len(articles)} articles, {text_mb:.1f} MB of text\n")
+    header = f"{'storage':<12}{'file MB':>9}{'list page ms':>14}{'read MB/s':>11}{'search ms':>11}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in results.items():
+        print(
+            f"{name:<12}{stats['file_mb']:>9}{stats['list_page_ms']:>14}"
+            f"{stats['read_text_mb_per_s']:>11}{stats['search_ms']:>11}"
+        )
+    if args.output:
+        Path(args.output).write_text(json.dumps({"articles": len(articles), "results": results}, indent=2), encoding="utf-8")
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
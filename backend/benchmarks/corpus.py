@@ -0,0 +1,79 @@
+"""Deterministic synthetic news corpus."""
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from app.schemas.article import ArticleCreate
+
+TOPICS: Dict[str, List[str]] = {
+    "technology": [
+        "chip", "semiconductor", "software", "startup", "cloud", "model", "AI", "smartphone",
+        "privacy", "encryption", "browser", "robotics", "quantum", "battery", "developer",
+    ],
+    "sports": [
+        "cricket", "football", "match", "tournament", "goal", "wicket", "coach", "league",
+        "final", "stadium", "athlete", "championship", "transfer", "innings", "score",
+    ],
+    "business": [
+        "market", "stocks", "earnings", "inflation", "merger", "investors", "revenue", "bank",
+        "startup", "funding", "economy", "exports", "tariff", "profit", "shares",
+    ],
+    "general": [
+        "government", "election", "policy", "court", "weather", "monsoon", "city", "health",
+        "education", "minister", "parliament", "festival", "traffic", "hospital", "budget",
+    ],
+}
+SOURCES = ["Wire Daily", "Metro Times", "Tech Ledger", "Sports Desk", "Market Watcher", "City Herald"]
+FILLER = [
+    "the", "officials", "said", "on", "Monday", "after", "a", "report", "showed", "new", "plans",
+    "were", "announced", "amid", "growing", "interest", "while", "analysts", "expect", "further",
+    "changes", "later", "this", "year", "according", "to", "people", "familiar", "with", "matter",
+]
+
+
+def _sentence(rng: random.Random, topic_words: List[str]) -> str:
+    words = [rng.choice(topic_words) if rng.random() < 0.35 else rng.choice(FILLER) for _ in range(rng.randint(8, 22))]
+    return " ".join(words).capitalize() + "."
+
+
+def generate_articles(count: int, seed: int = 7, paragraphs: int = 6) -> List[ArticleCreate]:
+    """Build ``count`` articles spread over categories, sources and the last 30 days."""
+    rng = random.Random(seed)
+    now = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    categories = sorted(TOPICS)
+    articles: List[ArticleCreate] = []
+    for index in range(count):
+        category = categories[index % len(categories)]
+        topic_words = TOPICS[category]
+        headline_terms = rng.sample(topic_words, 3)
+        body = "\n\n".join(
+            " ".join(_sentence(rng, topic_words) for _ in range(rng.randint(3, 6))) for _ in range(paragraphs)
+        )
+        articles.append(
+            ArticleCreate(
+                title=f"{' '.join(headline_terms).title()} update {index}",
+                source=rng.choice(SOURCES),
+                url=f"https://bench.example.com/{category}/{index}",
+                published_at=now - timedelta(minutes=rng.randint(0, 30 * 24 * 60)),
+                category=category,
+                content=body,
+            )
+        )
+    return articles
+
+
+def generate_questions(count: int, seed: int = 11) -> List[Dict]:
+    """Questions drawn from the same vocabulary, half of them with a category filter."""
+    rng = random.Random(seed)
+    categories = sorted(TOPICS)
+    questions = []
+    for index in range(count):
+        category = categories[index % len(categories)]
+        terms = rng.sample(TOPICS[category], 2)
+        questions.append(
+            {
+                "question": f"What is the latest on {terms[0]} and {terms[1]}?",
+                "filters": {"category": category} if index % 2 == 0 else None,
+            }
+        )
+    return questions
@@ -0,0 +1,52 @@
+import time
+from typing import Generator, List
+
+from app.services.embeddings import HashingEmbeddingProvider
+
+
+class FakeLLMClient:
+    """
+    Drop-in stand-in for ``LLMClient`` with deterministic output and simulated latency.
+
+    ``embed_latency`` is charged once per ``embed_texts`` call, ``first_token_latency``
+    before the first streamed token and ``token_latency`` before every later token;
+    non-streaming answers cost the same total time.
+    """
+
+    def __init__(
+        self,
+        dimensions: int = 256,
+        embed_latency: float = 0.0,
+        first_token_latency: float = 0.0,
+        token_latency: float = 0.0,
+        answer_tokens: int = 40,
+    ) -> None:
+        self.embedding_provider = HashingEmbeddingProvider(dimensions)
+        self.embedding_model = self.embedding_provider.model_name
+        self.embed_latency = embed_latency
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.answer_tokens = answer_tokens
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        if self.embed_latency:
+            time.sleep(self.embed_latency)
+        return self.embedding_provider.embed_texts(texts)
+
+    def _tokens(self, user_prompt: str) -> List[str]:
+        cited = max(1, user_prompt.count("Article ") // 2)
+        words = [f"word{index} " for index in range(self.answer_tokens)]
+        words[-1] = f"(Article {cited}). "
+        return words
+
+    def generate_response(self, system_prompt: str, user_prompt: str) -> str:
+        tokens = self._tokens(user_prompt)
+        time.sleep(self.first_token_latency + self.token_latency * (len(tokens) - 1))
+        return "".join(tokens)
+
+    def generate_response_stream(self, system_prompt: str, user_prompt: str) -> Generator[str, None, None]:
+        for index, token in enumerate(self._tokens(user_prompt)):
+            delay = self.first_token_latency if index == 0 else self.token_latency
+            if delay:
+                time.sleep(delay)
+            yield token
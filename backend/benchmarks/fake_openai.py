@@ -0,0 +1,147 @@
+"""Minimal OpenAI-compatible HTTP server used by tests and the SSE load test."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+
+class FakeOpenAIServer:
+    """
+    Serves ``/v1/embeddings`` and ``/v1/chat/completions`` (plain and streamed).
+
+    ``failures`` is a queue of ``(status, headers)`` responses returned before normal
+    handling resumes, which lets tests script 429s and 5xx errors.
+    """
+
+    def __init__(self, answer: str = "Fake answer", dimensions: int = 8, token_delay: float = 0.0) -> None:
+        self.answer = answer
+        self.dimensions = dimensions
+        self.token_delay = token_delay
+        self.failures: List[Tuple[int, Dict[str, str]]] = []
+        self.requests: List[Tuple[str, float]] = []
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def _next_failure(self) -> Optional[Tuple[int, Dict[str, str]]]:
+        with self._lock:
+            return self.failures.pop(0) if self.failures else None
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _send_json(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                with server._lock:
+                    server.requests.append((self.path, time.monotonic()))
+
+                failure = server._next_failure()
+                if failure:
+                    status, headers = failure
+                    self._send_json(status, {"error": {"message": "scripted failure", "type": "fake"}}, headers)
+                    return
+
+                if self.path.endswith("/embeddings"):
+                    inputs = payload.get("input") or []
+                    if isinstance(inputs, str):
+                        inputs = [inputs]
+                    data = [
+                        {"object": "embedding", "index": idx, "embedding": [float(len(text) % 7)] * server.dimensions}
+                        for idx, text in enumerate(inputs)
+                    ]
+                    self._send_json(
+                        200,
+                        {
+                            "object": "list",
+                            "data": data,
+                            "model": payload.get("model"),
+                            "usage": {"prompt_tokens": len(inputs), "total_tokens": len(inputs)},
+                        },
+                    )
+                elif self.path.endswith("/chat/completions"):
+                    if payload.get("stream"):
+                        self._stream_chat(payload)
+                    else:
+                        self._send_json(
+                            200,
+                            {
+                                "id": "chatcmpl-fake",
+                                "object": "chat.completion",
+                                "created": int(time.time()),
+                                "model": payload.get("model"),
+                                "choices": [
+                                    {
+                                        "index": 0,
+                                        "message": {"role": "assistant", "content": server.answer},
+                                        "finish_reason": "stop",
+                                    }
+                                ],
+                                "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+                            },
+                        )
+                else:
+                    self._send_json(404, {"error": {"message": "not found"}})
+
+            def _stream_chat(self, payload: dict) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                for token in server.answer.split(" "):
+                    if server.token_delay:
+                        time.sleep(server.token_delay)
+                    chunk = {
+                        "id": "chatcmpl-fake",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": payload.get("model"),
+                        "choices": [{"index": 0, "delta": {"content": token + " "}, "finish_reason": None}],
+                    }
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+                self.close_connection = True
+
+        return Handler
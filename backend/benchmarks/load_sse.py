@@ -0,0 +1,247 @@
+"""
+Concurrent load test for the SSE chat endpoint.
+
+    python -m benchmarks.load_sse --concurrency 10,50,100,200
+    python -m benchmarks.load_sse --url http://localhost:8000 --server-pid 1234 --concurrency 50
+
+Without ``--url`` the harness seeds a synthetic corpus into throwaway storage, starts
+a stub OpenAI-compatible server and serves the app with uvicorn on a background
+thread of this process. With ``--url`` it targets an already running backend (start
+it with OPENAI_BASE_URL pointing at a stub if you do not want real LLM calls).
+
+For each concurrency level N, N streams to ``/api/query/stream`` are opened at once
+and the harness reports time to first event, inter-event latency, completion rate and
+the server's peak RSS and thread count (read from /proc, Linux only).
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def read_process_status(pid: int) -> Dict[str, int]:
+    """Resident memory (KiB) and thread count of ``pid`` from /proc; empty when unavailable."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as handle:
+            fields = dict(line.split(":", 1) for line in handle if ":" in line)
+    except OSError:
+        return {}
+    return {"rss_kib": int(fields["VmRSS"].split()[0]), "threads": int(fields["Threads"])}
+
+
+class ResourceSampler:
+    def __init__(self, pid: Optional[int], interval: float = 0.1) -> None:
+        self.pid = pid
+        self.interval = interval
+        self.peak_rss_kib = 0
+        self.peak_threads = 0
+
+    async def run(self, stop: asyncio.Event) -> None:
+        while self.pid and not stop.is_set():
+            status = read_process_status(self.pid)
+            self.peak_rss_kib = max(self.peak_rss_kib, status.get("rss_kib", 0))
+            self.peak_threads = max(self.peak_threads, status.get("threads", 0))
+            try:
+                await asyncio.wait_for(stop.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def run_stream(client: httpx.AsyncClient, url: str, question: str) -> Dict:
+    result: Dict = {"first_event": None, "gaps": [], "completed": False, "error": None, "duration": None}
+    started = time.perf_counter()
+    last = None
+    try:
+        async with client.stream("POST", url, json={"question": question}) as response:
+            if response.status_code != 200:
+                result["error"] = f"HTTP {response.status_code}"
+                return result
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                now = time.perf_counter()
+                if last is None:
+                    result["first_event"] = now - started
+                else:
+                    result["gaps"].append(now - last)
+                last = now
+                payload = json.loads(line[5:])
+                if payload.get("type") == "error":
+                    result["error"] = payload.get("message")
+                elif payload.get("type") == "done":
+                    result["completed"] = True
+    except httpx.HTTPError as exc:
+        result["error"] = exc.__class__.__name__
+    result["duration"] = time.perf_counter() - started
+    return result
+
+
+async def run_stage(base_url: str, concurrency: int, server_pid: Optional[int], timeout: float) -> Dict:
+    from benchmarks.stats import summarize
+
+    url = f"{base_url.rstrip('/')}/api/query/stream"
+    limits = httpx.Limits(max_connections=concurrency + 10, max_keepalive_connections=concurrency + 10)
+    sampler = ResourceSampler(server_pid)
+    stop = asyncio.Event()
+    sampler_task = asyncio.create_task(sampler.run(stop))
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        started = time.perf_counter()
+        # Distinct questions so request coalescing does not collapse the load
+        results = await asyncio.gather(
+            *(run_stream(client, url, f"What happened with story {index} in cricket and markets?") for index in range(concurrency))
+        )
+        elapsed = time.perf_counter() - started
+    stop.set()
+    await sampler_task
+
+    completed = [item for item in results if item["completed"] and not item["error"]]
+    errors = sorted({item["error"] for item in results if item["error"]})
+    return {
+        "concurrency": concurrency,
+        "completion_rate": round(len(completed) / concurrency, 4),
+        "errors": errors,
+        "wall_s": round(elapsed, 3),
+        "time_to_first_event": summarize([item["first_event"] for item in results if item["first_event"] is not None]),
+        "inter_event": summarize([gap for item in results for gap in item["gaps"]]),
+        "stream_duration": summarize([item["duration"] for item in completed], elapsed),
+        "peak_rss_mib": round(sampler.peak_rss_kib / 1024, 1),
+        "peak_threads": sampler.peak_threads,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_local_stack(args: argparse.Namespace, workdir: str):
+    """Seed a corpus, start the stub LLM server and serve the app with uvicorn on a thread."""
+    from benchmarks.fake_openai import FakeOpenAIServer
+
+    stub = FakeOpenAIServer(
+        answer=" ".join(f"token{index}" for index in range(args.answer_tokens)) + " (Article 1).",
+        token_delay=args.token_latency_ms / 1000.0,
+    )
+    stub.start()
+    os.environ.update(
+        {
+            "DATABASE_URL": f"sqlite:///{workdir}/load.db",
+            "VECTOR_STORE_DIR": f"{workdir}/vector_store",
+            "OPENAI_API_KEY": "stub",
+            "OPENAI_BASE_URL": stub.base_url,
+            "EMBEDDING_BACKEND": "hash",
+            "OPENAI_MAX_CONCURRENCY": str(args.llm_concurrency),
+            "OPENAI_REQUESTS_PER_MINUTE": "0",
+            "OPENAI_TOKENS_PER_MINUTE": "0",
+        }
+    )
+
+    import logging
+
+    import uvicorn
+
+    from app.core.config import get_settings
+    from app.core.db import Base, SessionLocal, engine
+    from app.main import app
+    from app.services.embeddings import get_embedding_provider
+    from app.services.ingestion.pipeline import ingest_articles
+    from app.services.vector_store import VectorStore
+    from benchmarks.corpus import generate_articles
+
+    logging.getLogger().setLevel(logging.WARNING)
+    Base.metadata.create_all(bind=engine)
+    embedder = get_embedding_provider(get_settings())
+    session = SessionLocal()
+    try:
+        ingest_articles(
+            session, generate_articles(args.articles), VectorStore(embedding_model=embedder.model_name), embedder
+        )
+    finally:
+        session.close()
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="uvicorn", daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("uvicorn did not start within 30s")
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}", server, stub
+
+
+def format_report(stages: List[Dict]) -> str:
+    header = (
+        f"{'streams':>8}{'done %':>8}{'ttfe p50':>10}{'ttfe p95':>10}{'gap p95':>9}"
+        f"{'dur p95':>10}{'RSS MiB':>9}{'threads':>9}"
+    )
+    lines = [header, "-" * len(header)]
+    for stage in stages:
+        lines.append(
+            f"{stage['concurrency']:>8}{stage['completion_rate'] * 100:>8.1f}"
+            f"{stage['time_to_first_event']['p50_ms']:>10}{stage['time_to_first_event']['p95_ms']:>10}"
+            f"{stage['inter_event']['p95_ms']:>9}{stage['stream_duration']['p95_ms']:>10}"
+            f"{stage['peak_rss_mib']:>9}{stage['peak_threads']:>9}"
+        )
+        if stage["errors"]:
+            lines.append(f"{'':>8}errors: {', '.join(map(str, stage['errors']))}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="10,25,50,100", help="comma-separated ramp of concurrent streams")
+    parser.add_argument("--url", help="target an already running backend instead of starting one")
+    parser.add_argument("--server-pid", type=int, help="pid to sample memory/threads from when using --url")
+    parser.add_argument("--articles", type=int, default=200, help="synthetic articles to seed (local mode)")
+    parser.add_argument("--answer-tokens", type=int, default=60, help="tokens per stub answer (local mode)")
+    parser.add_argument("--token-latency-ms", type=float, default=20.0, help="stub delay per token (local mode)")
+    parser.add_argument("--llm-concurrency", type=int, default=512, help="OPENAI_MAX_CONCURRENCY for local mode")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-stream timeout in seconds")
+    parser.add_argument("--pause", type=float, default=1.0, help="seconds between ramp stages")
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args(argv)
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+
+    with tempfile.TemporaryDirectory(prefix="newsiq-load-") as workdir:
+        server = stub = None
+        if args.url:
+            base_url, pid = args.url, args.server_pid
+        else:
+            base_url, server, stub = start_local_stack(args, workdir)
+            pid = os.getpid()
+        stages = []
+        try:
+            for level in levels:
+                stages.append(asyncio.run(run_stage(base_url, level, pid, args.timeout)))
+                time.sleep(args.pause)
+        finally:
+            if server is not None:
+                server.should_exit = True
+            if stub is not None:
+                stub.stop()
+
+    print(format_report(stages))
+    if args.output:
+        Path(args.output).write_text(json.dumps({"target": base_url, "stages": stages}, indent=2), encoding="utf-8")
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+Offline retrieval evaluation: recall@k, MRR and latency per retriever variant.
+
+    python -m benchmarks.retrieval_eval --labels labels.jsonl --variants variants.json
+    python -m benchmarks.retrieval_eval --synthetic 300      # self-contained smoke run
+
+``labels`` is JSON or JSONL with one object per question::
+
+    {"question": "...", "relevant_ids": [12, 40], "filters": {"category": "sports"}}
+
+``variants`` is a JSON list; every key is optional::
+
+    [{"name": "baseline", "top_k": 8, "over_fetch": 2, "category_routing": true,
+      "fallback": true, "vector_store_dir": "./storage/vector_store"}]
+
+``over_fetch`` multiplies ``top_k`` for the candidate search (chunks are collapsed to
+articles afterwards), ``category_routing`` applies the category the question embedding is
+routed to (``category_centroids``, refreshed after ingestion) as a filter, ``fallback``
+retries unfiltered when routing returns fewer than ``top_k`` articles, and
+``vector_store_dir`` lets variants point at indexes built with different chunking or models.
+
+Question embeddings are computed once per model and kept in ``--embedding-cache``, so
+repeated runs are fully offline; use EMBEDDING_BACKEND=local or hash to avoid the
+network entirely.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+DEFAULT_VARIANT = {
+    "name": "default",
+    "top_k": 8,
+    "over_fetch": 2,
+    "category_routing": True,
+    "fallback": True,
+    "vector_store_dir": None,
+}
+
+
+class EmbeddingCache:
+    """JSON file of question embeddings keyed by model and text hash."""
+
+    def __init__(self, path: Optional[str]) -> None:
+        self.path = Path(path) if path else None
+        self.vectors: Dict[str, List[float]] = {}
+        if self.path and self.path.exists():
+            self.vectors = json.loads(self.path.read_text(encoding="utf-8"))
+        self.dirty = False
+
+    @staticmethod
+    def _key(model: str, text: str) -> str:
+        return hashlib.sha1(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def embed(self, provider, texts: Sequence[str]) -> List[List[float]]:
+        missing = [text for text in dict.fromkeys(texts) if self._key(provider.model_name, text) not in self.vectors]
+        if missing:
+            for text, vector in zip(missing, provider.embed_texts(list(missing))):
+                self.vectors[self._key(provider.model_name, text)] = vector
+            self.dirty = True
+        return [self.vectors[self._key(provider.model_name, text)] for text in texts]
+
+    def save(self) -> None:
+        if self.path and self.dirty:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.vectors), encoding="utf-8")
+
+
+def load_labels(path: str) -> List[Dict]:
+    text = Path(path).read_text(encoding="utf-8").strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def rank_articles(records: List[Dict]) -> List[int]:
+    """Collapse chunk hits to article ids, keeping the rank of each article's best chunk."""
+    return list(dict.fromkeys(record["article_id"] for record in records))
+
+
+def retrieve(store, router, embedding: List[float], question: str, filters: Dict, variant: Dict) -> List[int]:
+    top_k = variant["top_k"]
+    search_top_k = top_k * max(1, variant["over_fetch"])
+    category = filters.get("category")
+    if not category and variant["category_routing"]:
+        category = router(embedding)
+    records = store.similarity_search(embedding, top_k=search_top_k, category=category)
+    ranked = rank_articles(records)
+    if category and not filters.get("category") and variant["fallback"] and len(ranked) < top_k:
+        ranked = list(dict.fromkeys(ranked + rank_articles(store.similarity_search(embedding, top_k=search_top_k))))
+    return ranked[:top_k]
+
+
+def evaluate(labels: List[Dict], variants: List[Dict], provider, cache: EmbeddingCache, settings) -> List[Dict]:
+    """Each variant's store is opened with ``settings``, its ``vector_store_dir`` overriding the default."""
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.db import build_engine
+    from app.services.category_router import CategoryRouter
+    from app.services.vector_store import VectorStore
+    from benchmarks.stats import summarize
+
+    embeddings = cache.embed(provider, [item["question"] for item in labels])
+    cache.save()
+    engine = build_engine(settings.database_url, settings)
+    session = sessionmaker(bind=engine)()
+    category_router = CategoryRouter(
+        provider.model_name,
+        temperature=settings.category_router_temperature,
+        min_probability=settings.category_router_min_probability,
+    )
+
+    def router(embedding: List[float]) -> Optional[str]:
+        return category_router.route(session, embedding)
+
+    stores: Dict[Optional[str], VectorStore] = {}
+    report = []
+    for raw in variants:
+        variant = {**DEFAULT_VARIANT, **raw}
+        directory = variant["vector_store_dir"]
+        if directory not in stores:
+            store_settings = settings.model_copy(update={"vector_store_dir": directory}) if directory else settings
+            stores[directory] = VectorStore(embedding_model=provider.model_name, settings=store_settings)
+        store = stores[directory]
+
+        hits, reciprocal_ranks, latencies = [], [], []
+        for item, embedding in zip(labels, embeddings):
+            relevant = set(item["relevant_ids"])
+            started = time.perf_counter()
+            ranked = retrieve(store, router, embedding, item["question"], item.get("filters") or {}, variant)
+            latencies.append(time.perf_counter() - started)
+            hits.append(len(relevant.intersection(ranked)) / len(relevant) if relevant else 0.0)
+            rank = next((position for position, article_id in enumerate(ranked, start=1) if article_id in relevant), None)
+            reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+
+        report.append(
+            {
+                "variant": variant,
+                f"recall@{variant['top_k']}": round(sum(hits) / len(hits), 4),
+                "mrr": round(sum(reciprocal_ranks) / len(reciprocal_ranks), 4),
+                "latency": summarize(latencies),
+            }
+        )
+    session.close()
+    engine.dispose()
+    return report
+
+
+def synthetic_labels(count: int, settings) -> List[Dict]:
+    """Seed a synthetic corpus into the database and store of ``settings``; each article's title asks for it."""
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.db import Base, build_engine
+    from app.models.article import Article
+    from app.services.category_router import refresh_category_centroids
+    from app.services.embeddings import HashingEmbeddingProvider
+    from app.services.ingestion.pipeline import ingest_articles
+    from app.services.vector_store import VectorStore
+    from benchmarks.corpus import generate_articles
+
+    engine = build_engine(settings.database_url, settings)
+    Base.metadata.create_all(bind=engine)
+    provider = HashingEmbeddingProvider(settings.hash_embedding_dimensions)
+    session = sessionmaker(bind=engine)()
+    try:
+        store = VectorStore(embedding_model=provider.model_name, settings=settings)
+        ingest_articles(session, generate_articles(count), store, provider)
+        refresh_category_centroids(session, settings)
+        return [
+            {"question": f"{article.title} {article.content.split('.')[0]}", "relevant_ids": [article.id]}
+            for article in session.query(Article).order_by(Article.id).all()
+        ]
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def format_report(report: List[Dict]) -> str:
+    header = f"{'variant':<24}{'recall':>10}{'MRR':>8}{'p50 ms':>9}{'p95 ms':>9}"
+    lines = [header, "-" * len(header)]
+    for row in report:
+        recall_key = next(key for key in row if key.startswith("recall@"))
+        lines.append(
+            f"{row['variant']['name']:<24}{row[recall_key]:>10}{row['mrr']:>8}"
+            f"{row['latency']['p50_ms']:>9}{row['latency']['p95_ms']:>9}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--labels", help="labeled questions (JSON or JSONL)")
+    parser.add_argument("--variants", help="JSON list of retriever variants (default: one default variant)")
+    parser.add_argument("--synthetic", type=int, help="evaluate against a synthetic corpus of this many articles")
+    parser.add_argument("--embedding-cache", default="./storage/eval_embeddings.json")
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args(argv)
+    if not args.labels and not args.synthetic:
+        parser.error("pass --labels or --synthetic")
+
+    variants = json.loads(Path(args.variants).read_text(encoding="utf-8")) if args.variants else [DEFAULT_VARIANT]
+    from app.core.config import get_settings
+    from app.services.embeddings import get_embedding_provider
+
+    settings = get_settings()
+    with tempfile.TemporaryDirectory(prefix="newsiq-eval-") as workdir:
+        if args.synthetic:
+            settings = settings.model_copy(
+                update={
+                    "database_url": f"sqlite:///{workdir}/eval.db",
+                    "vector_store_dir": f"{workdir}/vector_store",
+                    "embedding_backend": "hash",
+                }
+            )
+            args.embedding_cache = None
+
+        logging.basicConfig(level=logging.WARNING)
+        labels = synthetic_labels(args.synthetic, settings) if args.synthetic else load_labels(args.labels)
+        provider = get_embedding_provider(settings)
+        if provider is None:
+            parser.error("no embedding backend available; set EMBEDDING_BACKEND or OPENAI_API_KEY")
+        report = evaluate(labels, variants, provider, EmbeddingCache(args.embedding_cache), settings)
+
+    print(format_report(report))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+End-to-end benchmark against a synthetic corpus and a fake LLM.
+
+    python -m benchmarks.run --articles 1000 --requests 200 --output bench.json
+    python -m benchmarks.run --compare bench.json     # exit code 1 on regression
+
+Runs from the ``backend`` directory. A throwaway SQLite database and Chroma
+directory are created in a temp dir, so the real data is never touched.
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def configure_environment(workdir: str) -> None:
+    """Point settings at throwaway storage. Must run before any ``app`` module is imported."""
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    os.environ["VECTOR_STORE_DIR"] = f"{workdir}/vector_store"
+    os.environ["OPENAI_API_KEY"] = ""
+    os.environ["EMBEDDING_BACKEND"] = "hash"
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(operation: Callable[[int], object], iterations: int) -> Dict[str, float]:
+    from benchmarks.stats import summarize
+
+    latencies: List[float] = []
+    started = time.perf_counter()
+    for index in range(iterations):
+        op_started = time.perf_counter()
+        operation(index)
+        latencies.append(time.perf_counter() - op_started)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def run_benchmarks(args: argparse.Namespace) -> Dict:
+    from fastapi.testclient import TestClient
+
+    from app.core.db import Base, SessionLocal, engine
+    from app.main import app
+    from app.services.ingestion.pipeline import ingest_articles
+    from app.services.container import get_service_container
+    from app.services.rag_service import RAGService
+    from app.services.vector_store import VectorStore
+    from benchmarks.corpus import generate_articles, generate_questions
+    from benchmarks.fake_llm import FakeLLMClient
+    from benchmarks.stats import summarize
+
+    # app.main configures INFO logging; per-request log lines would dominate the timings
+    logging.getLogger().setLevel(logging.WARNING)
+    llm = FakeLLMClient(
+        dimensions=args.dimensions,
+        embed_latency=args.embed_latency_ms / 1000.0,
+        first_token_latency=args.first_token_latency_ms / 1000.0,
+        token_latency=args.token_latency_ms / 1000.0,
+        answer_tokens=args.answer_tokens,
+    )
+    Base.metadata.create_all(bind=engine)
+    vector_store = VectorStore(embedding_model=llm.embedding_model)
+    articles = generate_articles(args.articles, seed=args.seed)
+    questions = generate_questions(args.requests, seed=args.seed)
+    results: Dict[str, Dict[str, float]] = {}
+
+    session = SessionLocal()
+    try:
+        results["ingest_article"] = measure(
+            lambda index: ingest_articles(session, [articles[index]], vector_store, llm.embedding_provider, source="benchmark"),
+            len(articles),
+        )
+    finally:
+        session.close()
+
+    embeddings = llm.embedding_provider.embed_texts([item["question"] for item in questions])
+    categories = [(item["filters"] or {}).get("category") for item in questions]
+    results["vector_search"] = measure(
+        lambda index: vector_store.similarity_search(embeddings[index], top_k=8), len(questions)
+    )
+    results["vector_search_filtered"] = measure(
+        lambda index: vector_store.similarity_search(embeddings[index], top_k=8, category=categories[index] or "general"),
+        len(questions),
+    )
+
+    with TestClient(app) as client:
+        get_service_container().set_rag_service(RAGService(llm, vector_store, coalesce=False))
+        search_terms = ["cricket", "market", "chip", "election", "nonexistentterm"]
+        last_page = max(1, args.articles // 20)
+        results["list_news_first_page"] = measure(lambda index: client.get("/api/news"), args.requests)
+        results["list_news_category"] = measure(
+            lambda index: client.get("/api/news", params={"category": categories[index] or "sports"}), args.requests
+        )
+        results["list_news_search"] = measure(
+            lambda index: client.get("/api/news", params={"q": search_terms[index % len(search_terms)]}),
+            args.requests,
+        )
+        results["list_news_deep_page"] = measure(
+            lambda index: client.get("/api/news", params={"page": last_page - index % 5}), args.requests
+        )
+        results["query"] = measure(lambda index: client.post("/api/query", json=questions[index]), len(questions))
+
+        first_event: List[float] = []
+
+        def stream(index: int) -> None:
+            started = time.perf_counter()
+            with client.stream("POST", "/api/query/stream", json=questions[index]) as response:
+                for line in response.iter_lines():
+                    if line.startswith("data:") and len(first_event) <= index:
+                        first_event.append(time.perf_counter() - started)
+
+        results["query_stream"] = measure(stream, len(questions))
+        results["query_stream_first_event"] = summarize(first_event)
+
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=500, help="synthetic articles to ingest")
+    parser.add_argument("--requests", type=int, default=100, help="requests per read/query scenario")
+    parser.add_argument("--dimensions", type=int, default=256, help="fake embedding dimensions")
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0)
+    parser.add_argument("--first-token-latency-ms", type=float, default=0.0)
+    parser.add_argument("--token-latency-ms", type=float, default=0.0)
+    parser.add_argument("--answer-tokens", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative regression")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="newsiq-bench-") as workdir:
+        configure_environment(workdir)
+        results = run_benchmarks(args)
+
+    from benchmarks.stats import compare, format_table, load_report
+
+    report = {
+        "revision": git_revision(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "results": results,
+    }
+    print(format_table(results))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nReport written to {args.output}")
+    if args.compare:
+        regressions = compare(results, load_report(args.compare)["results"], args.tolerance)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+API process startup time: importing ``app.main``, running the startup hooks and
+answering the first ``/health`` and ``/ready``.
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --runs 5 --top 15 --output startup.json
+
+Each run is a fresh interpreter, so nothing is cached in ``sys.modules``. ``--top`` lists
+the modules with the largest cumulative import time (from ``python -X importtime``) to
+show where the remaining startup cost goes.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+heavy = [name for name in ("chromadb", "openai", "httpx", "onnxruntime") if name in sys.modules]
+from fastapi.testclient import TestClient
+client = TestClient(app)
+client.__enter__()
+started_up = time.perf_counter()
+assert client.get("/health").status_code == 200
+health = time.perf_counter()
+# 503 while warming up; older builds without /ready answer 404
+while client.get("/ready").status_code == 503:
+    time.sleep(0.01)
+ready = time.perf_counter()
+client.__exit__(None, None, None)
+print(json.dumps({
+    "import": imported - started,
+    "startup": started_up - started,
+    "first_health": health - started,
+    "ready": ready - started,
+    "heavy_modules": heavy,
+}))
+"""
+
+
+def probe(env: Dict[str, str]) -> Dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def slowest_imports(env: Dict[str, str], top: int) -> List[Tuple[str, float]]:
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Only direct imports of app.main (one level of indentation), so nothing is counted twice
+        if name.startswith("   ") and not name.startswith("    "):
+            modules.append((name.strip(), int(cumulative) / 1e6))
+    return sorted(modules, key=lambda item: item[1], reverse=True)[:top]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes to start")
+    parser.add_argument("--top", type=int, default=10, help="slowest top-level imports to list")
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    from benchmarks.stats import summarize
+
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    runs = [probe(env) for _ in range(args.runs)]
+    results = {
+        stage: summarize([run[stage] for run in runs]) for stage in ("import", "startup", "first_health", "ready")
+    }
+    imports = slowest_imports(env, args.top)
+
+    header = f"{'stage':<14}{'p50 ms':>10}{'max ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for stage, stats in results.items():
+        print(f"{stage:<14}{stats['p50_ms']:>10}{stats['max_ms']:>10}")
+    print(f"\nHeavy modules loaded by importing app.main: {', '.join(runs[-1]['heavy_modules']) or 'none'}")
+    print("\nSlowest top-level imports of app.main:")
+    for name, seconds in imports:
+        print(f"  {name:<40}{seconds * 1000:>8.1f} ms")
+    if args.output:
+        report = {"runs": args.runs, "results": results, "imports": dict(imports)}
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+import json
+import math
+from typing import Dict, List, Optional, Sequence
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], elapsed: Optional[float] = None) -> Dict[str, float]:
+    """Latencies in seconds in, milliseconds out. Throughput is operations per second of wall time."""
+    values = sorted(latencies)
+    wall = elapsed if elapsed is not None else sum(values)
+    return {
+        "count": len(values),
+        "throughput_per_s": round(len(values) / wall, 2) if wall else 0.0,
+        "mean_ms": round(1000 * sum(values) / len(values), 3) if values else 0.0,
+        "p50_ms": round(1000 * percentile(values, 0.50), 3),
+        "p95_ms": round(1000 * percentile(values, 0.95), 3),
+        "p99_ms": round(1000 * percentile(values, 0.99), 3),
+        "max_ms": round(1000 * values[-1], 3) if values else 0.0,
+    }
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = 0.10) -> List[str]:
+    """
+    Describe scenarios whose p95 latency grew or throughput dropped by more than ``tolerance``.
+    Both arguments are the ``results`` mappings of two benchmark reports.
+    """
+    regressions: List[str] = []
+    for name, stats in current.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if previous.get("p95_ms") and stats["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {stats['p95_ms']}ms")
+        if previous.get("throughput_per_s") and stats["throughput_per_s"] < previous["throughput_per_s"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {previous['throughput_per_s']}/s -> {stats['throughput_per_s']}/s"
+            )
+    return regressions
+
+
+def format_table(results: Dict[str, Dict[str, float]]) -> str:
+    header = f"{'scenario':<28}{'count':>7}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    lines = [header, "-" * len(header)]
+    for name, stats in results.items():
+        lines.append(
+            f"{name:<28}{stats['count']:>7}{stats['throughput_per_s']:>10}"
+            f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}"
+        )
+    return "\n".join(lines)
+
+
+def load_report(path: str) -> Dict:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
@@ -0,0 +1,65 @@
+"""
+Migration script for related articles: creates ``article_vectors`` and fills it with the
+mean chunk embedding of every canonical article already in the vector store. Embeddings
+are read back from the index, so no embedding API calls are made. Articles that already
+have a vector are skipped, so the script can be re-run after an interruption.
+
+Usage:
+    python migrate_add_article_vectors.py
+    # or
+    python migrate_add_article_vectors.py --database-url sqlite:///path/to/news_iq.db
+"""
+import argparse
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import Base, build_engine, settings
+from app.models.article import Article
+from app.models.article_vector import ArticleVector
+from app.services.related_articles import store_article_vector
+
+BATCH_SIZE = 200
+
+
+def migrate_database(database_url: str, vector_store=None) -> None:
+    print(f"Connecting to database: {database_url}")
+    engine = build_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    print("✓ Table 'article_vectors' is present.")
+
+    if vector_store is None:
+        from app.services.embeddings import get_embedding_provider
+        from app.services.vector_store import get_vector_store
+
+        embedder = get_embedding_provider(settings)
+        vector_store = get_vector_store(embedding_model=embedder.model_name if embedder else None)
+
+    session = sessionmaker(bind=engine)()
+    ids = [
+        row.id
+        for row in session.query(Article.id)
+        .outerjoin(ArticleVector, ArticleVector.article_id == Article.id)
+        .filter(Article.canonical_id.is_(None), ArticleVector.article_id.is_(None))
+        .order_by(Article.id)
+    ]
+    print(f"Computing vectors for {len(ids)} articles...")
+    stored = 0
+    try:
+        for start in range(0, len(ids), BATCH_SIZE):
+            embeddings = vector_store.article_embeddings(ids[start : start + BATCH_SIZE])
+            for article_id, chunks in embeddings.items():
+                store_article_vector(session, article_id, vector_store.embedding_model, chunks)
+            session.commit()
+            stored += len(embeddings)
+            print(f"  {min(start + BATCH_SIZE, len(ids))}/{len(ids)}")
+    finally:
+        session.close()
+    print(f"✓ Stored vectors for {stored} articles ({len(ids) - stored} have no indexed chunks).")
+    print("Migration complete.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute article vectors for related-article lookups.")
+    parser.add_argument("--database-url", default=settings.database_url)
+    args = parser.parse_args()
+    migrate_database(args.database_url)
@@ -0,0 +1,76 @@
+"""
+Migration script for near-duplicate detection: adds the ``minhash`` and ``canonical_id``
+columns to ``articles``, creates ``article_bands`` and fingerprints existing articles,
+oldest first, so the first copy of each story stays canonical.
+
+Usage:
+    python migrate_add_near_duplicates.py
+    # drop the chunks of articles that turn out to be duplicates from the vector store
+    python migrate_add_near_duplicates.py --prune-vectors
+    # or against another database
+    python migrate_add_near_duplicates.py --database-url sqlite:///path/to/news_iq.db
+"""
+import argparse
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import Base, build_engine, settings
+from app.models.article import Article
+from app.models.article_band import ArticleBand  # noqa: F401 - registers the table
+from app.services.ingestion.dedup import link_near_duplicate
+
+BATCH_SIZE = 200
+
+
+def migrate_database(database_url: str, prune_vectors: bool = False) -> None:
+    print(f"Connecting to database: {database_url}")
+    engine = build_engine(database_url)
+    columns = {column["name"] for column in inspect(engine).get_columns("articles")}
+    with engine.begin() as connection:
+        for name in ("minhash", "canonical_id"):
+            if name in columns:
+                print(f"✓ Column '{name}' already exists.")
+                continue
+            column_type = Article.__table__.c[name].type.compile(dialect=engine.dialect)
+            connection.execute(text(f"ALTER TABLE articles ADD COLUMN {name} {column_type}"))
+            print(f"✓ Added '{name}' column.")
+        connection.execute(text("CREATE INDEX IF NOT EXISTS ix_articles_canonical_id ON articles (canonical_id)"))
+    Base.metadata.create_all(bind=engine)
+
+    session = sessionmaker(bind=engine)()
+    vector_store = None
+    if prune_vectors:
+        from app.services.vector_store import get_vector_store
+
+        vector_store = get_vector_store()
+    ids = [
+        row.id
+        for row in session.query(Article.id)
+        .filter(Article.minhash.is_(None))
+        .order_by(Article.published_at, Article.id)
+    ]
+    print(f"Fingerprinting {len(ids)} articles...")
+    duplicates = 0
+    try:
+        for start in range(0, len(ids), BATCH_SIZE):
+            articles = session.query(Article).filter(Article.id.in_(ids[start : start + BATCH_SIZE])).all()
+            for article in sorted(articles, key=lambda item: (item.published_at, item.id)):
+                if link_near_duplicate(session, article) is not None:
+                    duplicates += 1
+                    if vector_store is not None:
+                        vector_store.delete_article(article.id)
+            session.commit()
+            print(f"  {min(start + BATCH_SIZE, len(ids))}/{len(ids)}")
+    finally:
+        session.close()
+    print(f"✓ Linked {duplicates} near-duplicate articles to their canonical article.")
+    print("Migration complete.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add near-duplicate detection to an existing database.")
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--prune-vectors", action="store_true", help="delete duplicates' chunks from the vector store")
+    args = parser.parse_args()
+    migrate_database(args.database_url, prune_vectors=args.prune_vectors)
@@ -0,0 +1,61 @@
+"""
+Migration script for trending topics: creates ``topic_clusters`` and
+``topic_cluster_articles`` and clusters the articles published within
+``TRENDING_WINDOW_HOURS`` from their stored vectors (run ``migrate_add_article_vectors.py``
+first), oldest first, as ingestion would have. Already clustered articles are skipped,
+so the script can be re-run.
+
+Usage:
+    python migrate_add_topic_clusters.py
+    # or
+    python migrate_add_topic_clusters.py --database-url sqlite:///path/to/news_iq.db
+"""
+import argparse
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import Base, build_engine, settings
+from app.models.article import Article
+from app.models.article_vector import ArticleVector
+from app.services.trending import TopicClusterer
+
+
+def migrate_database(database_url: str) -> None:
+    print(f"Connecting to database: {database_url}")
+    engine = build_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    print("✓ Tables 'topic_clusters' and 'topic_cluster_articles' are present.")
+
+    session = sessionmaker(bind=engine)()
+    try:
+        clusterer = TopicClusterer(session)
+        canonical = (
+            session.query(Article.id, Article.category, Article.published_at, ArticleVector.model, ArticleVector.vector)
+            .join(ArticleVector, ArticleVector.article_id == Article.id)
+            .filter(Article.published_at >= clusterer.window_start)
+            .order_by(Article.published_at, Article.id)
+            .all()
+        )
+        clustered = sum(
+            clusterer.add_article(row.id, row.category, row.published_at, row.model, row.vector) is not None
+            for row in canonical
+        )
+        copies = (
+            session.query(Article.id, Article.canonical_id, Article.published_at)
+            .filter(Article.canonical_id.isnot(None), Article.published_at >= clusterer.window_start)
+            .order_by(Article.published_at, Article.id)
+            .all()
+        )
+        clustered += sum(clusterer.add_copy(row.id, row.canonical_id, row.published_at) is not None for row in copies)
+        session.commit()
+    finally:
+        session.close()
+    print(f"✓ Clustered {clustered} articles from the last {settings.trending_window_hours} hours.")
+    print("Migration complete.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cluster recent articles into trending topics.")
+    parser.add_argument("--database-url", default=settings.database_url)
+    args = parser.parse_args()
+    migrate_database(args.database_url)
@@ -0,0 +1,80 @@
+"""
+Migration script for compressed article content: adds the ``excerpt`` column to
+``articles``, fills it for existing rows and, on SQLite, rewrites every plain-text
+``content`` value in compressed form, then runs VACUUM so the file actually shrinks.
+On PostgreSQL content stays as text (TOAST already compresses it); only excerpts are
+filled. Rows are processed in id order in batches and already migrated rows are skipped,
+so the script can be re-run after an interruption.
+
+Usage:
+    python migrate_compress_content.py
+    # or
+    python migrate_compress_content.py --database-url sqlite:///path/to/news_iq.db
+"""
+import argparse
+import os
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import make_url
+
+from app.core.db import build_engine, settings
+from app.models.article import EXCERPT_LENGTH, Article
+from app.utils.compression import compress_text, decompress_text
+
+BATCH_SIZE = 500
+
+
+def migrate_database(database_url: str) -> None:
+    print(f"Connecting to database: {database_url}")
+    engine = build_engine(database_url)
+    sqlite = engine.dialect.name == "sqlite"
+    columns = {column["name"] for column in inspect(engine).get_columns("articles")}
+    if "excerpt" in columns:
+        print("✓ Column 'excerpt' already exists.")
+    else:
+        column_type = Article.__table__.c.excerpt.type.compile(dialect=engine.dialect)
+        with engine.begin() as connection:
+            connection.execute(text(f"ALTER TABLE articles ADD COLUMN excerpt {column_type}"))
+        print("✓ Added 'excerpt' column.")
+
+    path = make_url(database_url).database if sqlite else None
+    size_before = os.path.getsize(path) if path and os.path.exists(path) else None
+    # Plain-text content on SQLite, or a missing excerpt anywhere
+    pending = "excerpt IS NULL" + (" OR typeof(content) = 'text'" if sqlite else "")
+    last_id = migrated = 0
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                text(f"SELECT id, content FROM articles WHERE id > :last_id AND ({pending}) ORDER BY id LIMIT :limit"),
+                {"last_id": last_id, "limit": BATCH_SIZE},
+            ).all()
+            if not rows:
+                break
+            for row in rows:
+                # Raw SQL bypasses the column type: compressed values arrive as bytes
+                content = decompress_text(row.content)
+                stored = compress_text(content) if sqlite and isinstance(row.content, str) else row.content
+                connection.execute(
+                    text("UPDATE articles SET content = :content, excerpt = :excerpt WHERE id = :id"),
+                    {"id": row.id, "content": stored, "excerpt": content[:EXCERPT_LENGTH]},
+                )
+            last_id = rows[-1].id
+            migrated += len(rows)
+        print(f"  migrated {migrated} articles (up to id {last_id})")
+
+    if sqlite:
+        with engine.connect() as connection:
+            connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+            connection.execute(text("VACUUM"))
+            connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        if size_before is not None:
+            print(f"✓ Database size: {size_before / 1e6:.1f} MB -> {os.path.getsize(path) / 1e6:.1f} MB")
+    print(f"✓ Compressed content and filled excerpts for {migrated} articles.")
+    print("Migration complete.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compress article content and add excerpts.")
+    parser.add_argument("--database-url", default=settings.database_url)
+    args = parser.parse_args()
+    migrate_database(args.database_url)
@@ -0,0 +1,130 @@
+"""
+Migration script for the slim chunk schema. Rewrites the Chroma collection so each chunk
+keeps only article_id, chunk_index, its start/end offsets in the article content,
+category and a numeric published_ts; titles, sources, URLs, snippets and the chunk text
+itself are dropped, since they are read from the articles table at query time.
+
+Chunks are copied into a new collection which replaces the old one only when the copy is
+complete, so an interrupted run leaves the existing index untouched. Chunks whose text can
+no longer be found in their article (the article changed since it was embedded) are
+dropped; re-ingesting those articles embeds them again.
+
+Usage:
+    python migrate_slim_vector_metadata.py
+    # or
+    python migrate_slim_vector_metadata.py --vector-store-dir path/to/vector_store --database-url sqlite:///path/to/news_iq.db
+"""
+import argparse
+import re
+import sqlite3
+from pathlib import Path
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import build_engine, settings
+from app.models.article import Article
+from app.services.vector_store import active_collection_name, chunk_metadata
+
+BATCH_SIZE = 500
+
+
+def locate(content: str, document: str) -> Optional[Tuple[int, int]]:
+    """Span of ``document`` in ``content``, allowing whitespace to differ."""
+    start = content.find(document)
+    if start >= 0:
+        return start, start + len(document)
+    words = document.split()
+    if not words:
+        return None
+    match = re.search(r"\s+".join(re.escape(word) for word in words), content)
+    return (match.start(), match.end()) if match else None
+
+
+def directory_size(path: Path) -> int:
+    return sum(item.stat().st_size for item in path.rglob("*") if item.is_file())
+
+
+def migrate_collection(vector_store_dir: str, database_url: str, batch_size: int = BATCH_SIZE) -> None:
+    import chromadb
+
+    path = Path(vector_store_dir)
+    print(f"Vector store: {path}")
+    if not (path / "chroma.sqlite3").exists():
+        print("✗ No Chroma database found. Nothing to migrate.")
+        return
+    client = chromadb.PersistentClient(path=str(path))
+    name = active_collection_name(path)
+    names = {collection.name for collection in client.list_collections()}
+    if name not in names:
+        print(f"✗ Collection '{name}' not found. Nothing to migrate.")
+        return
+    old = client.get_collection(name)
+    total = old.count()
+    sample = old.get(limit=1, include=["metadatas"])["metadatas"]
+    if not total or ("start" in sample[0] and "title" not in sample[0]):
+        print("✓ Collection already uses the slim chunk schema. No migration needed.")
+        return
+
+    size_before = directory_size(path)
+    staging_name = f"{name}_slim"
+    if staging_name in names:
+        client.delete_collection(staging_name)  # left over from an interrupted run
+    staging = client.create_collection(staging_name, metadata=old.metadata or None)
+    session = sessionmaker(bind=build_engine(database_url))()
+    copied = dropped = 0
+    try:
+        for offset in range(0, total, batch_size):
+            batch = old.get(include=["embeddings", "documents", "metadatas"], limit=batch_size, offset=offset)
+            article_ids = {meta["article_id"] for meta in batch["metadatas"]}
+            articles = {
+                row.id: row
+                for row in session.query(Article.id, Article.content, Article.category, Article.published_at).filter(
+                    Article.id.in_(article_ids)
+                )
+            }
+            ids, embeddings, metadatas = [], [], []
+            for chunk_id, embedding, document, meta in zip(
+                batch["ids"], batch["embeddings"], batch["documents"], batch["metadatas"]
+            ):
+                article = articles.get(meta["article_id"])
+                span = locate(article.content, document or "") if article else None
+                if span is None:
+                    dropped += 1
+                    continue
+                ids.append(chunk_id)
+                embeddings.append(embedding)
+                metadatas.append(
+                    chunk_metadata(
+                        article.id,
+                        meta.get("chunk_index", 0),
+                        span,
+                        {"category": article.category, "published_at": article.published_at},
+                    )
+                )
+            if ids:
+                staging.add(ids=ids, embeddings=embeddings, metadatas=metadatas)
+            copied += len(ids)
+            print(f"  {min(offset + batch_size, total)}/{total}")
+    finally:
+        session.close()
+
+    client.delete_collection(name)
+    staging.modify(name=name)
+    connection = sqlite3.connect(path / "chroma.sqlite3")
+    try:
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+    print(f"✓ Copied {copied} chunks, dropped {dropped} that no longer match their article.")
+    print(f"✓ Vector store size: {size_before / 1e6:.1f} MB -> {directory_size(path) / 1e6:.1f} MB")
+    print("Migration complete.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rewrite the Chroma collection with the slim chunk schema.")
+    parser.add_argument("--vector-store-dir", default=settings.vector_store_dir)
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    migrate_collection(args.vector_store_dir, args.database_url, args.batch_size)
@@ -0,0 +1,27 @@
+"""
+Rebuild the vector index from the articles already in the database, without refetching
+them. Use it after changing the chunk size, the embedding model or the vector backend.
+
+The new index is built next to the active one, which keeps serving queries, and replaces
+it once complete. Progress is checkpointed after every batch; running the command again
+after an interruption resumes the rebuild.
+
+Usage:
+    python reindex.py
+    python reindex.py --workers 8 --batch-size 128
+    # discard the checkpoint and start over
+    python reindex.py --restart
+"""
+import argparse
+
+from app.services.ingestion.reindex import run_reindex
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, help="articles per embedding call (REINDEX_BATCH_SIZE)")
+    parser.add_argument("--workers", type=int, help="batches embedded in parallel (REINDEX_WORKERS)")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and rebuild from scratch")
+    args = parser.parse_args()
+    state = run_reindex(batch_size=args.batch_size, workers=args.workers, restart=args.restart)
+    print(f"✓ Indexed {state['articles']} articles ({state['chunks']} chunks) into '{state['index']}'")
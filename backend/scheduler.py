@@ -0,0 +1,5 @@
+from app.services.ingestion.scheduler import main
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import Base
+
+
+class RecordingVectorStore:
+    """Keeps each article's spans and embeddings in memory and records the category of every search."""
+
+    def __init__(self, embedding_model: str = "hash-64") -> None:
+        self.chunks = {}
+        self.embeddings = {}
+        self.categories = []
+        self.embedding_model = embedding_model
+
+    def add_chunks(self, article_id, spans, embeddings, metadata):
+        self.chunks[article_id] = spans
+        self.embeddings[article_id] = embeddings
+
+    def has_article(self, article_id):
+        return article_id in self.chunks
+
+    def delete_article(self, article_id):
+        self.chunks.pop(article_id, None)
+        self.embeddings.pop(article_id, None)
+
+    def article_embeddings(self, article_ids):
+        return {article_id: self.embeddings[article_id] for article_id in article_ids if article_id in self.embeddings}
+
+    def similarity_search(self, embedding, top_k, category=None, date_from=None, date_to=None):
+        self.categories.append(category)
+        return []
+
+
+@pytest.fixture
+def vector_store():
+    return RecordingVectorStore()
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    """A SQLite file database with every table, usable from the TestClient's threads."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'news.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    return sessionmaker(bind=db_engine)
+
+
+@pytest.fixture
+def session(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
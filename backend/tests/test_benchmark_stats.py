@@ -0,0 +1,22 @@
+from benchmarks.corpus import generate_articles
+from benchmarks.stats import compare, percentile, summarize
+
+
+def test_summary_reports_nearest_rank_percentiles_in_ms():
+    stats = summarize([i / 1000 for i in range(1, 101)], elapsed=1.0)
+    assert stats["count"] == 100
+    assert stats["throughput_per_s"] == 100.0
+    assert (stats["p50_ms"], stats["p95_ms"], stats["p99_ms"]) == (50.0, 95.0, 99.0)
+    assert percentile([], 0.5) == 0.0
+
+
+def test_compare_flags_only_changes_beyond_tolerance():
+    baseline = {"query": {"p95_ms": 100.0, "throughput_per_s": 50.0}}
+    assert compare({"query": {"p95_ms": 105.0, "throughput_per_s": 48.0}}, baseline) == []
+    regressions = compare({"query": {"p95_ms": 130.0, "throughput_per_s": 30.0}}, baseline)
+    assert len(regressions) == 2
+
+
+def test_synthetic_corpus_is_deterministic():
+    assert generate_articles(5, seed=3) == generate_articles(5, seed=3)
+    assert generate_articles(5, seed=3) != generate_articles(5, seed=4)
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+from app.models.article import Article
+from app.models.category_centroid import CategoryCentroid
+from app.services.category_router import CategoryRouter, refresh_category_centroids
+from app.services.embeddings import HashingEmbeddingProvider
+from app.services.rag_service import RAGService
+from app.services.related_articles import store_article_vector
+
+TEXTS = {
+    "technology": [
+        "The startup released a new AI model that writes software and runs on a smartphone chip.",
+        "Cloud software companies are adding AI assistants to their apps and chips to their data centres.",
+    ],
+    "sports": [
+        "The striker scored twice as the home side won the football derby in front of a record crowd.",
+        "A late goal settled the cup match and the coach praised the team's defence after the game.",
+    ],
+}
+
+
+def add_articles(session, embedder, texts, start=datetime(2024, 6, 1)):
+    for category, contents in texts.items():
+        for number, content in enumerate(contents):
+            article = Article(
+                title=content[:40],
+                source="Wire Daily",
+                url=f"https://a.example/{category}/{number}/{start:%s}",
+                published_at=start + timedelta(hours=number),
+                category=category,
+                content=content,
+            )
+            session.add(article)
+            session.flush()
+            store_article_vector(session, article.id, embedder.model_name, embedder.embed_texts([content]))
+    session.commit()
+
+
+def test_questions_are_routed_by_their_embedding(session, vector_store):
+    embedder = HashingEmbeddingProvider(dimensions=128)
+    add_articles(session, embedder, TEXTS)
+    assert refresh_category_centroids(session) == 2
+    assert {row.category: row.articles for row in session.query(CategoryCentroid)} == {"technology": 2, "sports": 2}
+
+    router = CategoryRouter(embedder.model_name, temperature=0.05, min_probability=0.6)
+    [ai_question, football_question] = embedder.embed_texts(
+        ["Which AI model runs on a smartphone?", "Who scored in the football derby?"]
+    )
+    probabilities = router.probabilities(session, ai_question)
+    assert list(probabilities) == ["technology", "sports"] and abs(sum(probabilities.values()) - 1) < 1e-3
+    assert router.route(session, ai_question) == "technology"
+    assert router.route(session, football_question) == "sports"
+    # Equally close to every centroid: no category is likely enough
+    assert router.route(session, [0.0] * 128) is None
+    # Centroids of another embedding model are never compared
+    assert CategoryRouter("other-model").probabilities(session, ai_question) == {}
+
+    # Refreshed centroids are picked up on the next call
+    add_articles(session, embedder, {"business": ["Shares of the bank rose after profits beat forecasts."] * 3})
+    refresh_category_centroids(session)
+    assert "business" in router.probabilities(session, ai_question)
+
+    class Embedder:
+        def embed_texts(self, texts):
+            return embedder.embed_texts(texts)
+
+    rag = RAGService(llm_client=Embedder(), vector_store=vector_store, coalesce=False, category_router=router)
+    list(rag.answer_question_stream("Who scored in the football derby?", session))
+    list(rag.answer_question_stream("Who scored in the football derby?", session, category="technology"))
+    # The routed category filters the search, then fewer than top_k results retry unfiltered
+    assert vector_store.categories == ["sports", None, "technology", None]
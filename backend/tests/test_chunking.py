@@ -0,0 +1,60 @@
+from app.utils.chunking import chunk_text, count_tokens
+
+
+def words(text: str) -> int:
+    return len(text.split())
+
+
+def test_chunks_respect_token_limit_and_sentence_boundaries():
+    sentences = [f"Sentence number {index} has exactly seven words." for index in range(40)]
+    text = " ".join(sentences)
+
+    chunks = chunk_text(text, max_tokens=30, overlap_tokens=0, counter=words)
+
+    assert all(words(chunk) <= 30 for chunk in chunks)
+    assert all(chunk.startswith("Sentence") and chunk.endswith("words.") for chunk in chunks)
+    assert " ".join(chunks) == text
+
+
+def test_overlap_repeats_whole_trailing_sentences_within_a_paragraph_only():
+    first = "Alpha one two three. Beta one two three. Gamma one two three."
+    second = "Delta one two three. Epsilon one two three."
+    chunks = chunk_text(f"{first}\n\n{second}", max_tokens=8, overlap_tokens=4, counter=words)
+
+    assert chunks == [
+        "Alpha one two three. Beta one two three.",
+        "Beta one two three. Gamma one two three.",
+        "Delta one two three. Epsilon one two three.",
+    ]
+
+
+def test_abbreviations_and_oversized_sentences():
+    text = "The U.S. economy grew. Then " + " ".join(["word"] * 24) + "."
+    chunks = chunk_text(text, max_tokens=10, overlap_tokens=3, counter=words)
+
+    assert chunks[0] == "The U.S. economy grew."
+    assert all(words(chunk) <= 10 for chunk in chunks)
+    assert sum(words(chunk) for chunk in chunks[1:]) == 25
+    assert chunk_text("", 10, 2) == []
+    assert count_tokens("Hello, world!") >= 3
+
+
+def test_words_over_the_limit_are_split_within_the_word():
+    url = "https://example.com/" + "x" * 60
+    text = f"See {url} for details and more."
+
+    chunks = chunk_text(text, max_tokens=12, overlap_tokens=2, counter=len)
+
+    assert all(len(chunk) <= 12 for chunk in chunks)
+    assert "".join(chunks).replace(" ", "") == text.replace(" ", "")
+
+
+def test_pieces_are_recounted_once_joined():
+    # Words count one token each, but a space between two costs another
+    def spaced(text):
+        return len(text.split()) + text.count(" ")
+
+    chunks = chunk_text(" ".join(["word"] * 12), max_tokens=5, overlap_tokens=0, counter=spaced)
+
+    assert all(spaced(chunk) <= 5 for chunk in chunks)
+    assert sum(len(chunk.split()) for chunk in chunks) == 12
@@ -0,0 +1,150 @@
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.db import Base
+from app.models.article import Article
+from app.services.coalescing import SingleFlight, StreamFanout, normalize_question, question_key
+from app.services.rag_service import RAGService
+
+
+def test_question_key_ignores_case_whitespace_and_trailing_punctuation():
+    assert normalize_question("  What's   new in TECH?? ") == "what's new in tech"
+    assert question_key("Latest sports?", category="sports") == question_key("latest  sports", category="sports")
+    assert question_key("Latest sports?", category="sports") != question_key("Latest sports?")
+
+
+def test_single_flight_runs_identical_calls_once():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+    results = []
+
+    def work():
+        calls.append(1)
+        release.wait(2)
+        return "answer"
+
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", work))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert {result for result, _ in results} == {"answer"}
+
+
+def test_stream_fanout_shares_one_upstream_generator():
+    fanout = StreamFanout()
+    started = []
+
+    def upstream():
+        started.append(1)
+        for token in ["a", "ab", "abc"]:
+            time.sleep(0.05)
+            yield token
+
+    first, first_shared = fanout.subscribe("q", upstream)
+    second, second_shared = fanout.subscribe("q", upstream)
+    collected = {}
+    threads = [
+        threading.Thread(target=lambda name=name, stream=stream: collected.update({name: list(stream)}))
+        for name, stream in (("first", first), ("second", second))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(2)
+
+    assert (first_shared, second_shared) == (False, True)
+    assert len(started) == 1
+    assert collected["first"] == collected["second"] == ["a", "ab", "abc"]
+
+    # Once the flight completed a new subscriber triggers a fresh generation
+    third, third_shared = fanout.subscribe("q", upstream)
+    assert list(third) == ["a", "ab", "abc"] and not third_shared
+    assert len(started) == 2
+
+
+def test_subscribers_that_never_iterate_do_not_keep_the_producer_running():
+    fanout = StreamFanout()
+    permits, closed = threading.Semaphore(0), threading.Event()
+    produced = []
+
+    def upstream():
+        try:
+            for token in range(100):
+                permits.acquire()
+                produced.append(token)
+                yield token
+        finally:
+            closed.set()
+
+    leader, _ = fanout.subscribe("q", upstream)
+    follower, _ = fanout.subscribe("q", upstream)
+    try:
+        # The follower disconnects before its first iteration
+        follower.close()
+        permits.release()
+        assert next(leader) == 0
+        leader.close()
+        # Nobody is left: the producer stops after the item it is working on
+        permits.release()
+        assert closed.wait(5)
+        assert produced == [0, 1]
+    finally:
+        permits.release(100)
+
+
+def test_shared_stream_is_produced_with_its_own_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'news.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    opened = []
+
+    class RecordingSession(Session):
+        def close(self):
+            opened.append((self, threading.current_thread().name))
+            super().close()
+
+    Sessions = sessionmaker(bind=engine, class_=RecordingSession)
+    session = Sessions()
+    session.add(
+        Article(
+            title="Chip news",
+            source="Wire Daily",
+            url="https://a.example/1",
+            published_at=datetime(2024, 6, 1),
+            category="technology",
+            content="The chip maker announced a faster processor.",
+        )
+    )
+    session.commit()
+    used = []
+
+    class LLM:
+        def embed_texts(self, texts):
+            return [[1.0] for _ in texts]
+
+        def generate_response_stream(self, system_prompt, user_prompt):
+            yield "Answer (Article 1)"
+
+    class Store:
+        def similarity_search(self, embedding, top_k, category=None, date_from=None, date_to=None, **kwargs):
+            used.append(threading.current_thread().name)
+            return [{"article_id": 1, "start": 0, "end": 20}]
+
+    rag = RAGService(llm_client=LLM(), vector_store=Store(), digests=False, session_factory=Sessions)
+    events = list(rag.answer_question_stream("What did the chip maker announce?", session))
+    assert events[-1][1][0]["title"] == "Chip news"
+    # The request's session is left to the request; the producer thread closed the one it opened
+    assert used == ["stream-fanout"]
+    assert [(item is session, thread) for item, thread in opened] == [(False, "stream-fanout")]
+    session.close()
+    engine.dispose()
@@ -0,0 +1,82 @@
+from app.utils.content_extraction import extract_content, extract_content_stream
+
+PAGE = """
+<html><head><title>Fallback title</title>
+<meta property="og:title" content="Rain delays the final">
+<meta property="og:image" content="https://img.example.com/final.jpg">
+<script>var x = "Do not index this script text at all please";</script>
+<style>.a { color: red; }</style></head>
+<body>
+<nav><a href="/">Home</a> <a href="/sports">Sports</a></nav>
+<div class="cookie-consent">We use cookies to give you the best possible experience on this site.</div>
+<article>
+  <h1>Rain delays the final</h1>
+  <p>Heavy rain forced officials to delay the cricket final by three hours on Sunday evening.</p>
+  <p>The match resumed after the covers came off &amp; the crowd returned to the stadium.</p>
+  <ul class="related-stories"><li><a href="/1">Another story with a long headline here</a></li></ul>
+</article>
+<footer><p>Copyright 2024 Example News. All rights reserved by the publisher.</p></footer>
+</body></html>
+"""
+
+
+def test_extracts_article_body_and_metadata():
+    result = extract_content(PAGE)
+
+    assert result.text.split("\n\n") == [
+        "Rain delays the final",
+        "Heavy rain forced officials to delay the cricket final by three hours on Sunday evening.",
+        "The match resumed after the covers came off & the crowd returned to the stadium.",
+    ]
+    assert result.title == "Rain delays the final"
+    assert result.image_url == "https://img.example.com/final.jpg"
+
+
+def test_fragments_keep_all_visible_text():
+    result = extract_content('Short <b>summary</b> <img src="https://img.example.com/a.png">')
+    assert result.text == "Short summary"
+    assert result.image_url == "https://img.example.com/a.png"
+    assert extract_content("").text == ""
+
+
+def test_streaming_matches_whole_document_and_respects_byte_cap():
+    data = PAGE.encode("utf-8")
+    pieces = [data[index : index + 7] for index in range(0, len(data), 7)]
+
+    assert extract_content_stream(pieces).text == extract_content(PAGE).text
+    assert "Heavy rain" not in extract_content_stream(pieces, max_bytes=64).text
+
+
+def test_boilerplate_classes_match_whole_tokens_only():
+    page = """
+    <article>
+      <header class="story-header"><h1>Parliament passes the budget</h1></header>
+      <div class="article-related-body"><p>The budget was approved by a wide margin late on Tuesday night.</p></div>
+      <div class="commentary"><p>Analysts said the spending plans would be difficult to deliver in full.</p></div>
+      <div class="post-comments"><p>Reader comment: this budget is a disgrace to everyone involved here.</p></div>
+      <div class="share-tools">Share this story with your friends on every social network.</div>
+    </article>
+    """
+    assert extract_content(page).text.split("\n\n") == [
+        "Parliament passes the budget",
+        "The budget was approved by a wide margin late on Tuesday night.",
+        "Analysts said the spending plans would be difficult to deliver in full.",
+    ]
+
+
+def test_skipped_elements_with_omitted_end_tags_end_where_html_closes_them():
+    page = """
+    <article>
+      <p class="share-line">Share this story on your favourite social network right now
+      <p>Officials confirmed the bridge will reopen to traffic next week after repairs.
+      <ul><li class="related"><ul><li>Nested related link text that should stay hidden</ul>
+        <li>The repairs cost more than expected because of extra corrosion found under the deck.</ul>
+      <div class="newsletter-signup"><p>Sign up for our newsletter to get stories every morning.
+    </article>
+    <main><p>Each skipped element ended inside the article, so the rest of the page is still read.</p></main>
+    """
+    assert extract_content(page).text.split("\n\n") == [
+        "Officials confirmed the bridge will reopen to traffic next week after repairs.",
+        "The repairs cost more than expected because of extra corrosion found under the deck.",
+        "Each skipped element ended inside the article, so the rest of the page is still read.",
+    ]
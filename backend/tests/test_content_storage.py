@@ -0,0 +1,100 @@
+import sqlite3
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import Base, get_read_db
+from app.main import app
+from app.models.article import EXCERPT_LENGTH, Article
+from app.utils.compression import compress_text, decompress_text
+
+CONTENT = "Officials said on Monday that inflation eased for a third month. " * 40
+
+
+def test_content_is_compressed_on_disk_and_read_back_as_text(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'news.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    session.add(
+        Article(
+            title="Prices cool",
+            source="Wire Daily",
+            url="https://a.example/1",
+            published_at=datetime(2024, 6, 1),
+            category="business",
+            content=CONTENT,
+        )
+    )
+    session.commit()
+    session.close()
+
+    with engine.connect() as connection:
+        stored, excerpt = connection.execute(text("SELECT content, excerpt FROM articles")).one()
+    assert isinstance(stored, bytes) and len(stored) < len(CONTENT) / 5
+    assert decompress_text(stored) == CONTENT
+    assert excerpt == CONTENT[:EXCERPT_LENGTH]
+
+    def override_get_read_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    try:
+        client = TestClient(app)
+        item = client.get("/api/news").json()["items"][0]
+        assert item["excerpt"] == CONTENT[:EXCERPT_LENGTH] and item["content"] is None
+        assert client.get("/api/news", params={"include_content": True}).json()["items"][0]["content"] == CONTENT
+        # Substring search still sees the decompressed text
+        assert client.get("/api/news", params={"q": "third MONTH"}).json()["total"] == 1
+        assert client.get("/api/news", params={"q": "deflation"}).json()["total"] == 0
+        assert client.get(f"/api/news/{item['id']}").json()["content"] == CONTENT
+        # A row without an excerpt (not migrated, or a bulk update) is listed with an empty one
+        with engine.begin() as connection:
+            connection.execute(text("UPDATE articles SET excerpt = NULL"))
+        response = client.get("/api/news")
+        assert response.status_code == 200 and response.json()["items"][0]["excerpt"] == ""
+    finally:
+        app.dependency_overrides.pop(get_read_db, None)
+    engine.dispose()
+
+
+def test_migration_compresses_existing_rows(tmp_path):
+    from migrate_compress_content import migrate_database
+
+    path = tmp_path / "old.db"
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE articles (id INTEGER PRIMARY KEY, title VARCHAR(512) NOT NULL, source VARCHAR(128) NOT NULL, "
+        "url VARCHAR(512) NOT NULL UNIQUE, published_at DATETIME NOT NULL, category VARCHAR(64) NOT NULL, "
+        "content TEXT NOT NULL, image_url VARCHAR(512), created_at DATETIME NOT NULL, minhash BLOB, "
+        "canonical_id INTEGER)"
+    )
+    for row_id in (1, 2):
+        connection.execute(
+            "INSERT INTO articles (id, title, source, url, published_at, category, content, created_at) "
+            "VALUES (?, 'Title', 'A', ?, '2024-06-01 00:00:00', 'business', ?, '2024-06-01 00:00:00')",
+            (row_id, f"https://a.example/{row_id}", f"{row_id} {CONTENT}"),
+        )
+    connection.commit()
+    connection.close()
+
+    migrate_database(f"sqlite:///{path}")
+    migrate_database(f"sqlite:///{path}")  # idempotent
+
+    connection = sqlite3.connect(path)
+    rows = connection.execute("SELECT id, content, excerpt FROM articles ORDER BY id").fetchall()
+    connection.close()
+    for row_id, stored, excerpt in rows:
+        assert stored == compress_text(f"{row_id} {CONTENT}")
+        assert excerpt == f"{row_id} {CONTENT}"[:EXCERPT_LENGTH]
+    engine = create_engine(f"sqlite:///{path}")
+    session = sessionmaker(bind=engine)()
+    assert session.get(Article, 2).content == f"2 {CONTENT}"
+    session.close()
+    engine.dispose()
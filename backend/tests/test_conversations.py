@@ -0,0 +1,195 @@
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+from app.models.article import Article
+from app.services import conversations
+from app.services.conversations import Conversation, ConversationStore, referenced_articles
+from app.services.embeddings import HashingEmbeddingProvider
+from app.services.rag_service import RAGService
+
+CONTENTS = [
+    "The chip maker announced a faster processor for laptops and phones.",
+    "The football club signed a new striker before the derby.",
+    "The central bank kept interest rates unchanged this month.",
+]
+
+
+class CountingLLM:
+    def __init__(self) -> None:
+        self.embedder = HashingEmbeddingProvider(dimensions=64)
+        self.embedded = []
+        self.prompts = []
+
+    def embed_texts(self, texts):
+        self.embedded.extend(texts)
+        return self.embedder.embed_texts(texts)
+
+    def generate_response(self, system_prompt, user_prompt):
+        self.prompts.append(user_prompt)
+        return "Answer (Article 1)"
+
+    def generate_response_stream(self, system_prompt, user_prompt):
+        self.prompts.append(user_prompt)
+        yield "Answer (Article 1)"
+
+
+class ChunkStore:
+    """One chunk per article; returns them all, nearest first, with their embeddings if asked."""
+
+    def __init__(self, embedder) -> None:
+        self.vectors = embedder.embed_texts(CONTENTS)
+        self.searches = []
+
+    def similarity_search(self, embedding, top_k, category=None, date_from=None, date_to=None, with_embeddings=False):
+        self.searches.append(with_embeddings)
+        order = np.argsort(-(np.asarray(self.vectors) @ np.asarray(embedding)))[:top_k]
+        records = []
+        for index in order:
+            record = {"article_id": int(index) + 1, "chunk_index": 0, "start": 0, "end": len(CONTENTS[index])}
+            if with_embeddings:
+                record["embedding"] = self.vectors[index]
+            records.append(record)
+        return records
+
+
+def add_articles(session):
+    for number, content in enumerate(CONTENTS):
+        session.add(
+            Article(
+                title=f"Story {number + 1}",
+                source="Wire Daily",
+                url=f"https://a.example/{number}",
+                published_at=datetime(2024, 6, 1) + timedelta(hours=number),
+                category="general",
+                content=content,
+            )
+        )
+    session.commit()
+
+
+def test_store_expires_and_evicts_least_recently_used(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(conversations.time, "monotonic", lambda: now[0])
+
+    def conversation(text):
+        return Conversation(
+            filters=(None, None, None),
+            query=np.ones(4, dtype=np.float32),
+            records=[{"article_id": 1, "document": text}],
+            embeddings=np.ones((1, 4), dtype=np.float32),
+            articles={1: None},
+        )
+
+    size = conversation("x" * 100).nbytes
+    store = ConversationStore(ttl_seconds=60, max_bytes=2 * size)
+    store.put("a", conversation("x" * 100))
+    store.put("b", conversation("y" * 100))
+    assert store.get("a") is not None  # "b" is now the least recently used
+    store.put("c", conversation("z" * 100))
+    assert store.get("b") is None and len(store) == 2 and store.nbytes == 2 * size
+    # Too large for the cap on its own: not kept
+    store.put("d", conversation("w" * 10 * size))
+    assert store.get("d") is None
+    now[0] += 59
+    assert store.get("c") is not None
+    now[0] += 30
+    # "a" was last used 89 seconds ago, "c" 30
+    assert store.get("a") is None and store.get("c") is not None
+    now[0] += 61
+    assert store.get("c") is None and store.nbytes == 0
+
+
+def test_references_resolve_to_the_previous_context():
+    records = [{"article_id": 7}, {"article_id": 7}, {"article_id": 3}]
+    assert referenced_articles("Tell me more about the second one", records) == [7]
+    assert referenced_articles("compare article 3 with the first story", records) == [3, 7]
+    assert referenced_articles("What about the last one?", records) == [3]
+    assert referenced_articles("the 5th article", records) == []
+    assert referenced_articles("What happened first?", records) == []
+
+
+def test_follow_ups_reuse_or_extend_the_previous_retrieval(session):
+    add_articles(session)
+    llm = CountingLLM()
+    store = ChunkStore(llm.embedder)
+    rag = RAGService(
+        llm_client=llm,
+        vector_store=store,
+        conversations=ConversationStore(ttl_seconds=60, max_bytes=1 << 20),
+        conversation_reuse_similarity=0.99,
+        conversation_extend_similarity=-1.0,
+    )
+
+    question = "What did the chip maker announce?"
+    rag.answer_question(question, session, top_k=2, conversation_id="c1")
+    assert store.searches == [True] and llm.embedded == [question]
+    first_titles = [line for line in llm.prompts[-1].splitlines() if "Title:" in line]
+
+    # A reference to the previous answer: neither embedded nor searched, and cited first
+    result = rag.answer_question("Tell me more about the second one", session, top_k=2, conversation_id="c1")
+    assert store.searches == [True] and llm.embedded == [question]
+    titles = [line for line in llm.prompts[-1].splitlines() if "Title:" in line]
+    assert titles == first_titles[::-1]
+    assert [article.title for article in result["articles"]] == [title.split(": ")[1] for title in titles]
+
+    # The same question again: embedded, answered from the kept chunks
+    rag.answer_question(question, session, top_k=2, conversation_id="c1")
+    assert store.searches == [True] and len(llm.embedded) == 2
+    # Any other question extends them with one search and keeps the closest two
+    follow_up = "What about the central bank and interest rates?"
+    events = list(rag.answer_question_stream(follow_up, session, top_k=2, conversation_id="c1"))
+    assert store.searches == [True, True]
+    assert events[-1][2][1] == 3 and [article["id"] for article in events[-1][1]][0] == 3
+
+    # Other filters, or another conversation, retrieve from scratch
+    rag.answer_question(question, session, category="general", top_k=2, conversation_id="c1")
+    rag.answer_question("Tell me more about the second one", session, top_k=2, conversation_id="c2")
+    assert store.searches == [True, True, True, True]
+    # Without an id nothing is kept and no embeddings are requested
+    rag.answer_question(question, session, top_k=2)
+    assert store.searches[-1] is False
+
+
+def test_first_questions_are_coalesced_and_start_each_conversation(session, session_factory):
+    add_articles(session)
+    waiting, release = threading.Event(), threading.Event()
+
+    class GatedLLM(CountingLLM):
+        def generate_response_stream(self, system_prompt, user_prompt):
+            self.prompts.append(user_prompt)
+            yield "Answer"
+            waiting.set()
+            release.wait(5)
+            yield " (Article 1)"
+
+    llm = GatedLLM()
+    store = ChunkStore(llm.embedder)
+    rag = RAGService(
+        llm_client=llm,
+        vector_store=store,
+        conversations=ConversationStore(ttl_seconds=60, max_bytes=1 << 20),
+        session_factory=session_factory,
+    )
+    question = "What did the chip maker announce?"
+    leader_events = []
+    leader = threading.Thread(
+        target=lambda: leader_events.extend(
+            rag.answer_question_stream(question, session, top_k=2, conversation_id="c1")
+        )
+    )
+    leader.start()
+    assert waiting.wait(5)
+    # Joins the generation in flight: neither conversation has a context yet
+    follower = rag.answer_question_stream(question, session, top_k=2, conversation_id="c2")
+    assert next(follower)[0] == "Answer"
+    release.set()
+    follower_events = list(follower)
+    leader.join(5)
+
+    assert len(llm.prompts) == 1 and store.searches == [True]
+    assert leader_events[-1][0] == follower_events[-1][0] == "Answer (Article 1)"
+    assert len(rag.conversations) == 2
+    # Both conversations continue from the shared retrieval
+    rag.answer_question("Tell me more about the second one", session, top_k=2, conversation_id="c2")
+    assert store.searches == [True] and llm.embedded == [question]
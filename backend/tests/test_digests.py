@@ -0,0 +1,149 @@
+import json
+from datetime import datetime, time, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.routes_query import get_rag_service
+from app.core.config import Settings
+from app.core.db import Base, get_read_db
+from app.main import app
+from app.models.article import Article
+from app.models.news_digest import NewsDigest
+from app.services.digests import find_digest, match_generic_question, refresh_digests
+from app.services.rag_service import RAGService
+
+
+class DigestLLM:
+    """Writes digests; fails the test if a question reaches embedding or generation."""
+
+    def __init__(self) -> None:
+        self.digests = 0
+
+    def generate_response(self, system_prompt, user_prompt):
+        self.digests += 1
+        return f"Digest {self.digests}: the big story (Article 1)"
+
+    def embed_texts(self, texts):
+        raise AssertionError("generic questions must not be embedded")
+
+    def generate_response_stream(self, system_prompt, user_prompt):
+        raise AssertionError("generic questions must not be generated")
+
+
+def test_generic_questions_are_recognised():
+    assert match_generic_question("What's the latest tech news?") == ("technology", None)
+    assert match_generic_question("sports headlines today") == ("sports", 0)
+    assert match_generic_question("Yesterday’s business news") == ("business", 1)
+    assert match_generic_question("  Show me   world headlines! ") == ("general", None)
+    assert match_generic_question("What did the central bank say about rates?") is None
+    assert match_generic_question("latest cricket news") is None
+    assert match_generic_question("tech news about Apple") is None
+
+
+def test_digests_are_written_once_per_change_and_answer_generic_questions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'news.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    # Midday, so every article falls on today's date
+    now = datetime.combine(datetime.utcnow().date(), time(12))
+
+    def add(title, category, hours_ago, **fields):
+        session.add(
+            Article(
+                title=title,
+                source="Wire Daily",
+                url=f"https://a.example/{title.replace(' ', '-')}",
+                published_at=now - timedelta(hours=hours_ago),
+                category=category,
+                content=f"{title}. " * 20,
+                **fields,
+            )
+        )
+        session.commit()
+
+    add("Chip maker beats forecasts", "technology", 0.5)
+    add("New phone launched", "technology", 0.2)
+    add("Derby ends in a draw", "sports", 0.3)
+    llm = DigestLLM()
+    settings = Settings(digest_articles=8)
+    assert refresh_digests(session, llm, settings=settings, now=now) == 2
+    # Nothing new: no generation at all
+    assert refresh_digests(session, llm, settings=settings, now=now) == 0
+    add("Another outlet on the phone", "technology", 0.1, canonical_id=2)
+    assert refresh_digests(session, llm, settings=settings, now=now) == 0
+    add("Robot startup raises funds", "technology", 0.1)
+    assert refresh_digests(session, llm, settings=settings, now=now) == 1
+    tech = session.query(NewsDigest).filter_by(category="technology", day=now.date()).one()
+    assert tech.article_ids == [5, 2, 1] and tech.summary == "Digest 3: the big story (Article 1)"
+    assert llm.digests == 3
+
+    rag = RAGService(llm_client=llm, vector_store=None, coalesce=False)
+    result = rag.answer_question("What's the latest tech news?", session)
+    assert result["answer"] == tech.summary
+    assert [article.id for article in result["articles"]] == [5, 2, 1]
+    # A category filter that disagrees, or a date range, needs retrieval
+    assert rag._find_digest("latest tech news", session, "sports", None, None) is None
+    assert rag._find_digest("latest tech news", session, None, now - timedelta(days=3), None) is None
+    assert rag._find_digest("business headlines", session, None, None, None) is None
+
+    def override_get_read_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    app.dependency_overrides[get_rag_service] = lambda: rag
+    try:
+        response = TestClient(app).post("/api/query/stream", json={"question": "sports headlines today"})
+        events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+        assert events[0]["content"] == "Digest 1: the big story (Article 1)" and events[0]["done"] is True
+        assert events[0]["article_mapping"] == {"1": 3}
+        assert [article["title"] for article in events[0]["articles"]] == ["Derby ends in a draw"]
+        assert events[-1] == {"type": "done"}
+
+        # A deleted article is neither sent nor linked; the others keep their numbers in the summary
+        session.query(Article).filter_by(id=2).delete()
+        session.commit()
+        response = TestClient(app).post("/api/query/stream", json={"question": "latest tech news"})
+        event = json.loads(response.text.splitlines()[0][len("data: "):])
+        assert event["article_mapping"] == {"1": 5, "3": 1}
+        assert [article["id"] for article in event["articles"]] == [5, 1]
+    finally:
+        app.dependency_overrides.pop(get_read_db, None)
+        app.dependency_overrides.pop(get_rag_service, None)
+    session.close()
+    engine.dispose()
+
+
+def test_digests_list_headlines_without_a_language_model(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'news.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yesterday = datetime.utcnow() - timedelta(days=1)
+    session.add(
+        Article(
+            title="Markets close higher",
+            source="Wire Daily",
+            url="https://a.example/markets",
+            published_at=yesterday,
+            category="business",
+            content="Markets closed higher. " * 20,
+        )
+    )
+    session.commit()
+    refresh_digests(session, None)
+    digest = session.query(NewsDigest).one()
+    assert digest.day == yesterday.date()
+    assert digest.summary == "Latest business headlines:\n- Markets close higher (Wire Daily) (Article 1)"
+    rag = RAGService(llm_client=DigestLLM(), vector_store=None, coalesce=False)
+    assert rag.answer_question("yesterday's business news", session)["answer"] == digest.summary
+    # "Latest" falls back to yesterday's digest, but not to an older one
+    assert rag.answer_question("latest business news", session)["answer"] == digest.summary
+    assert find_digest(session, "latest business news", now=datetime.utcnow() + timedelta(days=1)) is None
+    session.close()
+    engine.dispose()
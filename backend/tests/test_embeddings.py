@@ -0,0 +1,43 @@
+import pytest
+
+from app.core.config import Settings
+from app.services import vector_store as vector_store_module
+from app.services.embeddings import HashingEmbeddingProvider, get_embedding_provider
+from app.services.vector_store import EmbeddingModelMismatchError, VectorStore
+
+
+def test_hash_embeddings_are_deterministic_and_normalised():
+    provider = HashingEmbeddingProvider(dimensions=64)
+    first, second, other = provider.embed_texts(["Cricket final today", "cricket FINAL today", "Chip shortage"])
+    assert first == second
+    assert len(first) == 64
+    assert sum(value * value for value in first) == pytest.approx(1.0)
+    assert first != other
+
+
+def test_factory_selects_backend_from_settings():
+    assert get_embedding_provider(Settings(embedding_backend="openai", openai_api_key="")) is None
+    provider = get_embedding_provider(Settings(embedding_backend="hash", hash_embedding_dimensions=32))
+    assert provider.model_name == "hash-32"
+    with pytest.raises(ValueError):
+        get_embedding_provider(Settings(embedding_backend="unknown"))
+
+
+def test_vector_store_rejects_a_different_embedding_model(tmp_path, monkeypatch):
+    settings = Settings(vector_store_dir=str(tmp_path))
+    monkeypatch.setattr(vector_store_module, "get_settings", lambda: settings)
+    provider = HashingEmbeddingProvider(dimensions=8)
+
+    store = VectorStore(embedding_model=provider.model_name)
+    metadata = {
+        "category": "general",
+        "published_at": "2024-01-01T00:00:00",
+        "title": "Title",
+        "source": "UnitTest",
+        "url": "https://example.com/a",
+    }
+    store.add_chunks(1, [(0, 5)], provider.embed_texts(["chunk"]), metadata=metadata)
+
+    assert VectorStore(embedding_model=provider.model_name).collection.metadata["embedding_model"] == "hash-8"
+    with pytest.raises(EmbeddingModelMismatchError):
+        VectorStore(embedding_model="text-embedding-3-small")
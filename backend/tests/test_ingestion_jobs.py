@@ -0,0 +1,98 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.api import routes_admin
+from app.core import security
+from app.core.config import Settings
+from app.main import app
+from app.services.ingestion.jobs import CANCELLED, FINISHED, SUCCEEDED, JobManager, JobProgress
+from app.services.ingestion.lock import IngestionLock
+
+
+def wait_until_finished(job, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while job.status not in FINISHED and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def make_manager(tmp_path, release: threading.Event) -> JobManager:
+    def runner(job):
+        progress = JobProgress(job.record, job.cancel_event.is_set)
+        for source in job.sources:
+            progress.record(source, "fetched", 3)
+            release.wait(5)
+            for _ in range(3):
+                progress.check_cancelled()
+                progress.record(source, "persisted")
+
+    return JobManager(lock=IngestionLock(str(tmp_path / "ingestion.lock")), runner=runner)
+
+
+def test_concurrent_refreshes_join_the_running_job_and_progress_is_tracked(tmp_path):
+    release = threading.Event()
+    manager = make_manager(tmp_path, release)
+
+    first, created = manager.submit(["hacker_news", "rss"])
+    second, created_again = manager.submit(["rss"])
+    assert created and not created_again
+    assert second is first
+
+    release.set()
+    wait_until_finished(first)
+    assert first.status == SUCCEEDED
+    assert first.to_dict()["progress"] == {
+        "hacker_news": {"fetched": 3, "persisted": 3},
+        "rss": {"fetched": 3, "persisted": 3},
+    }
+    third, created = manager.submit(["rss"])
+    assert created and third is not first
+    wait_until_finished(third)
+
+
+def test_cancellation_stops_a_running_job_and_a_waiting_one(tmp_path):
+    release = threading.Event()
+    manager = make_manager(tmp_path, release)
+    job, _ = manager.submit(["hacker_news"])
+    manager.cancel(job.id)
+    release.set()
+    wait_until_finished(job)
+    assert job.status == CANCELLED
+    assert "persisted" not in job.progress["hacker_news"]
+
+    # A job waiting for a run in another process can be cancelled before it starts
+    other = IngestionLock(str(tmp_path / "ingestion.lock"))
+    assert other.acquire()
+    try:
+        waiting, _ = manager.submit(["rss"])
+        manager.cancel(waiting.id)
+        wait_until_finished(waiting)
+        assert waiting.status == CANCELLED and waiting.started_at is None
+    finally:
+        other.release()
+
+
+def test_refresh_endpoint_reports_the_job(tmp_path, monkeypatch):
+    release = threading.Event()
+    manager = make_manager(tmp_path, release)
+    monkeypatch.setattr(routes_admin, "get_job_manager", lambda: manager)
+    monkeypatch.setattr(security, "get_settings", lambda: Settings(admin_token="secret"))
+    client = TestClient(app)
+    # Starting and reading jobs is admin-only, like listing and cancelling them
+    assert client.post("/api/admin/refresh").status_code == 403
+    assert client.get("/api/admin/jobs/missing").status_code == 403
+    assert client.get("/api/admin/jobs/missing", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    client.headers["X-Admin-Token"] = "secret"
+
+    started = client.post("/api/admin/refresh", params={"sources": "rss"}).json()
+    joined = client.post("/api/admin/refresh").json()
+    assert started["status"] == "refresh_started"
+    assert joined["status"] == "refresh_in_progress"
+    assert joined["job"]["id"] == started["job"]["id"]
+    assert client.post("/api/admin/refresh", params={"sources": "bogus"}).status_code == 400
+
+    release.set()
+    wait_until_finished(manager.get(started["job"]["id"]))
+    assert client.get(f"/api/admin/jobs/{started['job']['id']}").json()["status"] == SUCCEEDED
+    assert client.get("/api/admin/jobs/missing").status_code == 404
@@ -0,0 +1,135 @@
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import Base
+from app.models.category_centroid import CategoryCentroid
+from app.models.ingestion_state import IngestionSourceState
+from app.models.news_digest import NewsDigest
+from app.services.embeddings import HashingEmbeddingProvider
+from app.services.ingestion.lock import IngestionLock
+from app.services.ingestion.pipeline import after_ingestion, ingest_articles
+from app.services.ingestion.scheduler import IngestionScheduler, source_status
+from benchmarks.corpus import generate_articles
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = datetime(2024, 6, 1, 12, 0, 0)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def make_scheduler(tmp_path, outcomes):
+    engine = create_engine(f"sqlite:///{tmp_path / 'scheduler.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    clock = FakeClock()
+    runs = []
+
+    def runner(session, name):
+        runs.append(name)
+        state = session.get(IngestionSourceState, name) or IngestionSourceState(source=name, consecutive_failures=0)
+        if outcomes.get(name, True):
+            state.last_success_at = clock()
+            state.consecutive_failures = 0
+        else:
+            state.last_error_at = clock()
+            state.consecutive_failures += 1
+        session.add(state)
+        session.commit()
+
+    scheduler = IngestionScheduler(
+        {"fast": 300, "slow": 3600},
+        runner,
+        jitter=0.1,
+        retry_base=60,
+        lock=IngestionLock(str(tmp_path / "ingestion.lock")),
+        session_factory=session_factory,
+        clock=clock,
+        rng=random.Random(1),
+    )
+    return scheduler, clock, runs, session_factory
+
+
+def test_sources_run_on_their_own_jittered_intervals(tmp_path):
+    scheduler, clock, runs, session_factory = make_scheduler(tmp_path, {})
+
+    assert scheduler.run_pending() == ["fast", "slow"]
+    assert scheduler.run_pending() == []
+
+    clock.now += timedelta(seconds=331)
+    assert scheduler.run_pending() == ["fast"]
+    clock.now += timedelta(seconds=3600 * 1.1 - 331)
+    assert "slow" in scheduler.run_pending()
+
+    session = session_factory()
+    fast = session.get(IngestionSourceState, "fast")
+    delay = (fast.next_run_at - fast.last_success_at).total_seconds()
+    assert 270 <= delay <= 330
+    assert [row["source"] for row in source_status(session, scheduler.intervals)] == ["fast", "slow"]
+    session.close()
+
+
+def test_failures_back_off_and_lock_prevents_overlapping_runs(tmp_path):
+    scheduler, clock, runs, session_factory = make_scheduler(tmp_path, {"slow": False})
+    scheduler.run_pending()
+
+    session = session_factory()
+    slow = session.get(IngestionSourceState, "slow")
+    assert slow.consecutive_failures == 1
+    # Retried after ~retry_base rather than the full hour
+    assert (slow.next_run_at - slow.last_error_at).total_seconds() <= 66
+    session.close()
+
+    other = IngestionLock(str(tmp_path / "ingestion.lock"))
+    assert other.acquire()
+    try:
+        clock.now += timedelta(hours=2)
+        assert scheduler.run_pending() == []
+        assert scheduler.lock.locked()
+    finally:
+        other.release()
+    assert scheduler.run_pending() == ["fast", "slow"]
+
+
+def test_each_pass_rebuilds_the_centroids_and_digests_after_its_sources(tmp_path, session_factory, vector_store):
+    article = generate_articles(1)[0].model_copy(update={"published_at": datetime.utcnow() - timedelta(minutes=5)})
+    embedder = HashingEmbeddingProvider(dimensions=16)
+    scheduler = IngestionScheduler(
+        {"rss": 300},
+        runner=lambda session, name: ingest_articles(session, [article], vector_store, embedder, source=name),
+        after_run=lambda session: after_ingestion(session, embedder),
+        lock=IngestionLock(str(tmp_path / "ingestion.lock")),
+        session_factory=session_factory,
+    )
+    assert scheduler.run_pending() == ["rss"]
+
+    session = session_factory()
+    centroid = session.query(CategoryCentroid).one()
+    assert centroid.category == article.category and centroid.model == embedder.model_name
+    digest = session.query(NewsDigest).one()
+    assert digest.category == article.category and digest.day == article.published_at.date()
+    assert article.title in digest.summary
+    session.close()
+
+def test_lock_status_is_read_without_taking_the_lock(tmp_path):
+    path = tmp_path / "ingestion.lock"
+    status = IngestionLock(str(path))
+    assert not status.locked() and not path.exists()
+
+    holder = IngestionLock(str(path))
+    assert holder.acquire()
+    try:
+        owner = path.read_text()
+        assert status.locked()
+        assert path.read_text() == owner
+    finally:
+        holder.release()
+    assert not status.locked()
+    # The probe left nothing held behind
+    assert holder.acquire()
+    holder.release()
@@ -0,0 +1,133 @@
+import fcntl
+import threading
+import time
+
+import pytest
+from openai import BadRequestError, RateLimitError
+
+from app.core.config import Settings
+from app.services.llm_client import LLMClient
+from app.services.openai_gateway import OpenAIGateway, build_openai_client
+from app.services.rate_limiter import RateLimiter, TokenBucket
+from benchmarks.fake_openai import FakeOpenAIServer
+
+
+def make_client(server: FakeOpenAIServer, max_retries: int = 3, **limits) -> LLMClient:
+    settings = Settings(openai_base_url=server.base_url, openai_timeout_seconds=5)
+    limiter = RateLimiter(
+        requests_per_minute=limits.get("rpm", 0),
+        tokens_per_minute=limits.get("tpm", 0),
+        max_concurrency=limits.get("concurrency", 4),
+    )
+    gateway = OpenAIGateway(
+        build_openai_client(settings, api_key="test-key"),
+        limiter,
+        max_retries=max_retries,
+        backoff_base=0.01,
+        backoff_max=1.0,
+    )
+    return LLMClient(api_key="test-key", gateway=gateway)
+
+
+def test_retries_rate_limited_requests_honoring_retry_after():
+    with FakeOpenAIServer(dimensions=4) as server:
+        server.failures = [(429, {"Retry-After": "0.2"}), (503, {})]
+        client = make_client(server)
+
+        embeddings = client.embed_texts(["one", "two"])
+
+        assert len(embeddings) == 2 and len(embeddings[0]) == 4
+        first, second, third = (timestamp for _, timestamp in server.requests)
+        assert second - first >= 0.2
+        assert third > second
+
+
+def test_malformed_retry_after_falls_back_to_backoff():
+    with FakeOpenAIServer(dimensions=4) as server:
+        server.failures = [(429, {"Retry-After": "garbage"}), (429, {"Retry-After": "Wed, 32 Foo 2024"})]
+        assert len(make_client(server).embed_texts(["one"])) == 1
+        assert len(server.requests) == 3
+
+
+def test_gives_up_after_max_retries_and_does_not_retry_client_errors():
+    with FakeOpenAIServer() as server:
+        server.failures = [(429, {"Retry-After": "0"})] * 3
+        with pytest.raises(RateLimitError):
+            make_client(server, max_retries=2).generate_response("system", "user")
+        assert len(server.requests) == 3
+
+        server.failures = [(400, {})]
+        with pytest.raises(BadRequestError):
+            make_client(server).generate_response("system", "user")
+        assert len(server.requests) == 4
+
+
+def test_streaming_through_the_gateway():
+    with FakeOpenAIServer(answer="streamed fake answer") as server:
+        server.failures = [(500, {})]
+        tokens = list(make_client(server).generate_response_stream("system", "user"))
+    assert "".join(tokens).strip() == "streamed fake answer"
+
+
+def test_concurrency_slot_is_free_during_backoff_and_open_streams():
+    def slot_free_within(limiter, seconds=5.0):
+        taken = threading.Event()
+
+        def take():
+            with limiter.concurrency_slot():
+                taken.set()
+
+        threading.Thread(target=take, daemon=True).start()
+        return taken.wait(seconds)
+
+    with FakeOpenAIServer(answer="streamed fake answer") as server:
+        settings = Settings(openai_base_url=server.base_url, openai_timeout_seconds=5)
+        limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=0, max_concurrency=1)
+        free_while_sleeping = []
+        gateway = OpenAIGateway(
+            build_openai_client(settings, api_key="test-key"),
+            limiter,
+            backoff_base=0.01,
+            sleep=lambda delay: free_while_sleeping.append(slot_free_within(limiter)),
+        )
+        client = LLMClient(api_key="test-key", gateway=gateway)
+
+        server.failures = [(503, {})]
+        assert len(client.embed_texts(["one"])) == 1
+        assert free_while_sleeping == [True]
+
+        stream = client.generate_response_stream("system", "user")
+        first = next(stream)
+        # A long generation does not keep other calls waiting for the only slot
+        assert slot_free_within(limiter)
+        assert (first + "".join(stream)).strip() == "streamed fake answer"
+
+
+def test_token_bucket_throttles_to_refill_rate():
+    bucket = TokenBucket(capacity=2, refill_per_second=20)
+    started = time.monotonic()
+    for _ in range(4):
+        bucket.acquire(1)
+    # Two tokens are available immediately, the next two need 1/20 s each
+    assert time.monotonic() - started >= 0.09
+    assert TokenBucket(capacity=1, refill_per_second=0.1).acquire(1) is True
+
+
+def test_processes_on_one_directory_share_the_budget_and_slots(tmp_path):
+    # Two limiters stand in for the API and the scheduler on one data directory
+    api, scheduler = (
+        RateLimiter(requests_per_minute=60, tokens_per_minute=0, max_concurrency=1, shared_dir=str(tmp_path))
+        for _ in range(2)
+    )
+    for _ in range(60):
+        assert api.requests.acquire(1, timeout=0)
+    # The API used the whole budget: the scheduler has none left
+    assert not scheduler.requests.acquire(1, timeout=0)
+    assert RateLimiter(60, 0, 1).requests.acquire(1, timeout=0)  # a per-process limiter has its own
+
+    with api.concurrency_slot():
+        with open(tmp_path / "slot-0.lock", "rb") as probe:
+            with pytest.raises(BlockingIOError):
+                fcntl.flock(probe, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    with scheduler.concurrency_slot():
+        pass
@@ -0,0 +1,23 @@
+from fastapi.testclient import TestClient
+
+from app.core.metrics import CACHE_REQUESTS, RAG_STAGE_SECONDS
+from app.main import app
+
+
+def test_metrics_endpoint_exposes_histograms_and_counters():
+    RAG_STAGE_SECONDS.observe(0.3, stage="embed")
+    CACHE_REQUESTS.inc(cache="coalesce_answer", result="hit")
+
+    with TestClient(app) as client:
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "# TYPE newsiq_rag_stage_seconds histogram" in body
+    assert 'newsiq_rag_stage_seconds_bucket{stage="embed",le="0.5"}' in body
+    assert 'newsiq_rag_stage_seconds_bucket{stage="embed",le="+Inf"}' in body
+    assert 'newsiq_cache_requests_total{cache="coalesce_answer",result="hit"}' in body
+    # Counter samples are typed only if the family is declared under the same name
+    assert "# TYPE newsiq_cache_requests_total counter" in body
+    assert "# HELP newsiq_cache_requests_total " in body
@@ -0,0 +1,128 @@
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import get_read_db
+from app.main import app
+from app.models.article import Article
+from app.models.article_band import ArticleBand
+from app.schemas.article import ArticleCreate
+from app.services.embeddings import HashingEmbeddingProvider
+from app.services.ingestion.pipeline import ingest_articles
+from app.utils.minhash import band_keys, signature, similarity
+from benchmarks.corpus import generate_articles
+
+
+def wire_copy(text: str, seed: int) -> str:
+    """Another outlet's version: own dateline and credit line, a few words edited."""
+    rng = random.Random(seed)
+    words = text.split(" ")
+    for _ in range(5):
+        words[rng.randrange(len(words))] = rng.choice(["reportedly", "sources", "officially"])
+    return "NEW DELHI (Agencies) - " + " ".join(words) + " (Reporting by staff; editing by the desk)"
+
+
+def make_article(title, source, url, content, published_at=datetime(2024, 6, 1, 9, 0)):
+    return ArticleCreate(
+        title=title, source=source, url=url, published_at=published_at, category="business", content=content
+    )
+
+
+def test_signatures_separate_copies_from_other_stories():
+    story, other = (article.content for article in generate_articles(2))
+    copy = wire_copy(story, seed=1)
+    assert similarity(signature(story), signature(copy)) >= 0.7
+    assert set(band_keys(signature(story))) & set(band_keys(signature(copy)))
+    assert similarity(signature(story), signature(other)) < 0.2
+    assert signature("Too short to fingerprint") is None
+
+
+def test_copies_link_to_the_first_article_and_skip_embedding(session, session_factory, vector_store):
+    story, other = (article.content for article in generate_articles(2, seed=3))
+    ingest_articles(
+        session,
+        [
+            make_article("Markets rally", "The Hindu", "https://a.example/1", story),
+            make_article("Markets rally on earnings", "Indian Express", "https://b.example/1", wire_copy(story, 2)),
+            make_article("Unrelated", "The Hindu", "https://a.example/2", other),
+            # Same text long after the window: a new story, not a copy
+            make_article("Markets rally again", "NewsAPI", "https://c.example/1", story, datetime(2024, 7, 1)),
+        ],
+        vector_store,
+        HashingEmbeddingProvider(dimensions=16),
+    )
+    first, copy, unrelated, later = session.query(Article).order_by(Article.id).all()
+    assert copy.canonical_id == first.id
+    assert first.canonical_id is None and unrelated.canonical_id is None and later.canonical_id is None
+    assert set(vector_store.chunks) == {first.id, unrelated.id, later.id}
+    # Only canonical articles are in the band index
+    assert {band.article_id for band in session.query(ArticleBand)} == {first.id, unrelated.id, later.id}
+
+    # An article that turns into a copy loses its chunks
+    ingest_articles(
+        session,
+        [make_article("Unrelated", "The Hindu", "https://a.example/2", wire_copy(story, 4))],
+        vector_store,
+        HashingEmbeddingProvider(dimensions=16),
+    )
+    session.refresh(unrelated)
+    assert unrelated.canonical_id == first.id
+    assert unrelated.id not in vector_store.chunks
+    first_id, copy_id, later_id = first.id, copy.id, later.id
+
+    def override_get_read_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    try:
+        client = TestClient(app)
+        assert client.get("/api/news").json()["total"] == 4
+        collapsed = client.get("/api/news", params={"collapse_duplicates": True}).json()
+        assert {item["id"] for item in collapsed["items"]} == {first_id, later_id}
+        assert client.get(f"/api/news/{copy_id}").json()["canonical_id"] == first_id
+    finally:
+        app.dependency_overrides.pop(get_read_db, None)
+
+
+def test_migration_backfills_existing_articles(tmp_path):
+    from migrate_add_near_duplicates import migrate_database
+
+    path = tmp_path / "old.db"
+    story = generate_articles(1, seed=5)[0].content
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE articles (id INTEGER PRIMARY KEY, title VARCHAR(512) NOT NULL, source VARCHAR(128) NOT NULL, "
+        "url VARCHAR(512) NOT NULL UNIQUE, published_at DATETIME NOT NULL, category VARCHAR(64) NOT NULL, "
+        "content TEXT NOT NULL, image_url VARCHAR(512), created_at DATETIME NOT NULL)"
+    )
+    published = datetime(2024, 6, 1)
+    rows = [
+        (1, "Copy", "B", "https://b.example/1", published + timedelta(hours=2), wire_copy(story, 6)),
+        (2, "Original", "A", "https://a.example/1", published, story),
+    ]
+    for row_id, title, source, url, published_at, content in rows:
+        connection.execute(
+            "INSERT INTO articles VALUES (?, ?, ?, ?, ?, 'business', ?, NULL, ?)",
+            (row_id, title, source, url, published_at.isoformat(" "), content, published.isoformat(" ")),
+        )
+    connection.commit()
+    connection.close()
+
+    migrate_database(f"sqlite:///{path}")
+    migrate_database(f"sqlite:///{path}")  # idempotent
+
+    engine = create_engine(f"sqlite:///{path}")
+    session = sessionmaker(bind=engine)()
+    # The earlier publication stays canonical even though it has the higher id
+    assert session.get(Article, 1).canonical_id == 2
+    assert session.get(Article, 2).canonical_id is None
+    session.close()
+    engine.dispose()
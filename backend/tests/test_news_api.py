@@ -4,7 +4,7 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.core.db import Base, get_db
+from app.core.db import Base, get_db, get_read_db
 from app.main import app
 from app.models.article import Article
 
@@ -43,6 +43,7 @@ def seed_article():
 
 def test_news_list_returns_paginated_response():
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     seed_article()
     client = TestClient(app)
     response = client.get("/api/news?page=1&page_size=10")
@@ -0,0 +1,63 @@
+import time
+from collections import Counter
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import routes_admin
+from app.core import security
+from app.core.config import Settings
+from app.core.profiling import ProfileStore, ProfilingMiddleware
+from app.main import app as main_app
+
+
+def busy_handler():
+    deadline = time.perf_counter() + 0.1
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(500))
+    return {"total": total}
+
+
+def make_app(store: ProfileStore) -> FastAPI:
+    profiled = FastAPI()
+    profiled.get("/api/news")(busy_handler)
+    profiled.get("/health")(busy_handler)
+    profiled.add_middleware(ProfilingMiddleware, store=store, interval=0.002)
+    return profiled
+
+
+def test_only_admin_triggered_requests_on_profiled_paths_are_captured(tmp_path, monkeypatch):
+    monkeypatch.setattr(security, "get_settings", lambda: Settings(admin_token="secret"))
+    store = ProfileStore(str(tmp_path), keep=2)
+    client = TestClient(make_app(store))
+
+    client.get("/api/news", headers={"X-Profile": "1", "X-Admin-Token": "wrong"})
+    client.get("/health", headers={"X-Profile": "1", "X-Admin-Token": "secret"})
+    assert store.list() == []
+
+    for _ in range(3):
+        assert client.get("/api/news", headers={"X-Profile": "1", "X-Admin-Token": "secret"}).status_code == 200
+
+    profiles = store.list()
+    assert len(profiles) == 2
+    assert profiles[0]["path"] == "/api/news" and profiles[0]["status"] == 200
+    folded = store.load(profiles[0]["id"])
+    assert "busy_handler" in folded
+    stack, count = folded.splitlines()[0].rsplit(" ", 1)
+    assert ";" in stack and int(count) > 0
+
+
+def test_profile_endpoints_require_admin_token(tmp_path, monkeypatch):
+    monkeypatch.setattr(security, "get_settings", lambda: Settings(admin_token="secret"))
+    store = ProfileStore(str(tmp_path))
+    profile_id = store.save(Counter({"main;handler": 3}), {"path": "/api/news"})
+    monkeypatch.setattr(routes_admin, "get_profile_store", lambda: store)
+    client = TestClient(main_app)
+
+    assert client.get("/api/admin/profiles").status_code == 403
+    listing = client.get("/api/admin/profiles", headers={"X-Admin-Token": "secret"})
+    assert [item["id"] for item in listing.json()["profiles"]] == [profile_id]
+    body = client.get(f"/api/admin/profiles/{profile_id}", headers={"X-Admin-Token": "secret"}).text
+    assert body.strip() == "main;handler 3"
+    assert client.get("/api/admin/profiles/../../etc", headers={"X-Admin-Token": "secret"}).status_code == 404
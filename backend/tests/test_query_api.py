@@ -5,7 +5,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.api import routes_query
-from app.core.db import Base, get_db
+from app.core.db import Base, get_db, get_read_db
 from app.main import app
 from app.models.article import Article
 
@@ -65,6 +65,7 @@ def seed_article():
 
 def test_query_endpoint_structure():
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     app.dependency_overrides[routes_query.get_rag_service] = override_rag_service
     seed_article()
     client = TestClient(app)
@@ -0,0 +1,133 @@
+import json
+import threading
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.api.routes_query import get_rag_service
+from app.core.db import Base, get_read_db
+from app.main import app
+from app.models.article import Article
+from app.services.rag_service import RAGService
+
+CONTENTS = [
+    "The chip maker announced a faster processor.",
+    "The football club signed a new striker.",
+    "The central bank kept interest rates unchanged.",
+]
+
+
+class BatchLLM:
+    """Embeds questions by the article they name; fails generation for one question."""
+
+    def __init__(self) -> None:
+        self.embed_calls = []
+        self.prompts = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def embed_texts(self, texts):
+        self.embed_calls.append(list(texts))
+        return [[1.0 if word in text else 0.0 for word in ("chip", "football", "bank")] for text in texts]
+
+    def generate_response(self, system_prompt, user_prompt):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            self.prompts.append(user_prompt)
+        try:
+            if "Question: Why did the bank fail?" in user_prompt:
+                raise RuntimeError("upstream timeout")
+            return "Answer (Article 1)"
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+class BatchStore:
+    def __init__(self) -> None:
+        self.batches = []
+
+    def similarity_search_batch(self, embeddings, top_k=8, category=None, date_from=None, date_to=None):
+        self.batches.append(len(embeddings))
+        results = []
+        for embedding in embeddings:
+            # The named article, then the bank article as a shared second result
+            records = [
+                {"article_id": index + 1, "start": 0, "end": 20} for index, value in enumerate(embedding) if value
+            ]
+            results.append(records + [{"article_id": 3, "start": 0, "end": 20}])
+        return results
+
+
+def test_batch_shares_embedding_search_and_article_lookup(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'news.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    for number, content in enumerate(CONTENTS):
+        session.add(
+            Article(
+                title=f"Story {number + 1}",
+                source="Wire Daily",
+                url=f"https://a.example/{number}",
+                published_at=datetime(2024, 6, 1) + timedelta(hours=number),
+                category="general",
+                content=content,
+            )
+        )
+    session.commit()
+    session.close()
+    article_queries = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_article_queries(conn, cursor, statement, parameters, context, executemany):
+        if "FROM articles" in statement:
+            article_queries.append(statement)
+
+    llm = BatchLLM()
+    store = BatchStore()
+    rag = RAGService(llm_client=llm, vector_store=store)
+
+    def override_get_read_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    app.dependency_overrides[get_rag_service] = lambda: rag
+    try:
+        client = TestClient(app)
+        questions = [
+            "What did the chip maker announce?",
+            "Who did the football club sign?",
+            "What did the chip maker announce?",
+            "Why did the bank fail?",
+            "What about the weather?",
+        ]
+        response = client.post("/api/query/batch", json={"questions": questions})
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        results = sorted((json.loads(line) for line in response.text.splitlines()), key=lambda item: item["index"])
+        assert [result["index"] for result in results] == [0, 1, 2, 3, 4]
+        assert results[0]["answer"] == results[2]["answer"] == "Answer (Article 1)"
+        assert [article["title"] for article in results[1]["articles"]] == ["Story 2", "Story 3"]
+        assert results[3]["error"] == "upstream timeout" and results[3]["answer"] is None
+        assert [article["title"] for article in results[4]["articles"]] == ["Story 3"]
+
+        # Duplicates embedded, searched and generated once; one request, search and article query for all
+        assert llm.embed_calls == [list(dict.fromkeys(questions))]
+        assert store.batches == [4] and len(article_queries) == 1
+        assert len(llm.prompts) == 4 and llm.max_running <= 4
+
+        too_many = client.post("/api/query/batch", json={"questions": ["Why?"] * 51})
+        assert too_many.status_code == 422
+        assert client.post("/api/query/batch", json={"questions": []}).status_code == 422
+    finally:
+        app.dependency_overrides.pop(get_read_db, None)
+        app.dependency_overrides.pop(get_rag_service, None)
+    engine.dispose()
@@ -0,0 +1,103 @@
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import Settings
+from app.core.db import Base
+from app.models.article import Article
+from app.models.article_vector import ArticleVector, StagedArticleVector
+from app.models.category_centroid import CategoryCentroid
+from app.services import vector_store as vector_store_module
+from app.services.embeddings import HashingEmbeddingProvider
+from app.services.ingestion.reindex import reindex
+from app.services.related_articles import store_article_vector
+from app.services.vector_store import COLLECTION_NAME, VectorStore, active_collection_name
+from benchmarks.corpus import generate_articles
+
+
+class CountingEmbedder(HashingEmbeddingProvider):
+    def __init__(self, fail_on_call=None) -> None:
+        super().__init__(dimensions=16)
+        self.calls = 0
+        self.fail_on_call = fail_on_call
+
+    def embed_texts(self, texts):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise RuntimeError("embedding service unavailable")
+        return super().embed_texts(texts)
+
+
+@pytest.fixture
+def setup(tmp_path, monkeypatch):
+    settings = Settings(
+        vector_store_dir=str(tmp_path / "vectors"),
+        reindex_checkpoint_path=str(tmp_path / "reindex.json"),
+        reindex_batch_size=3,
+        reindex_workers=1,
+    )
+    monkeypatch.setattr(vector_store_module, "get_settings", lambda: settings)
+    engine = create_engine(f"sqlite:///{tmp_path / 'news.db'}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    for item in generate_articles(10, seed=7):
+        session.add(Article(**{**item.model_dump(), "url": str(item.url)}))
+    session.commit()
+    # A near-duplicate copy is not embedded, as during ingestion
+    session.add(Article(**{**item.model_dump(), "url": "https://copy.example/1", "canonical_id": 10}))
+    session.commit()
+    session.close()
+    yield settings, Session
+    engine.dispose()
+
+
+def test_interrupted_rebuild_resumes_and_swaps_in_when_done(setup):
+    settings, Session = setup
+    serving = VectorStore(embedding_model="hash-16")
+    serving.add_chunks(1, [(0, 10)], [[1.0] * 16], {"category": "business", "published_at": "2024-06-01T00:00:00"})
+    session = Session()
+    old_vector = store_article_vector(session, 1, "old-model", [[1.0] * 16])
+    session.commit()
+
+    # Batches 1 and 2 are written, batch 3 fails
+    with pytest.raises(RuntimeError):
+        reindex(CountingEmbedder(fail_on_call=3), session_factory=Session, settings=settings)
+    checkpoint = json.loads(open(settings.reindex_checkpoint_path).read())
+    assert checkpoint["last_article_id"] == 6 and checkpoint["articles"] == 6
+    # The old collection is still the one being served
+    assert active_collection_name(settings.vector_store_path) == COLLECTION_NAME
+    assert serving.similarity_search([1.0] * 16, top_k=5)[0]["article_id"] == 1
+    # So are the article vectors and category centroids; the rebuild's are staged
+    assert [(row.article_id, row.model, row.vector) for row in session.query(ArticleVector)] == [
+        (1, "old-model", old_vector)
+    ]
+    assert session.query(CategoryCentroid).count() == 0
+    assert session.query(StagedArticleVector).count() == 6
+
+    embedder = CountingEmbedder()
+    state = reindex(embedder, session_factory=Session, workers=2, settings=settings)
+    assert embedder.calls == 2  # articles 7-9 and 10 only
+    assert state["index"] == checkpoint["index"] and state["articles"] == 10
+    assert not Path(settings.reindex_checkpoint_path).exists()
+    assert active_collection_name(settings.vector_store_path) == state["index"]
+    session.expire_all()
+    assert {row.article_id for row in session.query(ArticleVector)} == set(range(1, 11))
+    assert {row.model for row in session.query(ArticleVector)} == {"hash-16"}
+    assert {row.model for row in session.query(CategoryCentroid)} == {"hash-16"}
+    assert session.query(StagedArticleVector).count() == 0
+    session.close()
+
+    # Long-running stores follow the swap on their next call
+    records = serving.similarity_search([1.0] * 16, top_k=100)
+    assert serving.collection_name == state["index"]
+    assert {record["article_id"] for record in records} == set(range(1, 11))
+    assert len(records) == state["chunks"]
+
+    # The next rebuild deletes the collection that was replaced by the previous one
+    second = reindex(CountingEmbedder(), session_factory=Session, restart=True, settings=settings)
+    names = {collection.name for collection in serving.client.list_collections()}
+    assert names == {state["index"], second["index"]}
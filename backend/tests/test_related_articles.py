@@ -0,0 +1,110 @@
+from datetime import datetime
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.core.db import get_read_db
+from app.main import app
+from app.models.article import Article
+from app.models.article_vector import ArticleVector
+from app.schemas.article import ArticleCreate
+from app.services import related_articles
+from app.services.embeddings import HashingEmbeddingProvider
+from app.services.ingestion.pipeline import ingest_articles
+
+STORIES = {
+    "rates": ("business", "The central bank held interest rates as inflation eased and bond yields fell. " * 8),
+    "rates-2": ("business", "Inflation eased again, so the central bank may cut interest rates and lift bond prices. " * 8),
+    "football": ("sports", "The striker scored twice as the home side won the football derby in the rain. " * 8),
+    "football-2": ("sports", "A late goal from the striker settled the football derby before a record crowd. " * 8),
+    "rates-sports": ("sports", "Clubs worry that interest rates and inflation will raise stadium bond costs for the central bank. " * 8),
+}
+
+
+class CountingEmbedder(HashingEmbeddingProvider):
+    def __init__(self) -> None:
+        super().__init__(dimensions=64)
+        self.calls = 0
+
+    def embed_texts(self, texts):
+        self.calls += 1
+        return super().embed_texts(texts)
+
+
+def make_article(key, day=1):
+    category, content = STORIES[key]
+    return ArticleCreate(
+        title=key,
+        source="Wire Daily",
+        url=f"https://a.example/{key}",
+        published_at=datetime(2024, 6, day),
+        category=category,
+        content=content,
+    )
+
+
+def test_related_articles_use_stored_vectors_and_refresh_after_ingestion(
+    session, session_factory, vector_store, monkeypatch
+):
+    monkeypatch.setattr(related_articles, "_index", None)
+    embedder = CountingEmbedder()
+    ingest_articles(
+        session,
+        [make_article("rates", 1), make_article("football", 2), make_article("football-2", 3)],
+        vector_store,
+        embedder,
+    )
+    ids = {title: article_id for article_id, title in session.query(Article.id, Article.title)}
+    vector = np.frombuffer(session.get(ArticleVector, ids["rates"]).vector, dtype=np.float16)
+    assert vector.shape == (64,) and abs(float(np.linalg.norm(vector.astype(np.float32))) - 1) < 1e-2
+
+    def override_get_read_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    try:
+        client = TestClient(app)
+        calls = embedder.calls
+        body = client.get(f"/api/news/{ids['football']}/related").json()
+        assert [item["title"] for item in body["items"]] == ["football-2", "rates"]
+        assert body["items"][0]["score"] > body["items"][1]["score"]
+        assert body["items"][0]["excerpt"] and body["items"][0]["content"] is None
+        assert client.get(f"/api/news/{ids['football']}/related", params={"limit": 1}).json()["items"][0]["title"] == "football-2"
+        assert client.get(f"/api/news/{ids['football']}/related", params={"category": "business"}).json()["items"][0]["title"] == "rates"
+        assert client.get(
+            f"/api/news/{ids['football']}/related", params={"date_from": "2024-06-03T00:00:00"}
+        ).json()["items"][0]["title"] == "football-2"
+        # The same instant with an offset: converted to UTC, not just stripped
+        assert [item["title"] for item in client.get(
+            f"/api/news/{ids['football']}/related", params={"date_from": "2024-06-03T05:30:00+05:30"}
+        ).json()["items"]] == ["football-2"]
+        assert client.get("/api/news/999/related").status_code == 404
+        assert embedder.calls == calls  # nothing is embedded at request time
+
+        # New articles are found by the next request without a restart
+        ingest_articles(session, [make_article("rates-2", 4), make_article("rates-sports", 5)], vector_store, embedder)
+        ids = {title: article_id for article_id, title in session.query(Article.id, Article.title)}
+        titles = [item["title"] for item in client.get(f"/api/news/{ids['rates']}/related").json()["items"]]
+        assert titles[0] == "rates-2" and "rates-sports" in titles
+        sports = client.get(f"/api/news/{ids['rates']}/related", params={"category": "sports"}).json()["items"]
+        assert sports[0]["title"] == "rates-sports"
+    finally:
+        app.dependency_overrides.pop(get_read_db, None)
+
+
+def test_migration_backfills_vectors_from_the_index(session, db_engine, vector_store):
+    from migrate_add_article_vectors import migrate_database
+
+    ingest_articles(session, [make_article("rates"), make_article("football")], vector_store, CountingEmbedder())
+    session.query(ArticleVector).delete()
+    session.commit()
+
+    migrate_database(str(db_engine.url), vector_store=vector_store)
+    migrate_database(str(db_engine.url), vector_store=vector_store)  # idempotent
+
+    assert session.query(ArticleVector).count() == 2
+    assert {row.model for row in session.query(ArticleVector)} == {"hash-64"}
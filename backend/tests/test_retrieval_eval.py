@@ -0,0 +1,25 @@
+import json
+import os
+
+from app.core.config import get_settings
+from benchmarks.retrieval_eval import main
+
+
+def test_synthetic_run_reports_every_variant_without_touching_the_environment(tmp_path, capsys):
+    variants = tmp_path / "variants.json"
+    variants.write_text(
+        json.dumps([{"name": "default"}, {"name": "empty-index", "vector_store_dir": str(tmp_path / "empty")}]),
+        encoding="utf-8",
+    )
+    environ, settings = dict(os.environ), get_settings()
+
+    assert main(["--synthetic", "20", "--variants", str(variants), "--output", str(tmp_path / "report.json")]) == 0
+
+    report = json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))
+    assert [row["variant"]["name"] for row in report] == ["default", "empty-index"]
+    assert report[0]["recall@8"] > 0.5 and report[0]["mrr"] > 0.5
+    # The second variant searched its own, empty, directory
+    assert report[1]["recall@8"] == 0.0 and (tmp_path / "empty").is_dir()
+    assert report[0]["latency"]["p50_ms"] >= 0
+    assert "default" in capsys.readouterr().out
+    assert dict(os.environ) == environ and get_settings() is settings
@@ -0,0 +1,105 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import Base, build_engine, get_read_db
+from app.main import app
+from app.services.ingestion.pipeline import ingest_articles
+from benchmarks.corpus import generate_articles
+
+
+@pytest.fixture
+def engines(tmp_path):
+    url = f"sqlite:///{tmp_path / 'concurrency.db'}"
+    write_engine = build_engine(url)
+    read_engine = build_engine(url, read_only=True)
+    Base.metadata.create_all(bind=write_engine)
+    yield write_engine, read_engine
+    write_engine.dispose()
+    read_engine.dispose()
+
+
+def test_reads_complete_while_ingestion_holds_the_write_lock(engines):
+    write_engine, read_engine = engines
+    WriteSession = sessionmaker(bind=write_engine)
+    ReadSession = sessionmaker(bind=read_engine)
+    articles = generate_articles(400)
+    session = WriteSession()
+    ingest_articles(session, articles[:100], vector_store=None, embedder=None)
+    session.close()
+
+    def override_get_read_db():
+        db = ReadSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    client = TestClient(app)
+    holding, release = threading.Event(), threading.Event()
+    errors = []
+
+    def writer():
+        session = WriteSession()
+        try:
+            ingest_articles(session, articles[100:], vector_store=None, embedder=None)
+            # A long exclusive write transaction, like a big batch commit or a cache spill.
+            # Without WAL this locks readers out until it commits.
+            connection = write_engine.raw_connection()
+            try:
+                connection.driver_connection.isolation_level = None
+                cursor = connection.cursor()
+                cursor.execute("BEGIN EXCLUSIVE")
+                cursor.execute("UPDATE articles SET category = 'held'")
+                holding.set()
+                release.wait()
+                cursor.execute("COMMIT")
+            finally:
+                connection.close()
+        except Exception as exc:  # surfaced by the assertions below
+            errors.append(exc)
+        finally:
+            session.close()
+            holding.set()
+
+    thread = threading.Thread(target=writer)
+    try:
+        thread.start()
+        reads = 0
+        # Reads interleave with the ingestion's own commits
+        while not holding.is_set():
+            assert client.get("/api/news", params={"page": 1 + reads % 3}).status_code == 200
+            reads += 1
+        assert not errors
+        # The writer holds its exclusive transaction until released: every read here completes
+        # before the commit and sees the last committed state, none of the held update
+        for page in (1, 2, 3):
+            response = client.get("/api/news", params={"page": page})
+            assert response.status_code == 200 and response.json()["total"] == 400
+        assert client.get("/api/news", params={"category": "held"}).json()["total"] == 0
+        assert thread.is_alive()
+
+        release.set()
+        thread.join()
+        assert not errors
+        assert client.get("/api/news", params={"category": "held"}).json()["total"] == 400
+    finally:
+        release.set()
+        thread.join()
+        app.dependency_overrides.pop(get_read_db, None)
+
+
+def test_connections_are_tuned_and_readers_cannot_write(engines):
+    write_engine, read_engine = engines
+    with write_engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+    with read_engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.execute(text("DELETE FROM articles"))
@@ -0,0 +1,100 @@
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes_query
+from app.main import app
+from app.services import container as container_module
+from app.services.container import ServiceContainer
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def use_container(monkeypatch):
+    def install(container):
+        monkeypatch.setattr(container_module, "_container", container)
+        return container
+
+    return install
+
+
+def test_importing_the_app_skips_heavy_clients():
+    code = "import sys, app.main; print(','.join(m for m in ('chromadb', 'openai') if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], cwd=BACKEND, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == ""
+
+
+def test_concurrent_first_use_builds_once():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    container = ServiceContainer(factory)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(container.rag_service())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len({id(result) for result in results}) == 1
+    assert container.status() == "ready"
+
+
+def test_failed_build_is_retried():
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("vector store unavailable")
+        return object()
+
+    container = ServiceContainer(factory)
+    with pytest.raises(RuntimeError):
+        container.rag_service()
+    assert container.status() == "failed"
+    assert "vector store unavailable" in container.error
+    assert container.rag_service() is not None
+    assert container.status() == "ready"
+
+
+def test_ready_waits_for_warm_up_while_health_answers(use_container):
+    release = threading.Event()
+
+    def factory():
+        release.wait(5)
+        return object()
+
+    container = use_container(ServiceContainer(factory))
+    with TestClient(app) as client:
+        # startup began the warm-up on a background thread
+        assert client.get("/health").status_code == 200
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["checks"]["rag_service"] == "warming"
+        release.set()
+        deadline = time.monotonic() + 5
+        while container.status() == "warming" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "checks": {"database": "ok", "rag_service": "ready"}}
+
+
+def test_query_without_configured_service_is_unavailable(use_container, monkeypatch):
+    monkeypatch.delitem(app.dependency_overrides, routes_query.get_rag_service, raising=False)
+    use_container(ServiceContainer(lambda: None))
+    client = TestClient(app)
+    response = client.post("/api/query", json={"question": "What is happening?"})
+    assert response.status_code == 503
+    assert client.get("/ready").json()["checks"]["rag_service"] == "disabled"
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings
+from app.core.db import get_read_db
+from app.main import app
+from app.models.topic_cluster import TopicCluster, TopicClusterArticle
+from app.schemas.article import ArticleCreate
+from app.services.embeddings import HashingEmbeddingProvider
+from app.services.ingestion.pipeline import ingest_articles
+from app.services.trending import TopicClusterer, current_score, trending_clusters
+
+RATES = "The central bank held interest rates steady on Tuesday as inflation eased for a third month and bond yields fell across the curve. "
+RATES_FOLLOW_UP = "Inflation eased for a third month, so the central bank held interest rates steady and bond yields fell across the curve again. "
+FOOTBALL = "The striker scored twice as the home side won the football derby in heavy rain in front of a record crowd at the stadium. "
+BUDGET = "The finance minister presented the annual budget, raising spending on roads and railways while trimming the fiscal deficit target. "
+
+
+def make_article(url, content, hours_ago, category="business", source="Wire Daily"):
+    return ArticleCreate(
+        title=url.rsplit("/", 1)[-1],
+        source=source,
+        url=url,
+        published_at=datetime.utcnow() - timedelta(hours=hours_ago),
+        category=category,
+        content=content * 6,
+    )
+
+
+def test_ingestion_clusters_recent_articles_for_the_trending_endpoint(session, session_factory, vector_store):
+    embedder = HashingEmbeddingProvider()
+    articles = [
+        # Outside the window: embedded but not clustered
+        make_article("https://a.example/old-rates", RATES, 24 * 10),
+        make_article("https://a.example/rates", RATES, 3),
+        make_article("https://a.example/rates-follow-up", RATES_FOLLOW_UP, 2),
+        # Another outlet's copy counts towards the story's cluster
+        make_article("https://b.example/rates", "LONDON (Wire) - " + RATES, 1, source="Other Post"),
+        make_article("https://a.example/football", FOOTBALL, 1, category="sports"),
+        make_article("https://a.example/budget", BUDGET, 0.5),
+    ]
+    ingest_articles(session, articles, vector_store, embedder)
+    # Edited content is re-embedded but the article is not counted again
+    ingest_articles(session, [articles[1].model_copy(update={"content": RATES * 7})], vector_store, embedder)
+    assert session.query(TopicClusterArticle).count() == 5
+
+    def override_get_read_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    try:
+        client = TestClient(app)
+        body = client.get("/api/news/trending").json()
+        assert body["window_hours"] == 48
+        topics = [[article["title"] for article in item["articles"]] for item in body["items"]]
+        assert topics == [["rates", "rates-follow-up", "rates"], ["budget"], ["football"]]
+        rates = body["items"][0]
+        assert rates["size"] == 3 and rates["category"] == "business"
+        assert abs(rates["score"] - (2 ** (-3 / 6) + 2 ** (-2 / 6) + 2 ** (-1 / 6))) < 0.01
+        sports = client.get("/api/news/trending", params={"category": "sports"}).json()["items"]
+        assert [item["articles"][0]["title"] for item in sports] == ["football"]
+        assert len(client.get("/api/news/trending", params={"limit": 1}).json()["items"]) == 1
+    finally:
+        app.dependency_overrides.pop(get_read_db, None)
+
+
+def test_recent_coverage_outranks_larger_older_clusters_and_stale_ones_are_dropped(session):
+    settings = Settings(trending_window_hours=48, trending_half_life_hours=6, trending_similarity_threshold=0.8)
+    now = datetime(2024, 6, 2, 12, 0)
+    older, fresh = np.eye(8, dtype=np.float16)[:2]
+    clusterer = TopicClusterer(session, settings=settings, now=now)
+    for article_id in (1, 2, 3):
+        clusterer.add_article(article_id, "business", now - timedelta(hours=20), "hash-8", older.tobytes())
+    for article_id in (4, 5):
+        clusterer.add_article(article_id, "sports", now, "hash-8", fresh.tobytes())
+    session.commit()
+
+    # Three articles 20 hours old weigh 3 * 2^(-20/6) ~ 0.3; two new ones weigh 2
+    clusters = trending_clusters(session, settings=settings, now=now)
+    assert [cluster.size for cluster in clusters] == [2, 3]
+    assert abs(current_score(clusters[0], now, 6) - 2) < 1e-6
+    assert abs(current_score(clusters[1], now, 6) - 3 * 2 ** (-20 / 6)) < 1e-6
+    # The order is stored, not recomputed: later on both have decayed by the same factor
+    later = now + timedelta(hours=6)
+    assert [cluster.size for cluster in trending_clusters(session, settings=settings, now=later)] == [2, 3]
+    assert abs(current_score(clusters[0], later, 6) - 1) < 1e-6
+
+    TopicClusterer(session, settings=settings, now=now + timedelta(hours=49))
+    assert session.query(TopicCluster).count() == 0 and session.query(TopicClusterArticle).count() == 0
@@ -0,0 +1,110 @@
+from datetime import datetime
+
+import chromadb
+
+from app.core.config import Settings
+from app.models.article import Article
+from app.services import vector_store as vector_store_module
+from app.services.rag_service import RAGService
+from app.services.vector_store import COLLECTION_NAME, VectorStore, timestamp
+from app.utils.chunking import chunk_spans
+
+CONTENT = "Rates were held steady. The central bank cited slowing inflation.  Markets rose on the news."
+
+
+def add_articles(session):
+    for article_id, category, published_at in [
+        (1, "business", datetime(2024, 6, 1, 9, 0)),
+        (2, "business", datetime(2024, 6, 20, 9, 0)),
+        (3, "sports", datetime(2024, 6, 2, 9, 0)),
+    ]:
+        session.add(
+            Article(
+                id=article_id,
+                title=f"Story {article_id}",
+                source="The Hindu",
+                url=f"https://a.example/{article_id}",
+                published_at=published_at,
+                category=category,
+                content=CONTENT,
+            )
+        )
+    session.commit()
+
+
+def test_chunks_store_offsets_and_filter_fields_only(session, tmp_path, monkeypatch):
+    settings = Settings(vector_store_dir=str(tmp_path / "vectors"))
+    monkeypatch.setattr(vector_store_module, "get_settings", lambda: settings)
+    add_articles(session)
+    store = VectorStore(embedding_model="hashing")
+    spans = chunk_spans(CONTENT, max_tokens=8, overlap_tokens=0)
+    assert len(spans) > 1
+    for article in session.query(Article):
+        store.add_chunks(
+            article.id,
+            spans,
+            [[1.0, float(idx)] for idx in range(len(spans))],
+            {"category": article.category, "published_at": article.published_at},
+        )
+
+    stored = store.collection.get(include=["metadatas", "documents"])
+    assert set(stored["metadatas"][0]) == {"article_id", "chunk_index", "start", "end", "category", "published_ts"}
+    assert stored["documents"] == [None] * len(stored["ids"])
+
+    # Category and date range together, which Chroma only accepts combined with $and
+    records = store.similarity_search(
+        [1.0, 0.0], top_k=10, category="business", date_from=datetime(2024, 5, 30), date_to=datetime(2024, 6, 10)
+    )
+    assert {record["article_id"] for record in records} == {1}
+
+    records, articles = RAGService(llm_client=None, vector_store=store)._attach_articles(records, session)
+    assert list(articles) == [1]
+    assert [record["document"] for record in sorted(records, key=lambda r: r["chunk_index"])] == [
+        CONTENT[start:end] for start, end in spans
+    ]
+    assert records[0]["title"] == "Story 1" and records[0]["url"] == "https://a.example/1"
+
+
+def test_migration_rewrites_a_legacy_collection(session, db_engine, tmp_path):
+    from migrate_slim_vector_metadata import migrate_collection
+
+    add_articles(session)
+    path = tmp_path / "vectors"
+    client = chromadb.PersistentClient(path=str(path))
+    legacy = client.create_collection(COLLECTION_NAME, metadata={"embedding_model": "hashing"})
+    documents = ["Rates were held steady.", "The central bank cited slowing inflation. Markets rose on the news."]
+    for article_id in (1, 2):
+        legacy.add(
+            ids=[f"article-{article_id}-chunk-{idx}" for idx in range(2)],
+            embeddings=[[1.0, 0.0], [0.0, 1.0]],
+            documents=documents,
+            metadatas=[
+                {
+                    "article_id": article_id,
+                    "chunk_index": idx,
+                    "title": f"Story {article_id}",
+                    "source": "The Hindu",
+                    "url": f"https://a.example/{article_id}",
+                    "category": "business",
+                    "published_at": "2024-06-01T09:00:00",
+                    "snippet": CONTENT[:40],
+                }
+                for idx in range(2)
+            ],
+        )
+    # A chunk whose article is gone is dropped
+    legacy.add(ids=["article-9-chunk-0"], embeddings=[[1.0, 1.0]], documents=["Gone"], metadatas=[{"article_id": 9}])
+
+    migrate_collection(str(path), str(db_engine.url), batch_size=2)
+    migrate_collection(str(path), str(db_engine.url))  # already slim: no-op
+
+    collection = chromadb.PersistentClient(path=str(path)).get_collection(COLLECTION_NAME)
+    assert collection.metadata == {"embedding_model": "hashing"}
+    migrated = collection.get(ids=["article-2-chunk-1"], include=["metadatas", "documents", "embeddings"])
+    meta = migrated["metadatas"][0]
+    # The legacy document had one space where the content has two
+    assert CONTENT[meta["start"] : meta["end"]] == "The central bank cited slowing inflation.  Markets rose on the news."
+    assert "title" not in meta and migrated["documents"] == [None]
+    assert meta["published_ts"] == timestamp(datetime(2024, 6, 20, 9, 0))
+    assert migrated["embeddings"][0] == [0.0, 1.0]
+    assert collection.count() == 4
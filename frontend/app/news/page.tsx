@@ -13,7 +13,7 @@ type Article = {
   url: string;
   published_at: string;
   category: string;
-  content: string;
+  excerpt: string | null;
   image_url?: string | null;
 };
 
@@ -124,6 +124,8 @@ export default function NewsPage() {
     if (filters.category) url.set("category", filters.category);
     if (filters.dateFrom) url.set("date_from", filters.dateFrom);
     if (filters.dateTo) url.set("date_to", filters.dateTo);
+    // One card per story: other outlets' copies of the same wire story are hidden
+    url.set("collapse_duplicates", "true");
     url.set("page", "1");
     url.set("page_size", "20");
     return url.toString();
@@ -334,8 +336,8 @@ export default function NewsPage() {
                             <p className={`text-gray-600 dark:text-gray-300 mb-3 sm:mb-4 leading-relaxed ${
                               isLarge ? "text-sm sm:text-base line-clamp-3" : "text-xs sm:text-sm line-clamp-2"
                             }`}>
-                              {article.content.slice(0, isLarge ? 250 : 150)}
-                              {article.content.length > (isLarge ? 250 : 150) && "..."}
+                              {(article.excerpt ?? "").slice(0, isLarge ? 250 : 150)}
+                              {(article.excerpt ?? "").length > (isLarge ? 250 : 150) && "..."}
                             </p>
                             <div className="flex items-center text-primary dark:text-blue-400 text-xs sm:text-sm font-semibold group-hover:gap-2 transition-all">
                               Read full story
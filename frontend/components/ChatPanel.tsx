@@ -24,6 +24,17 @@ type Article = {
 };
 
 const STORAGE_KEY = "news_iq_chat_history";
+const CONVERSATION_KEY = "news_iq_conversation_id";
+
+// Lets the backend answer follow-ups from the previous answer's articles
+const getConversationId = (): string => {
+  let conversationId = localStorage.getItem(CONVERSATION_KEY);
+  if (!conversationId) {
+    conversationId = crypto.randomUUID();
+    localStorage.setItem(CONVERSATION_KEY, conversationId);
+  }
+  return conversationId;
+};
 
 export function ChatPanel() {
   const [messages, setMessages] = useState<Message[]>([]);
@@ -123,6 +134,7 @@ export function ChatPanel() {
         body: JSON.stringify({
           question: userMessage.content,
           filters,
+          conversation_id: getConversationId(),
         }),
         signal: abortControllerRef.current.signal,
       });
@@ -203,6 +215,7 @@ export function ChatPanel() {
     if (confirm("Are you sure you want to clear all chat history?")) {
       setMessages([]);
       localStorage.removeItem(STORAGE_KEY);
+      localStorage.removeItem(CONVERSATION_KEY);
     }
   };
 